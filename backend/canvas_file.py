@@ -0,0 +1,305 @@
+"""Binary file format for the canvas
+
+The file contains the characteristics of all elements in columns, like the ElementStore keeps them in memory:
+
+    header              magic, version, number of strings, rows, top-level rows, groups, offset of the strings
+    element columns     x, y (float64), name, symbol, symbol color, background color, parent group (int32)
+    group columns       x, y (float64), symbol, parent group, position (int32)
+    strings             the interned strings, each with its length (uint32) followed by the UTF-8 bytes
+
+The rows of the elements directly on the canvas come first, the elements of the groups follow. Every element and
+group refers to its group by the index in the group columns, -1 stands for the canvas itself. The groups are numbered
+in pre-order and every group keeps its position among the members of its parent, so the members come back in their
+order and overlapping elements are drawn like before saving. All numbers are little-endian.
+
+On loading the element columns are memory-mapped and used by an ElementStore without copying, so opening a large
+drawing costs only the groups and the string table. Pages of the file are read when they are touched first and
+changes of the canvas are never written back to the file.
+"""
+
+import os
+import struct
+from itertools import islice
+
+import numpy as np
+
+from backend.core import Element, Group, Canvas
+from backend.store import StringTable, ElementStore
+from backend.transformer import TransformerAbc
+
+MAGIC = b"2DCADCNV"
+VERSION = 2
+
+# magic, version, number of strings, rows, top-level rows, groups, offset of the strings, padded to 64 bytes
+HEADER = struct.Struct("<8sIIQQQQ16x")
+
+ELEMENT_COLUMNS = (("xs", "<f8"), ("ys", "<f8"), ("names", "<i4"), ("symbols", "<i4"), ("symbol_colors", "<i4"),
+                   ("background_colors", "<i4"), ("parents", "<i4"))
+GROUP_COLUMNS = (("group_xs", "<f8"), ("group_ys", "<f8"), ("group_symbols", "<i4"), ("group_parents", "<i4"),
+                 ("group_positions", "<i4"))
+
+
+def layout(rows, groups):
+    """Offsets of all columns in the file
+
+    The float64 columns come first, so every column is aligned to its item size.
+
+    Args:
+        rows (int): Number of elements.
+        groups (int): Number of groups.
+
+    Returns:
+        Dictionary with the offset, the dtype and the length of each column keyed on its name and the offset after
+        the last column.
+    """
+    columns = [(name, dtype, rows) for name, dtype in ELEMENT_COLUMNS]
+    columns += [(name, dtype, groups) for name, dtype in GROUP_COLUMNS]
+    columns.sort(key=lambda column: np.dtype(column[1]).itemsize, reverse=True)
+
+    offsets = {}
+    offset = HEADER.size
+    for name, dtype, length in columns:
+        offsets[name] = (offset, dtype, length)
+        offset += np.dtype(dtype).itemsize * length
+    return offsets, offset
+
+
+def count(canvas):
+    """Numbers of elements directly on the canvas, of elements in groups and of groups
+
+    The groups are visited like in listed_rows(), an instance group counts the elements of its prototype.
+    """
+    top = len(canvas.store) if canvas.store is not None else 0
+    members = 0
+    groups = 0
+    for component in canvas.listed:
+        if not isinstance(component, Group):
+            top += 1
+            continue
+
+        stack = [component]
+        while stack:
+            group = stack.pop()
+            groups += 1
+            for member in group.elements:
+                if isinstance(member, Group):
+                    stack.append(member)
+                else:
+                    members += 1
+    return top, members, groups
+
+
+def listed_rows(canvas):
+    """Elements from the list of the canvas, followed by the elements of all groups, with their parent groups
+
+    The groups are numbered in pre-order, the members of a group follow the group in their order. The position of a
+    group among the members of its parent counts the elements of the store in front of the list of the canvas.
+
+    Yields:
+        Tuples with an element or group, the index of its parent group and its position in the parent.
+    """
+    for component in canvas.listed:
+        if not isinstance(component, Group):
+            yield component, -1, None
+
+    index = 0
+    top = len(canvas.store) if canvas.store is not None else 0
+    for position, component in enumerate(canvas.listed, top):
+        if not isinstance(component, Group):
+            continue
+
+        stack = [(component, -1, position)]
+        while stack:
+            group, parent, position = stack.pop()
+            yield group, parent, position
+            group_index = index
+            index += 1
+            groups = []
+            for position, member in enumerate(group.elements):
+                if isinstance(member, Group):
+                    groups.append((member, group_index, position))
+                else:
+                    yield member, group_index, position
+            stack.extend(reversed(groups))
+
+
+def save(canvas, path, chunk_size=65536):
+    """Writes the canvas into a binary file
+
+    The file is allocated at its final size and the columns are written through a memory map in chunks, so the
+    memory needed for saving doesn't grow with the canvas. The file is replaced at the end, even a canvas loaded
+    from the same file can be saved.
+
+    Args:
+        canvas (Canvas): The canvas to save.
+        path (str): Path of the file.
+        chunk_size (int): Number of elements written at once.
+
+    Returns:
+        None
+    """
+    top, members, groups = count(canvas)
+    rows = top + members
+    offsets, end = layout(rows, groups)
+
+    strings = StringTable()
+    if canvas.store is not None:
+        # the codes of the store stay valid in the file
+        strings.values = list(canvas.store.strings.values)
+        strings.codes = dict(canvas.store.strings.codes)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.truncate(end)
+
+    columns = {name: np.memmap(temporary, dtype=dtype, mode="r+", offset=offset, shape=(length,))
+               for name, (offset, dtype, length) in offsets.items() if length}
+
+    row = 0
+    if canvas.store is not None:
+        alive = canvas.store.rows()
+        for start in range(0, len(alive), chunk_size):
+            chunk = alive[start:start + chunk_size]
+            stop = row + len(chunk)
+            for name, dtype in ELEMENT_COLUMNS[:-1]:
+                columns[name][row:stop] = getattr(canvas.store, name)[chunk]
+            columns["parents"][row:stop] = -1
+            row = stop
+
+    group = 0
+    listed = listed_rows(canvas)
+    chunk = list(islice(listed, chunk_size))
+    while chunk:
+        elements = [(component, parent) for component, parent, position in chunk if not isinstance(component, Group)]
+        stop = row + len(elements)
+        if elements:
+            columns["xs"][row:stop] = [element.x for element, parent in elements]
+            columns["ys"][row:stop] = [element.y for element, parent in elements]
+            columns["names"][row:stop] = [strings.code(element.name) for element, parent in elements]
+            columns["symbols"][row:stop] = [strings.code(element.symbol) for element, parent in elements]
+            columns["symbol_colors"][row:stop] = [strings.code(element.symbol_color) for element, parent in elements]
+            columns["background_colors"][row:stop] = [strings.code(element.background_color)
+                                                      for element, parent in elements]
+            columns["parents"][row:stop] = [parent for element, parent in elements]
+        row = stop
+
+        for component, parent, position in chunk:
+            if isinstance(component, Group):
+                columns["group_xs"][group] = component.x
+                columns["group_ys"][group] = component.y
+                columns["group_symbols"][group] = strings.code(component.symbol)
+                columns["group_parents"][group] = parent
+                columns["group_positions"][group] = position
+                group += 1
+
+        chunk = list(islice(listed, chunk_size))
+
+    for column in columns.values():
+        column.flush()
+    del columns
+
+    with open(temporary, "r+b") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(strings.values), rows, top, groups, end))
+        file.seek(end)
+        for value in strings.values:
+            encoded = value.encode("utf-8")
+            file.write(struct.pack("<I", len(encoded)))
+            file.write(encoded)
+
+    os.replace(temporary, path)
+
+
+def read_header(file):
+    magic, version, string_count, rows, top, groups, strings_offset = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("not a canvas file")
+    if version != VERSION:
+        raise ValueError(f"unsupported version {version} of the canvas file")
+    return string_count, rows, top, groups, strings_offset
+
+
+def read_strings(file, string_count):
+    strings = StringTable()
+    strings.values = []
+    strings.codes = {}
+    for code in range(string_count):
+        length, = struct.unpack("<I", file.read(4))
+        value = file.read(length).decode("utf-8")
+        strings.values.append(value)
+        strings.codes.setdefault(value, code)
+    return strings
+
+
+def load(path, transformer=TransformerAbc):
+    """Opens a canvas saved with save()
+
+    The elements directly on the canvas are kept in an ElementStore on top of memory-mapped columns. The file is
+    mapped copy-on-write: changes of the canvas stay in memory. The elements of a store are always in front of the
+    groups, so a canvas saved without store, with elements behind groups, is opened without store.
+
+    Args:
+        path (str): Path of the file.
+        transformer (TransformerAbc): Transformer of the canvas and all its elements and groups.
+
+    Returns:
+        Canvas
+    """
+    with open(path, "rb") as file:
+        string_count, rows, top, groups, strings_offset = read_header(file)
+        file.seek(strings_offset)
+        strings = read_strings(file, string_count)
+
+    offsets = layout(rows, groups)[0]
+
+    def column(name, start=0, stop=None):
+        offset, dtype, length = offsets[name]
+        if not length:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=(length,))[start:stop]
+
+    def elements(start, stop=None):
+        columns = [column(name, start, stop).tolist() for name, dtype in ELEMENT_COLUMNS[:-1]]
+        for x, y, name, symbol, symbol_color, background_color in zip(*columns):
+            yield (Element(x, y, transformer)
+                   .set_name(strings.value(name))
+                   .set_symbol(strings.value(symbol))
+                   .set_symbol_color(strings.value(symbol_color))
+                   .set_background_color(strings.value(background_color)))
+
+    group_list = []
+    for x, y, symbol in zip(column("group_xs").tolist(), column("group_ys").tolist(),
+                            column("group_symbols").tolist()):
+        group = Group(transformer=transformer)
+        group.x = x
+        group.y = y
+        group.symbol = strings.value(symbol)
+        group_list.append(group)
+
+    # the members of every group and of the canvas, the groups are inserted at their positions
+    members = [[] for group in group_list]
+    for element, parent in zip(elements(top), column("parents", top).tolist()):
+        members[parent].append(element)
+    nested = [[] for group in group_list]
+    listed = []
+    for group, parent, position in zip(group_list, column("group_parents").tolist(),
+                                       column("group_positions").tolist()):
+        (nested[parent] if parent != -1 else listed).append((position, group))
+
+    # pre-order puts every group in front of its nested groups, so they are filled from the end
+    for index in reversed(range(len(group_list))):
+        for position, group in nested[index]:
+            members[index].insert(position, group)
+        group_list[index].add_many(members[index])
+
+    if any(position < top for position, group in listed):
+        canvas = Canvas(transformer=transformer)
+        components = list(elements(0, top))
+        for position, group in listed:
+            components.insert(position, group)
+        canvas.add_many(components)
+        return canvas
+
+    store = ElementStore.from_columns(strings, *(column(name, 0, top) for name, dtype in ELEMENT_COLUMNS[:-1]))
+    canvas = Canvas(transformer=transformer, store=store)
+    canvas.add_many([group for position, group in listed])
+    return canvas
@@ -5,14 +5,77 @@ Using the composite design pattern Elements and Groups of elements are defined.
 """
 
 from abc import ABC, abstractmethod
+from itertools import repeat
+from types import MappingProxyType
 from typing import List
 
-from backend.memento import CanvasMemento
+from backend.memento import SnapshotTracker, restore
+from backend.spatial import SpatialGrid
 from backend.transformer import TransformerAbc
 
 
+# bounding box of a group, which has to be determined from the elements
+UNMEASURED = object()
+
+# members of a group without own elements, e.g. an instance group using its prototype
+NO_MEMBERS = MappingProxyType({})
+
+# coefficients this much smaller than the largest one count as 0, e.g. cos(90) from rotate_matrix()
+AXIS_TOLERANCE = 1e-12
+
+
+def union_bounds(first, second):
+    """Bounding box (left, top, right, bottom) enclosing two bounding boxes, None stands for an empty box"""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return min(first[0], second[0]), min(first[1], second[1]), max(first[2], second[2]), max(first[3], second[3])
+
+
+def bounds_of(elements):
+    """Bounding box of the elements, groups among them are skipped, None if there is no element"""
+    elements = [element for element in elements if not isinstance(element, Group)]
+    if not elements:
+        return None
+    xs = [element.x for element in elements]
+    ys = [element.y for element in elements]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def touches_bounds(bounds, inner):
+    """True if the inner box reaches a border of the bounding box, removing it may make the bounding box smaller"""
+    return (inner[0] <= bounds[0] or inner[1] <= bounds[1] or inner[2] >= bounds[2] or inner[3] >= bounds[3])
+
+
+def transformed_bounds(bounds, coefficients):
+    """Bounding box of the transformed corners of a bounding box
+
+    Args:
+        bounds (tuple): Bounding box (left, top, right, bottom).
+        coefficients (tuple): Coefficients (a, b, c, d, e, f) of the affine transformation.
+
+    Returns:
+        Bounding box, which is exact if the transformation keeps the axes and encloses the transformed box otherwise.
+    """
+    a, b, c, d, e, f = coefficients
+    left, top, right, bottom = bounds
+    xs = [a * x + b * y + c for x, y in ((left, top), (right, top), (left, bottom), (right, bottom))]
+    ys = [d * x + e * y + f for x, y in ((left, top), (right, top), (left, bottom), (right, bottom))]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def coefficients_of(matrix):
+    """Coefficients (a, b, c, d, e, f) of the first two rows of a 3x3 matrix"""
+    if hasattr(matrix, "tolist"):
+        matrix = matrix.tolist()
+    return (*matrix[0], *matrix[1])
+
+
 class ComponentAbc(ABC):
 
+    __slots__ = ()
+
     @abstractmethod
     def set_transformer(self, transformer):
         pass
@@ -38,30 +101,70 @@ class ComponentAbc(ABC):
         pass
 
 
-class Element(ComponentAbc):
-    """The smallest unit in the composite structure
+class Style:
+    """Characteristics for the representation of elements
 
-    Besides the xy-coordinates the element has additional characteristics, which can make it
-    distinguishable in multiple ways.
+    Styles are flyweights - all elements with the same symbol and colors share one Style-object, so the
+    representation costs a single reference per element. Styles are never changed, an element gets another
+    Style-object instead.
 
     Attributes:
-            x (int/float): Location of the element.
-            y (int/float): Location of the element.
-            transformer (TransformerAbc): Defines the rules for coordinate transformation.
-            name (str): Used for description purpose.
             symbol (str): Used for representation and distinction.
             symbol_color (str): Used for representation and distinction.
             background_color (str): Used for representation and distinction.
     """
-    def __init__(self, x, y, transformer=TransformerAbc):
-        self.x = x
-        self.y = y
-        self.transformer = transformer
 
-        self.name = ""
-        self.symbol = ""
-        self.symbol_color = ""
-        self.background_color = ""
+    __slots__ = ("symbol", "symbol_color", "background_color")
+
+    _styles = {}
+
+    def __init__(self, symbol, symbol_color, background_color):
+        self.symbol = symbol
+        self.symbol_color = symbol_color
+        self.background_color = background_color
+
+    @classmethod
+    def get(cls, symbol="", symbol_color="", background_color=""):
+        key = (symbol, symbol_color, background_color)
+        style = cls._styles.get(key)
+        if style is None:
+            style = cls._styles[key] = cls(*key)
+        return style
+
+
+class ElementAbc(ComponentAbc):
+    """Behaviour of the elements, independent of where their values are kept
+
+    Subclasses provide x, y, transformer, name and style, either in slots like Element or calculated, like the
+    views of an ElementStore and the elements of instance groups. The class has no slots, so the calculated
+    elements don't carry unused ones.
+    """
+
+    __slots__ = ()
+
+    @property
+    def symbol(self):
+        return self.style.symbol
+
+    @symbol.setter
+    def symbol(self, symbol):
+        self.style = Style.get(symbol, self.style.symbol_color, self.style.background_color)
+
+    @property
+    def symbol_color(self):
+        return self.style.symbol_color
+
+    @symbol_color.setter
+    def symbol_color(self, color):
+        self.style = Style.get(self.style.symbol, color, self.style.background_color)
+
+    @property
+    def background_color(self):
+        return self.style.background_color
+
+    @background_color.setter
+    def background_color(self, color):
+        self.style = Style.get(self.style.symbol, self.style.symbol_color, color)
 
     def set_transformer(self, transformer):
         self.transformer = transformer
@@ -95,6 +198,14 @@ class Element(ComponentAbc):
     def scale(self, factor_x, factor_y):
         self.x, self.y = self.transformer.scale(self.x, self.y, factor_x, factor_y)
 
+    def transform(self, matrix):
+        self.x, self.y = self.transformer.transform(self.x, self.y, matrix)
+
+    def bounds(self):
+        x = self.x
+        y = self.y
+        return x, y, x, y
+
     def fill(self, setter, value):
         """Connects the Group-class with the setters of this class
 
@@ -118,62 +229,472 @@ class Element(ComponentAbc):
             self.set_background_color(value)
 
 
+class Element(ElementAbc):
+    """The smallest unit in the composite structure
+
+    Besides the xy-coordinates the element has additional characteristics, which can make it
+    distinguishable in multiple ways. The element has no instance dictionary and shares its
+    representation characteristics with other elements through a Style-object.
+
+    Attributes:
+            x (int/float): Location of the element.
+            y (int/float): Location of the element.
+            transformer (TransformerAbc): Defines the rules for coordinate transformation.
+            name (str): Used for description purpose.
+            style (Style): Shared symbol, symbol_color and background_color.
+    """
+
+    __slots__ = ("x", "y", "transformer", "name", "style")
+
+    def __init__(self, x, y, transformer=TransformerAbc):
+        self.x = x
+        self.y = y
+        self.transformer = transformer
+
+        self.name = ""
+        self.style = Style.get()
+
+
 class Group(ComponentAbc):
     """A group can contain multiple objects of the class Element
 
-    A group calls the coordinate transformation on all elements that it contains.
+    A group calls the coordinate transformation on all elements that it contains. The coordinates of the elements
+    are collected and transformed together with one matrix multiplication.
+
+    Groups can be nested to any depth. Every group holds a local transformation, its pending matrix. A group applies
+    a transformation only to its center and its own elements, nested groups combine the matrix with their pending
+    matrix. So the cost of a transformation doesn't depend on the content of nested groups, their coordinates are
+    resolved level by level when they are read through their groups and stay valid until the next transformation.
+    Coordinates of nested components which are read directly, e.g. from the list of components(), require resolve().
+
+    A deferred group doesn't transform even its own elements right away. The matrices of consecutive
+    transformations are multiplied into the pending matrix, which is applied when the coordinates are read the next
+    time.
+
+    The group keeps the axis-aligned bounding box of its own elements. The box is extended when elements are added
+    and transformed together with the group, it is only determined again from the elements after removing an element
+    from its border or a transformation which doesn't keep the axes, e.g. rotation by 30 degrees. The bounding box
+    of the whole content combines the boxes of the group and all nested groups. It is kept until any group changes,
+    which is tracked with a revision counter shared by all groups, every group remembers the revision of its last
+    change. Elements changed directly, not through their group, require invalidate_bounds().
+
+    The members are kept in a dictionary keyed on the elements, which are hashed by identity, so adding, removing
+    and testing a member take constant time and an element is a member only once. The list of the elements keeps
+    the order of adding, it is made again from the dictionary when it is read after a removal.
 
     Attributes:
             transformer (TransformerAbc): Defines the rules for coordinate transformation.
             elements (List): contains Element-objects
+            deferred (bool): Activates the composition of transformations.
+            pending (np.ndarray/None): Local transformation, composed matrix which is not yet applied to the center
+            and the elements.
+            modified (int): Revision of the last change of the group.
     """
 
+    __slots__ = ("_x", "_y", "symbol", "transformer", "_members", "_listed", "deferred", "pending", "_bounds",
+                 "_content_bounds", "_revision", "modified")
+
+    # incremented on every change of any group
+    revision = 0
+
     def __init__(self, transformer=TransformerAbc):
+        self.deferred = False
+        self.pending = None
         self.x = 0
         self.y = 0
         self.symbol = "+"
         self.transformer = transformer
         self.elements: List[ComponentAbc] = []
+        self._bounds = None
+        self._content_bounds = None
+        self._revision = -1
+
+    @property
+    def x(self):
+        self.flush()
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._x = x
+
+    @property
+    def y(self):
+        self.flush()
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        self._y = y
+
+    @property
+    def elements(self):
+        self.flush()
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements):
+        self.pending = None
+        self._bounds = UNMEASURED
+        self._elements = elements
+        self.changed()
+
+    @property
+    def _elements(self):
+        # the list of the members in the order they were added, made again on the first read after a removal
+        listed = self._listed
+        if listed is None:
+            if self._members is NO_MEMBERS:
+                return ()
+            listed = self._listed = list(self._members)
+        return listed
+
+    @_elements.setter
+    def _elements(self, elements):
+        self._members = dict.fromkeys(elements, True)
+        self._listed = None
+
+    def __contains__(self, element):
+        return element in self._members
+
+    def admit(self, elements):
+        """Makes the elements members of the group, elements which are members already are skipped
+
+        Only the membership changes, the bounding box and the revision are updated by the caller.
+
+        Args:
+            elements (Iterable): Elements and groups.
+
+        Returns:
+            List of the new members.
+        """
+        members = self._members
+        new = dict.fromkeys(elements, True)
+        if members:
+            new = dict.fromkeys([element for element in new if element not in members], True)
+        members.update(new)
+        admitted = list(new)
+        if self._listed is not None:
+            self._listed.extend(admitted)
+        return admitted
+
+    def dismiss(self, elements):
+        """Ends the membership of the elements, elements which aren't members are skipped
+
+        The list of the members is made again when it is read the next time, unless only the last member was removed.
+        Only the membership changes, the bounding box and the revision are updated by the caller.
+
+        Args:
+            elements (Iterable): Elements and groups.
+
+        Returns:
+            List of the removed members.
+        """
+        pop = self._members.pop
+        dismissed = [element for element in elements if pop(element, False)]
+        if dismissed:
+            listed = self._listed
+            if len(dismissed) == 1 and listed and listed[-1] is dismissed[0]:
+                listed.pop()
+            else:
+                self._listed = None
+        return dismissed
 
     def add(self, element: Element):
-        self.elements.append(element)
+        self.flush()
+        if element not in self._members:
+            self._members[element] = True
+            if self._listed is not None:
+                self._listed.append(element)
+            if self._bounds is not UNMEASURED and not isinstance(element, Group):
+                self._bounds = union_bounds(self._bounds, element.bounds())
+        self.changed()
+
+    def add_many(self, elements):
+        """Adds many elements and groups at once, the bounding box is extended once for all of them
+
+        Args:
+            elements (Iterable): Elements and groups to add.
+
+        Returns:
+            List of the added elements and groups.
+        """
+        self.flush()
+        added = self.admit(elements)
+        if self._bounds is not UNMEASURED:
+            self._bounds = union_bounds(self._bounds, bounds_of(added))
+        self.changed()
+        return added
 
     def remove(self, element: Element):
-        self.elements.remove(element)
+        self.flush()
+        if not self.dismiss((element,)):
+            raise ValueError("the element is not in the group")
+        self.shrink_bounds([element])
+        self.changed()
+
+    def remove_many(self, elements):
+        """Removes many elements, each of them in constant time
+
+        Elements which aren't in the group are skipped.
+
+        Args:
+            elements (Iterable): Elements in the group.
+
+        Returns:
+            List of the removed elements and groups.
+        """
+        self.flush()
+        removed = self.dismiss(elements)
+        self.shrink_bounds(removed)
+        self.changed()
+        return removed
+
+    def move_to(self, group, elements):
+        """Transfers elements and groups from this group to another group, both in bulk
+
+        Elements which aren't in this group are skipped.
+
+        Args:
+            group (Group): The receiving group, e.g. the canvas.
+            elements (Iterable): Elements and groups of this group.
+
+        Returns:
+            List of the elements and groups as added to the other group.
+        """
+        return group.add_many(self.remove_many(elements))
+
+    def clear(self):
+        self.flush()
+        self._elements = ()
+        self._bounds = None
+        self.changed()
+
+    def changed(self):
+        Group.revision += 1
+        self.modified = Group.revision
+
+    def bounds(self):
+        """Axis-aligned bounding box of all elements including the elements of nested groups
+
+        The group centers are not included. The boxes of the group and all nested groups are combined from the
+        innermost level outwards without recursion and kept for every nested group until any group changes.
+
+        Returns:
+            Tuple (left, top, right, bottom) or None for a group without elements.
+        """
+        if self._revision == Group.revision:
+            return self._content_bounds
+
+        self.resolve()
+        groups = []
+        stack = [self]
+        while stack:
+            group = stack.pop()
+            groups.append(group)
+            stack.extend(element for element in group._elements if isinstance(element, Group))
+
+        for group in reversed(groups):
+            bounds = group.own_bounds()
+            for element in group._elements:
+                if isinstance(element, Group):
+                    bounds = union_bounds(bounds, element._content_bounds)
+            group._content_bounds = bounds
+            group._revision = Group.revision
+        return self._content_bounds
+
+    def own_bounds(self):
+        """Bounding box of the own elements, nested groups are not included"""
+        if self._bounds is UNMEASURED:
+            self._bounds = self.measure_bounds()
+        return self._bounds
+
+    def measure_bounds(self):
+        """Determines the bounding box of the own elements from their coordinates"""
+        return bounds_of(self._elements)
+
+    def invalidate_bounds(self):
+        """Forgets the bounding box, it is determined again when it is requested the next time"""
+        self._bounds = UNMEASURED
+        self.changed()
+
+    def shrink_bounds(self, removed):
+        # the box stays valid, if none of the removed elements was on its border
+        if self._bounds is None or self._bounds is UNMEASURED:
+            return
+        for component in removed:
+            if isinstance(component, Group):
+                continue
+            bounds = component.bounds()
+            if bounds is not None and touches_bounds(self._bounds, bounds):
+                self._bounds = UNMEASURED
+                return
+
+    def transform_bounds(self, matrix):
+        """Transforms the bounding box together with the own elements
+
+        The corners of the box are transformed, if the matrix keeps the axes (move, scale, mirror, rotation by
+        multiples of 90 degrees). Otherwise the box is determined again from the elements when it is requested.
+
+        Args:
+            matrix (List/np.ndarray): 3x3 transformation matrix with included reference point.
+
+        Returns:
+            None
+        """
+        if self._bounds is None or self._bounds is UNMEASURED:
+            return
+        coefficients = coefficients_of(matrix)
+        a, b, c, d, e, f = coefficients
+        tolerance = AXIS_TOLERANCE * max(abs(a), abs(b), abs(d), abs(e))
+        if (abs(b) <= tolerance and abs(d) <= tolerance) or (abs(a) <= tolerance and abs(e) <= tolerance):
+            self._bounds = transformed_bounds(self._bounds, coefficients)
+        else:
+            self._bounds = UNMEASURED
+
+    def overlaps(self, left, top, right, bottom):
+        """True if elements of the group may be displayed within the rectangle, borders included
+
+        Only the bounding box is compared, the elements are not visited.
+        """
+        bounds = self.bounds()
+        if bounds is None:
+            return False
+        return (round(bounds[0]) <= right and round(bounds[2]) >= left and
+                round(bounds[1]) <= bottom and round(bounds[3]) >= top)
 
     def set_transformer(self, transformer):
         self.transformer = transformer
 
-    def move(self, delta_x, delta_y):
-        for element in self.elements:
-            element.set_transformer(self.transformer)
-            element.move(delta_x, delta_y)
+    def set_deferred(self, deferred):
+        """Switches the composition of transformations on or off
 
-        self.x, self.y = self.transformer.move(self.x, self.y, delta_x, delta_y)
+        Switching off applies the pending matrix.
 
-    def rotate(self, theta):
-        for element in self.elements:
-            element.set_transformer(self.transformer)
-            element.rotate(theta)
+        Args:
+            deferred (bool): True for composition of transformations.
 
-        self.x, self.y = self.transformer.rotate(self.x, self.y, theta)
+        Returns:
+            None
+        """
+        self.deferred = deferred
+        if not deferred:
+            self.flush()
+
+    def flush(self):
+        """Applies the pending matrix to the group center and its own elements, nested groups take it over"""
+        if self.pending is not None:
+            pending = self.pending
+            self.pending = None
+            self.apply(pending)
+
+    def resolve(self):
+        """Applies the pending matrices of the group and all nested groups, level by level without recursion"""
+        stack = [self]
+        while stack:
+            group = stack.pop()
+            group.flush()
+            stack.extend(element for element in group._elements if isinstance(element, Group))
+
+    def components(self):
+        """All components of the group including the group itself and the content of nested groups
+
+        The nesting is resolved with an explicit stack, so deep structures don't hit the recursion limit. Pending
+        matrices are not applied, only the membership is evaluated, see resolve().
 
-    def mirror(self, axis):
-        for element in self.elements:
-            element.set_transformer(self.transformer)
-            element.mirror(axis)
+        Returns:
+            List of Element- and Group-objects.
+        """
+        components = []
+        stack = [self]
+        while stack:
+            component = stack.pop()
+            components.append(component)
+            if isinstance(component, Group):
+                stack.extend(reversed(component._elements))
+        return components
 
-        self.x, self.y = self.transformer.mirror(self.x, self.y, axis)
+    def transform(self, matrix):
+        """Transforms the group center and all elements with one transformation matrix
 
-    def scale(self, factor_x, factor_y):
-        for element in self.elements:
-            element.set_transformer(self.transformer)
-            element.scale(factor_x, factor_y)
+        The reference point of the transformer is included in the matrix at the time of the call. A deferred group
+        only combines the result with the pending matrix.
 
-        self.x, self.y = self.transformer.scale(self.x, self.y, factor_x, factor_y)
+        Args:
+            matrix (List/np.ndarray): 3x3 transformation matrix.
+
+        Returns:
+            None
+        """
+        self.compose(self.transformer.reference_matrix(matrix))
+
+    def compose(self, matrix):
+        """Applies a matrix with included reference point or combines it with the pending matrix of a deferred group
+
+        Args:
+            matrix (np.ndarray): 3x3 transformation matrix, usually created by reference_matrix().
+
+        Returns:
+            None
+        """
+        if not self.deferred:
+            self.apply(matrix)
+        else:
+            self.defer(matrix)
+
+    def defer(self, matrix):
+        """Combines a matrix with included reference point with the pending matrix, which is applied on reading"""
+        if self.pending is None:
+            self.pending = matrix
+        else:
+            self.pending = matrix @ self.pending
+        self.changed()
+
+    def apply(self, matrix):
+        """Applies a matrix with included reference point to the group center and its own elements in a single batch
+
+        Nested groups only combine the matrix with their pending matrix. The bounding box is transformed as well.
+
+        Args:
+            matrix (np.ndarray): 3x3 transformation matrix, usually created by reference_matrix().
+
+        Returns:
+            None
+        """
+        elements = [element for element in self._elements if not isinstance(element, Group)]
+        new_xs, new_ys = self.transformer.apply_many([self._x] + [element.x for element in elements],
+                                                     [self._y] + [element.y for element in elements],
+                                                     matrix)
+        new_xs = new_xs.tolist()
+        new_ys = new_ys.tolist()
+
+        self._x = new_xs[0]
+        self._y = new_ys[0]
+        for element, new_x, new_y in zip(elements, new_xs[1:], new_ys[1:]):
+            element.x = new_x
+            element.y = new_y
+
+        for element in self._elements:
+            if isinstance(element, Group):
+                element.defer(matrix)
+        self.transform_bounds(matrix)
+        self.changed()
+
+    def move(self, delta_x, delta_y):
+        self.compose(self.transformer.cached_matrix("move", delta_x, delta_y))
+
+    def rotate(self, theta):
+        self.compose(self.transformer.cached_matrix("rotate", theta))
+
+    def mirror(self, axis):
+        if axis in ("xy", "x", "y"):
+            self.compose(self.transformer.cached_matrix("mirror", axis))
+
+    def scale(self, factor_x, factor_y):
+        self.compose(self.transformer.cached_matrix("scale", factor_x, factor_y))
 
     def fill(self, setter: str, value):
-        """Sets attribute values for all elements in the group
+        """Sets attribute values for all elements in the group, including the elements of nested groups
 
         Args:
             setter (str): Identifier for the setter.
@@ -182,34 +703,70 @@ class Group(ComponentAbc):
         Returns:
             None
         """
-        for element in self.elements:
-            element.fill(setter, value)
-
-    def union(self, other):
+        components = self.components()
+        instances = [component for component in components if getattr(component, "instanced", False)]
+        if instances:
+            for instance in instances:
+                instance.materialize()
+            components = self.components()
+
+        for component in components:
+            if not isinstance(component, Group):
+                component.fill(setter, value)
+
+    def union(self, other, in_place=True):
         """Combines elements of two groups
 
+        Elements are compared by identity. Elements already in the current group are not added again.
+
         Args:
             other (Group): Group with elements, which will be added to the current group.
+            in_place (bool): False leaves the current group unchanged and only returns the result.
 
         Returns:
             List of elements.
         """
-        self.elements.extend(other.elements)
+        own = set(self.elements)
+        added = [element for element in other.elements if element not in own]
+        if not in_place:
+            return self.elements + added
+
+        self.add_many(added)
         return self.elements
 
-    def difference(self, other):
+    def difference(self, other, in_place=True):
         """Reduce number of elements in the current group
 
         Args:
             other (Group): Group with elements, which will be removed from the current group
             if belonging to both groups.
+            in_place (bool): False leaves the current group unchanged and only returns the result.
 
         Returns:
             List of elements.
         """
-        for element in self.elements:
-            if element in other.elements:
-                self.elements.remove(element)
+        others = set(other.elements)
+        if not in_place:
+            return [element for element in self.elements if element not in others]
+
+        self.remove_many([element for element in self.elements if element in others])
+        return self.elements
+
+    def intersection(self, other, in_place=True):
+        """Reduce the elements of the current group to the ones belonging to both groups
+
+        Args:
+            other (Group): Group with elements.
+            in_place (bool): False leaves the current group unchanged and only returns the result.
+
+        Returns:
+            List of elements.
+        """
+        others = set(other.elements)
+        if not in_place:
+            return [element for element in self.elements if element in others]
+
+        self.remove_many([element for element in self.elements if element not in others])
         return self.elements
 
     def split(self, other):
@@ -226,29 +783,695 @@ class Group(ComponentAbc):
         Returns:
             List with three entries, which are lists of elements.
         """
+        own = set(self.elements)
+        others = set(other.elements)
+
         elements_group_1 = []
         elements_intersection = []
-        elements_group_2 = []
 
         for element in self.elements:
-            if element not in other.elements:
+            if element not in others:
                 elements_group_1.append(element)
             else:
                 elements_intersection.append(element)
 
-        for element in other.elements:
-            if element not in self.elements:
-                elements_group_2.append(element)
+        elements_group_2 = [element for element in other.elements if element not in own]
 
         return [elements_group_1, elements_intersection, elements_group_2]
 
 
+# coefficients (a, b, c, d, e, f) of the affine transformation x' = a*x + b*y + c, y' = d*x + e*y + f
+IDENTITY_PLACEMENT = (1, 0, 0, 0, 1, 0)
+
+
+class Prototype:
+    """Immutable geometry shared by all instances of a shape
+
+    Prototypes are flyweights like styles - all instances of the same group share one Prototype-object, which is
+    created from the elements of the group when it is requested the first time. Later changes of the group are not
+    seen by the prototype.
+
+    Attributes:
+            x (int/float): Center of the shape.
+            y (int/float): Center of the shape.
+            xs (tuple): x-coordinates of the elements.
+            ys (tuple): y-coordinates of the elements.
+            names (tuple): Names of the elements.
+            styles (tuple): Style-objects of the elements.
+            bounds (tuple/None): Bounding box (left, top, right, bottom) of the elements.
+    """
+
+    __slots__ = ("x", "y", "xs", "ys", "names", "styles", "bounds")
+
+    _prototypes = {}
+
+    def __init__(self, x, y, xs, ys, names, styles):
+        self.x = x
+        self.y = y
+        self.xs = tuple(xs)
+        self.ys = tuple(ys)
+        self.names = tuple(names)
+        self.styles = tuple(styles)
+        self.bounds = (min(self.xs), min(self.ys), max(self.xs), max(self.ys)) if self.xs else None
+
+    def __len__(self):
+        return len(self.xs)
+
+    @classmethod
+    def get(cls, group):
+        # the group is kept together with its prototype, so its identity can't be reused
+        entry = cls._prototypes.get(id(group))
+        if entry is None:
+            elements = group.elements
+            prototype = cls(group.x, group.y, [element.x for element in elements],
+                            [element.y for element in elements], [element.name for element in elements],
+                            [element.style for element in elements])
+            entry = cls._prototypes[id(group)] = (group, prototype)
+        return entry[1]
+
+
+class InstanceElement(ElementAbc):
+    """Element of an instance group, which is calculated from the prototype when it is read
+
+    Setting a value materializes the whole instance group and changes its own element.
+
+    Attributes:
+            group (InstanceGroup): Group the element belongs to.
+            index (int): Position of the element in the prototype.
+    """
+
+    __slots__ = ("group", "index")
+
+    def __init__(self, group, index):
+        self.group = group
+        self.index = index
+
+    def element(self):
+        """The own element of the materialized group or None, while the group uses the prototype"""
+        self.group.flush()
+        if self.group.placement is None:
+            return self.group._elements[self.index]
+        return None
+
+    def materialized(self):
+        self.group.materialize()
+        return self.group._elements[self.index]
+
+    @property
+    def x(self):
+        element = self.element()
+        if element is not None:
+            return element.x
+        placement = self.group.placement
+        x = self.group.prototype.xs[self.index]
+        if placement is IDENTITY_PLACEMENT:
+            return x
+        return placement[0] * x + placement[1] * self.group.prototype.ys[self.index] + placement[2]
+
+    @x.setter
+    def x(self, x):
+        self.materialized().x = x
+
+    @property
+    def y(self):
+        element = self.element()
+        if element is not None:
+            return element.y
+        placement = self.group.placement
+        y = self.group.prototype.ys[self.index]
+        if placement is IDENTITY_PLACEMENT:
+            return y
+        return placement[3] * self.group.prototype.xs[self.index] + placement[4] * y + placement[5]
+
+    @y.setter
+    def y(self, y):
+        self.materialized().y = y
+
+    @property
+    def transformer(self):
+        element = self.element()
+        return self.group.transformer if element is None else element.transformer
+
+    @transformer.setter
+    def transformer(self, transformer):
+        self.materialized().transformer = transformer
+
+    @property
+    def name(self):
+        element = self.element()
+        return self.group.prototype.names[self.index] if element is None else element.name
+
+    @name.setter
+    def name(self, name):
+        self.materialized().name = name
+
+    @property
+    def style(self):
+        element = self.element()
+        return self.group.prototype.styles[self.index] if element is None else element.style
+
+    @style.setter
+    def style(self, style):
+        self.materialized().style = style
+
+
+class InstanceGroup(Group):
+    """Group which shares the geometry of a prototype with other instances of the same shape
+
+    The instance keeps only its center and one affine transformation (placement) of the prototype. Transformations
+    are combined with the placement, the coordinates of the elements are calculated when they are read. Adding,
+    removing or changing elements materializes the instance: it gets its own elements and behaves like a Group from
+    then on.
+
+    Attributes:
+            prototype (Prototype): Shared geometry of the shape.
+            placement (tuple/None): Coefficients of the affine transformation of the prototype, None after
+            materializing.
+    """
+
+    __slots__ = ("prototype", "placement")
+
+    def __init__(self, prototype, transformer=TransformerAbc):
+        super().__init__(transformer)
+        self.prototype = prototype
+        self.placement = IDENTITY_PLACEMENT
+        self._members = NO_MEMBERS
+        self._listed = None
+        self._bounds = UNMEASURED
+        self.x = prototype.x
+        self.y = prototype.y
+
+    @property
+    def instanced(self):
+        """True while the elements are calculated from the prototype"""
+        return self.placement is not None
+
+    @property
+    def elements(self):
+        self.flush()
+        if self.placement is None:
+            return self._elements
+        return [InstanceElement(self, index) for index in range(len(self.prototype))]
+
+    @elements.setter
+    def elements(self, elements):
+        self.pending = None
+        self._bounds = UNMEASURED
+        self.placement = None
+        self._elements = elements
+        self.changed()
+
+    def place(self, placement):
+        """Uses the prototype again with the given placement, own elements are dropped"""
+        self.pending = None
+        self._bounds = UNMEASURED
+        self.placement = placement
+        self._members = NO_MEMBERS
+        self._listed = None
+        self.changed()
+
+    def measure_bounds(self):
+        """Bounding box of the prototype transformed with the placement, the elements are not calculated"""
+        if self.placement is None:
+            return super().measure_bounds()
+        if self.prototype.bounds is None:
+            return None
+        return transformed_bounds(self.prototype.bounds, self.placement)
+
+    def apply(self, matrix):
+        super().apply(matrix)
+        self.transform_instance(matrix)
+
+    def transform_instance(self, matrix):
+        """Combines a matrix with included reference point with the placement
+
+        The group center is not changed, it is transformed by Group.apply().
+
+        Args:
+            matrix (List/np.ndarray): 3x3 transformation matrix.
+
+        Returns:
+            None
+        """
+        if self.placement is None:
+            return
+        m_a, m_b, m_c, m_d, m_e, m_f = coefficients_of(matrix)
+        a, b, c, d, e, f = self.placement
+        self.placement = (m_a * a + m_b * d, m_a * b + m_b * e, m_a * c + m_b * f + m_c,
+                          m_d * a + m_e * d, m_d * b + m_e * e, m_d * c + m_e * f + m_f)
+
+    def materialize(self):
+        """Creates own elements with the current coordinates of the prototype elements"""
+        self.flush()
+        if self.placement is None:
+            return
+        elements = []
+        for view in self.elements:
+            element = Element(view.x, view.y, self.transformer)
+            element.name = view.name
+            element.style = view.style
+            elements.append(element)
+        self.elements = elements
+
+    def add(self, element: Element):
+        self.materialize()
+        super().add(element)
+
+    def add_many(self, elements):
+        self.materialize()
+        return super().add_many(elements)
+
+    def remove(self, element: Element):
+        self.materialize()
+        super().remove(self.own_element(element))
+
+    def remove_many(self, elements):
+        self.materialize()
+        return super().remove_many([self.own_element(element) for element in elements])
+
+    def own_element(self, element):
+        """The own element for an element read from the instance before materializing, other elements unchanged"""
+        if isinstance(element, InstanceElement) and element.group is self:
+            return element.element()
+        return element
+
+    def clear(self):
+        self.flush()
+        self.elements = []
+
+    def fill(self, setter: str, value):
+        self.materialize()
+        super().fill(setter, value)
+
+    def union(self, other, in_place=True):
+        # elements are compared by identity, which only own elements have
+        self.materialize()
+        return super().union(other, in_place)
+
+    def difference(self, other, in_place=True):
+        self.materialize()
+        return super().difference(other, in_place)
+
+    def intersection(self, other, in_place=True):
+        self.materialize()
+        return super().intersection(other, in_place)
+
+    def split(self, other):
+        self.materialize()
+        return super().split(other)
+
+
 class Canvas(Group):
     """The canvas is a selection of all elements.
+
+    Optionally the single elements on the canvas are kept in a columnar ElementStore instead of a list. The canvas
+    then hands out views into the store, while groups are still kept in a list. Transformations, fills and
+    hit-tests of the stored elements work on whole columns.
+
+    The elements and groups in the list are indexed in a spatial grid, which is kept up to date on every change
+    made through the canvas. Groups are indexed by their center.
+
+    Listeners are informed about every change made through the canvas (observer pattern). They implement
+    on_add(component) and on_remove(component) for single changes and on_reset() for changes of the whole canvas.
+
+    The members in the list are numbered in the order of adding, so the position of a component in the elements of
+    the canvas is known without searching the list, see order().
+
+    Attributes:
+            transformer (TransformerAbc): Defines the rules for coordinate transformation.
+            store (ElementStore/None): Backing storage for the single elements.
+            index (SpatialGrid): Spatial index for the elements and groups in the list.
+            listeners (List): Objects informed about changes.
+            snapshots (SnapshotTracker): Creates mementos, which share unchanged content with older mementos.
+            stamp (int): Number of the last member added to the list.
     """
 
+    __slots__ = ("store", "index", "listeners", "snapshots", "stamp")
+
+    def __init__(self, transformer=TransformerAbc, store=None):
+        self.store = None
+        self.stamp = 0
+        self.index = SpatialGrid()
+        self.listeners = []
+        super().__init__(transformer)
+        self.store = store
+        if store is not None:
+            store.transformer = transformer
+            self._bounds = UNMEASURED
+
+        self.snapshots = SnapshotTracker(self)
+        self.add_listener(self.snapshots)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    @property
+    def elements(self):
+        self.flush()
+        if self.store is None:
+            return self._elements
+        return self.store.views(self.store.rows()) + self._elements
+
+    @elements.setter
+    def elements(self, elements):
+        self.pending = None
+        self._bounds = UNMEASURED
+        self._elements = []
+        self.changed()
+        self.index.clear()
+        if self.store is None:
+            self.admit(elements)
+            self.index.rebuild(elements)
+        else:
+            self.store.clear()
+            for element in elements:
+                self.add(element)
+
+        for listener in self.listeners:
+            listener.on_reset()
+
+    @property
+    def listed(self):
+        """Elements and groups kept in the list - all of them without a store, otherwise only the groups"""
+        self.flush()
+        return self._elements
+
+    def __contains__(self, element):
+        if self.store is not None and getattr(element, "store", None) is self.store:
+            return bool(self.store.alive[element.row])
+        return element in self._members
+
+    def admit(self, elements):
+        admitted = super().admit(elements)
+        stamp = self.stamp
+        self._members.update(zip(admitted, range(stamp + 1, stamp + len(admitted) + 1)))
+        self.stamp = stamp + len(admitted)
+        return admitted
+
+    def order(self, component):
+        """Sort key of a component in the order of the elements of the canvas, later components are drawn on top
+
+        Elements of the store come first in the order of their rows, the members of the list follow in the order of
+        adding. Changes of the coordinates keep the order.
+
+        Args:
+            component (Element/Group): Element or group on the canvas.
+
+        Returns:
+            Tuple, which compares like the positions of the components.
+        """
+        if self.store is not None and getattr(component, "store", None) is self.store:
+            return 0, component.row
+        return 1, self._members.get(component, 0)
+
+    def add(self, element):
+        self.flush()
+        if self.store is None or isinstance(element, Group):
+            if element in self._members:
+                return element
+            self.stamp += 1
+            self._members[element] = self.stamp
+            if self._listed is not None:
+                self._listed.append(element)
+            self.index.insert(element)
+        else:
+            element = self.store.add(element)
+        if self._bounds is not UNMEASURED and not isinstance(element, Group):
+            self._bounds = union_bounds(self._bounds, element.bounds())
+        self.changed()
+
+        for listener in self.listeners:
+            listener.on_add(element)
+        return element
+
+    def add_many(self, elements):
+        """Adds many elements and groups at once
+
+        Elements and groups which are on the canvas already are skipped. The bounding box is extended once for all
+        of them.
+
+        Args:
+            elements (Iterable): Elements and groups to add.
+
+        Returns:
+            List of the added elements and groups, single elements as views if the canvas has a store.
+        """
+        self.flush()
+        added = []
+        listed = []
+        for element in elements:
+            if self.store is None or isinstance(element, Group):
+                listed.append(element)
+            else:
+                added.append(self.store.add(element))
+
+        listed = self.admit(listed)
+        for component in listed:
+            self.index.insert(component)
+        added += listed
+
+        if self._bounds is not UNMEASURED:
+            self._bounds = union_bounds(self._bounds, bounds_of(added))
+        self.changed()
+
+        for component in added:
+            for listener in self.listeners:
+                listener.on_add(component)
+        return added
+
+    def remove(self, element):
+        self.flush()
+        if self.store is not None and getattr(element, "store", None) is self.store:
+            self.store.release(element.row)
+        else:
+            if not self.dismiss((element,)):
+                raise ValueError("the element is not on the canvas")
+            self.index.discard(element)
+        self.shrink_bounds([element])
+        self.changed()
+
+        for listener in self.listeners:
+            listener.on_remove(element)
+
+    def update(self, components):
+        """Informs the canvas about elements and groups which were changed without the canvas
+
+        Components which are not on the canvas are ignored. The bounding box of the canvas is determined again when
+        it is requested the next time.
+
+        Args:
+            components (List): Changed elements and groups.
+
+        Returns:
+            None
+        """
+        self.flush()
+        self._bounds = UNMEASURED
+        self.changed()
+        for component in components:
+            if self.store is not None and getattr(component, "store", None) is self.store:
+                if not self.store.alive[component.row]:
+                    continue
+            elif id(component) in self.index.keys:
+                self.index.insert(component)
+            else:
+                continue
+
+            for listener in self.listeners:
+                listener.on_remove(component)
+                listener.on_add(component)
+
+    def remove_many(self, components):
+        """Removes many elements and groups, each of them in constant time
+
+        Elements and groups which aren't on the canvas are skipped.
+
+        Args:
+            components (Iterable): Elements and groups on the canvas.
+
+        Returns:
+            List of the removed elements and groups.
+        """
+        self.flush()
+        removed = []
+        listed = []
+        for component in components:
+            if self.store is not None and getattr(component, "store", None) is self.store:
+                if self.store.alive[component.row]:
+                    self.store.release(component.row)
+                    removed.append(component)
+            else:
+                listed.append(component)
+
+        listed = self.dismiss(listed)
+        self.index.discard_many(listed)
+        removed += listed
+
+        self.shrink_bounds(removed)
+        self.changed()
+
+        for component in removed:
+            for listener in self.listeners:
+                listener.on_remove(component)
+        return removed
+
+    def add_columns(self, xs, ys, name="", symbol="", symbol_color="", background_color=""):
+        """Adds many elements given as columns of their characteristics
+
+        With a store the columns are appended to the store at once, otherwise elements are created. Every
+        characteristic is either a single string for all new elements or a sequence with one string per element.
+        The listeners are informed with a single on_reset(), the bounding box is determined again when it is requested
+        the next time.
+
+        Args:
+            xs (Sequence/np.ndarray): x-coordinates of the new elements.
+            ys (Sequence/np.ndarray): y-coordinates of the new elements.
+
+        Returns:
+            None
+        """
+        self.flush()
+        if self.store is not None:
+            self.store.extend(xs, ys, name, symbol, symbol_color, background_color)
+        else:
+            strings = [repeat(value) if isinstance(value, str) else value
+                       for value in (name, symbol, symbol_color, background_color)]
+            elements = []
+            for x, y, element_name, element_symbol, element_symbol_color, element_background_color in zip(
+                    xs, ys, *strings):
+                element = Element(x, y, self.transformer)
+                element.name = element_name
+                element.style = Style.get(element_symbol, element_symbol_color, element_background_color)
+                elements.append(element)
+                self.index.insert(element)
+            self.admit(elements)
+        self._bounds = UNMEASURED
+        self.changed()
+
+        for listener in self.listeners:
+            listener.on_reset()
+
+    def clear(self):
+        if self.store is not None:
+            self.store.clear()
+        super().clear()
+        self.index.clear()
+
+        for listener in self.listeners:
+            listener.on_reset()
+
+    def measure_bounds(self):
+        bounds = super().measure_bounds()
+        if self.store is not None:
+            bounds = union_bounds(self.store.bounds(), bounds)
+        return bounds
+
+    def components(self):
+        if self.store is None:
+            return super().components()
+
+        components = [self]
+        for element in self._elements:
+            components.extend(element.components())
+        return components
+
+    def apply(self, matrix):
+        if self.store is not None:
+            self.store.apply(self.transformer, matrix)
+        super().apply(matrix)
+        self.index.rebuild(self._elements)
+
+        for listener in self.listeners:
+            listener.on_reset()
+
+    def fill(self, setter, value):
+        self.flush()
+        if self.store is not None:
+            self.store.fill(setter, value)
+        for element in self._elements:
+            element.fill(setter, value)
+
+        for listener in self.listeners:
+            listener.on_reset()
+
+    def elements_at(self, x, y):
+        """Elements and groups displayed at the given position
+
+        Groups are found by their center.
+
+        Args:
+            x (int): Position on the canvas.
+            y (int): Position on the canvas.
+
+        Returns:
+            List of elements and groups.
+        """
+        self.flush()
+        found = self.index.at(x, y)
+        if self.store is not None:
+            found = self.store.views(self.store.rows_at(x, y)) + found
+        return found
+
+    def elements_in(self, left, top, right, bottom):
+        """Elements and groups displayed within the rectangle, borders included
+
+        Groups are found by their center.
+
+        Returns:
+            List of elements and groups.
+        """
+        self.flush()
+        found = self.index.query(left, top, right, bottom)
+        if self.store is not None:
+            found = self.store.views(self.store.rows_in(left, top, right, bottom)) + found
+        return found
+
+    def elements_within(self, polygon):
+        """Elements and groups displayed within the polygon, borders included
+
+        Only the cells in the rectangle around the polygon are tested against the polygon. Groups are found by their
+        center. A polygon with two corners is the line between them, with one corner a single cell.
+
+        Args:
+            polygon (List[tuple]): Corners (x, y) of the polygon, the last corner is connected to the first one.
+
+        Returns:
+            List of elements and groups.
+        """
+        self.flush()
+        found = self.index.query_polygon(polygon)
+        if self.store is not None:
+            found = self.store.views(self.store.rows_within(polygon)) + found
+        return found
+
     def create_memento(self):
-        return CanvasMemento(self.elements)
+        return self.snapshots.snapshot()
 
     def restore_from_memento(self, memento):
-        self.elements = memento.get_state()
+        """Restores the elements on the canvas together with their coordinates and characteristics
+
+        Args:
+            memento (CanvasMemento): Previously created memento of this canvas.
+
+        Returns:
+            None
+        """
+        differences = self.snapshots.differences(memento)
+        if differences is None:
+            for component, state in memento.records():
+                restore(component, state)
+            self.elements = memento.get_state()
+            self.snapshots.adopt(memento)
+            return
+
+        # only the blocks which differ from the memento are exchanged
+        self.snapshots.on_reset()
+        self.remove_many([component for block, members, records in differences for component in members])
+        for block, members, records in differences:
+            for component, state in records:
+                restore(component, state)
+                self.add(component)
+        self.snapshots.adopt(memento, [block for block, members, records in differences])
@@ -0,0 +1,194 @@
+"""Import and export of canvases as JSON Lines and CSV
+
+Every element and every group is one row with the fields:
+
+    id                  number of a group, empty for elements
+    group               number of the group containing the element or group, empty directly on the canvas
+    x, y                coordinates of the element or of the group center
+    name, symbol, symbol_color, background_color
+
+A group row comes before the rows of its content. The rows are written and read one by one with generators and
+imported in chunks, so files of any size are processed in bounded memory.
+
+    with open("drawing.jsonl", "w") as file:
+        write_jsonl(file, export_rows(canvas))
+
+    with open("drawing.csv", newline="") as file:
+        import_rows(canvas, read_csv(file))
+"""
+
+import csv
+import json
+import math
+from itertools import islice
+
+from backend.core import Element, Group
+
+FIELDS = ("id", "group", "x", "y", "name", "symbol", "symbol_color", "background_color")
+
+
+def element_row(element, group=None):
+    return {"id": None, "group": group, "x": element.x, "y": element.y, "name": element.name,
+            "symbol": element.symbol, "symbol_color": element.symbol_color,
+            "background_color": element.background_color}
+
+
+def export_rows(canvas, chunk_size=65536):
+    """Rows of all elements and groups on the canvas
+
+    Elements in a store are read column-wise in chunks.
+
+    Args:
+        canvas (Canvas): The canvas to export.
+        chunk_size (int): Number of store rows read at once.
+
+    Yields:
+        Dictionary with the fields of a row.
+    """
+    store = canvas.store
+    if store is not None:
+        alive = store.rows()
+        for start in range(0, len(alive), chunk_size):
+            rows = alive[start:start + chunk_size]
+            columns = zip(store.xs[rows].tolist(), store.ys[rows].tolist(), store.names[rows].tolist(),
+                          store.symbols[rows].tolist(), store.symbol_colors[rows].tolist(),
+                          store.background_colors[rows].tolist())
+            for x, y, name, symbol, symbol_color, background_color in columns:
+                yield {"id": None, "group": None, "x": x, "y": y, "name": store.strings.value(name),
+                       "symbol": store.strings.value(symbol), "symbol_color": store.strings.value(symbol_color),
+                       "background_color": store.strings.value(background_color)}
+
+    group_id = 0
+    stack = list(reversed([(component, None) for component in canvas.listed]))
+    while stack:
+        component, parent = stack.pop()
+        if not isinstance(component, Group):
+            yield element_row(component, parent)
+            continue
+
+        yield {"id": group_id, "group": parent, "x": component.x, "y": component.y, "name": "",
+               "symbol": component.symbol, "symbol_color": "", "background_color": ""}
+        stack.extend(reversed([(member, group_id) for member in component.elements]))
+        group_id += 1
+
+
+def import_rows(canvas, rows, chunk_size=65536):
+    """Adds the elements and groups of the rows to the canvas
+
+    Elements directly on the canvas are collected in chunks and added column-wise with Canvas.add_columns(). Groups
+    are created as objects and added when all rows are read.
+
+    Args:
+        canvas (Canvas): The canvas to import into.
+        rows (Iterable[dictionary]): Rows as created by export_rows(), read_jsonl() or read_csv().
+        chunk_size (int): Number of elements added at once.
+
+    Returns:
+        Number of imported rows.
+    """
+    groups = {}
+    top_groups = []
+    imported = 0
+
+    rows = iter(rows)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        elements = []
+        for row in chunk:
+            if row["id"] is not None:
+                group = Group(transformer=canvas.transformer)
+                group.x = row["x"]
+                group.y = row["y"]
+                group.symbol = row["symbol"]
+                groups[row["id"]] = group
+                if row["group"] is None:
+                    top_groups.append(group)
+                else:
+                    groups[row["group"]].add(group)
+            elif row["group"] is not None:
+                groups[row["group"]].add(Element(row["x"], row["y"], canvas.transformer)
+                                         .set_name(row["name"])
+                                         .set_symbol(row["symbol"])
+                                         .set_symbol_color(row["symbol_color"])
+                                         .set_background_color(row["background_color"]))
+            else:
+                elements.append(row)
+
+        if elements:
+            canvas.add_columns([row["x"] for row in elements], [row["y"] for row in elements],
+                               *([row[field] for row in elements] for field in FIELDS[4:]))
+        imported += len(chunk)
+        chunk = list(islice(rows, chunk_size))
+
+    for group in top_groups:
+        canvas.add(group)
+    return imported
+
+
+def json_number(value):
+    if type(value) in (int, float) and math.isfinite(value):
+        return repr(value)
+    return json.dumps(float(value))
+
+
+def write_jsonl(file, rows):
+    """Writes every row as a JSON object in its own line
+
+    The lines are formatted directly, only strings and unusual numbers go through the JSON encoder. Encoded strings
+    are reused, because the same symbols and colors repeat in most rows.
+
+    Returns:
+        Number of written rows.
+    """
+    encoded = {}
+
+    def string(value):
+        if value not in encoded:
+            encoded[value] = json.dumps(value)
+        return encoded[value]
+
+    written = 0
+    for row in rows:
+        file.write(f'{{"id":{"null" if row["id"] is None else row["id"]},'
+                   f'"group":{"null" if row["group"] is None else row["group"]},'
+                   f'"x":{json_number(row["x"])},"y":{json_number(row["y"])},'
+                   f'"name":{string(row["name"])},"symbol":{string(row["symbol"])},'
+                   f'"symbol_color":{string(row["symbol_color"])},'
+                   f'"background_color":{string(row["background_color"])}}}\n')
+        written += 1
+    return written
+
+
+def read_jsonl(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def write_csv(file, rows):
+    """Writes the rows as CSV with a header line, empty ids and groups stand for None
+
+    The file should be opened with newline="".
+
+    Returns:
+        Number of written rows.
+    """
+    writer = csv.writer(file)
+    writer.writerow(FIELDS)
+    written = 0
+    for row in rows:
+        writer.writerow(["" if row[field] is None else row[field] for field in FIELDS])
+        written += 1
+    return written
+
+
+def read_csv(file):
+    for row in csv.DictReader(file):
+        yield {"id": int(row["id"]) if row["id"] else None,
+               "group": int(row["group"]) if row["group"] else None,
+               "x": float(row["x"]),
+               "y": float(row["y"]),
+               "name": row["name"],
+               "symbol": row["symbol"],
+               "symbol_color": row["symbol_color"],
+               "background_color": row["background_color"]}
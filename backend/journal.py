@@ -0,0 +1,92 @@
+"""Undo/redo functionality based on executed commands.
+
+Instead of snapshots of the whole canvas the journal keeps the executed commands. Each command knows how to revert
+itself, e.g. with the inverse transformation matrix or the set of removed elements, so undo and redo only touch
+the affected elements and the memory of the journal grows with the edits, not with the canvas.
+"""
+
+
+class CommandJournal:
+    """Stores executed commands for undo and redo
+
+    The number of kept commands and the number of references to elements and groups they keep are limited. When a
+    limit is exceeded, the oldest commands are dropped and can't be undone anymore.
+
+    Attributes:
+        canvas (Canvas): The canvas the commands are executed on.
+        max_depth (int): Maximum number of commands available for undo.
+        max_size (int): Maximum number of references to elements and groups kept by all commands together.
+        commands_past (List[Command]): Commands available for undo, the newest at the end.
+        commands_future (List[Command]): Undone commands available for redo, the newest undone at the end.
+        size (int): Number of references to elements and groups kept by all commands.
+    """
+
+    def __init__(self, canvas, max_depth=100, max_size=10 ** 7):
+        self.canvas = canvas
+        self.max_depth = max_depth
+        self.max_size = max_size
+
+        self.commands_past = []
+        self.commands_future = []
+        self.size = 0
+
+    def execute(self, command):
+        command.execute()
+        self.record(command)
+
+    def record(self, command):
+        """Save an executed command
+
+        Recording a command clears the commands available for redo.
+
+        Args:
+            command (Command): The executed command.
+        """
+        for undone in self.commands_future:
+            self.size -= undone.size()
+        self.commands_future.clear()
+
+        self.commands_past.append(command)
+        self.size += command.size()
+        self.evict()
+
+    def evict(self):
+        """Drops the oldest commands until the limits are kept"""
+        dropped = 0
+        while dropped < len(self.commands_past) and (len(self.commands_past) - dropped > self.max_depth
+                                                     or self.size > self.max_size):
+            self.size -= self.commands_past[dropped].size()
+            dropped += 1
+        del self.commands_past[:dropped]
+
+    def undo(self):
+        """Reverts the newest command
+
+        Returns:
+            command (Command): The reverted command.
+            None
+        """
+        if not self.commands_past:
+            return None
+
+        command = self.commands_past.pop()
+        command.undo()
+        self.canvas.update(command.targets)
+        self.commands_future.append(command)
+        return command
+
+    def redo(self):
+        """Executes the newest undone command again
+
+        Returns:
+            command (Command): The executed command.
+            None
+        """
+        if not self.commands_future:
+            return None
+
+        command = self.commands_future.pop()
+        command.redo()
+        self.canvas.update(command.targets)
+        self.commands_past.append(command)
+        return command
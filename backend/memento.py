@@ -7,20 +7,280 @@ if changes need to be reverted or reimplemented.
 
 # FIXME: Is this front-end or back-end?
 
+BLOCK_SIZE = 256
+
+
+def capture(component):
+    """Immutable state of an element or group
+
+    The state of a group contains its members together with their states. The state of an instance group, which
+    uses its prototype, contains the placement instead of the members. Nested groups are visited with an explicit
+    stack and captured from the innermost level outwards, so deep structures don't hit the recursion limit.
+
+    Args:
+        component (Element/Group): Component to capture.
+
+    Returns:
+        Tuple with the values of the component.
+    """
+    if getattr(component, "instanced", False):
+        return component.x, component.y, None, component.placement
+    if not hasattr(component, "elements"):
+        return (component.x, component.y, component.name, component.symbol, component.symbol_color,
+                component.background_color)
+
+    groups = []
+    stack = [component]
+    while stack:
+        group = stack.pop()
+        members = group.elements
+        groups.append((group, members))
+        stack.extend(member for member in members
+                     if hasattr(member, "elements") and not getattr(member, "instanced", False))
+
+    states = {}
+    for group, members in reversed(groups):
+        states[id(group)] = (group.x, group.y, tuple((member, states[id(member)] if id(member) in states
+                                                      else capture(member)) for member in members))
+    return states[id(component)]
+
+
+def nested_groups(group):
+    """The group and all groups nested in it, without recursion"""
+    groups = []
+    stack = [group]
+    while stack:
+        group = stack.pop()
+        groups.append(group)
+        stack.extend(member for member in group.elements
+                     if hasattr(member, "elements") and not getattr(member, "instanced", False))
+    return groups
+
+
+def restore(component, state):
+    """Writes a state created by capture() back to the component, nested groups are restored without recursion"""
+    stack = [(component, state)]
+    while stack:
+        component, state = stack.pop()
+        if len(state) == 4:
+            component.x, component.y, members, placement = state
+            component.place(placement)
+        elif hasattr(component, "elements"):
+            component.x, component.y, members = state
+            stack.extend(members)
+            component.elements = [member for member, member_state in members]
+        else:
+            (component.x, component.y, component.name, component.symbol, component.symbol_color,
+             component.background_color) = state
+
+
 class CanvasMemento:
     # FIXME: Not inheriting from object
 
     """Saves all elements on the canvas.
 
+    The content is split in blocks of (component, state) records. A block is an immutable tuple, so mementos share
+    all blocks which didn't change between them and a new memento costs only the changed blocks.
+
     Attributes:
-        content (List[Element]): List of all elements on the canvas.
+        blocks (tuple): Tuples of records with a component and its captured state.
     """
 
-    def __init__(self, content):
-        self.content = content[:]
+    def __init__(self, blocks):
+        self.blocks = blocks
 
     def get_state(self):
-        return self.content
+        return [component for block in self.blocks for component, state in block]
+
+    def records(self):
+        for block in self.blocks:
+            yield from block
+
+
+class SnapshotTracker:
+    """Keeps track of the changes on a canvas to create mementos with structural sharing
+
+    Every component added to the canvas gets the next free slot, slots are grouped in blocks. A change marks the
+    block of the component dirty and only dirty blocks are captured again for the next memento. After changes of
+    the whole canvas all slots are assigned anew.
+
+    Groups on the canvas may also be transformed or changed directly, without the canvas. Every group remembers the
+    revision of its last change, so a group is captured again, if it or one of its nested groups changed since the
+    last memento. Only the groups are compared, elements changed directly require Canvas.update().
+
+    Attributes:
+        canvas (Canvas): The tracked canvas.
+        slots (dictionary): Slot of every component keyed on the identity of the component.
+        next_slot (int): Slot for the next added component.
+        members (List[dictionary]): Components of each block keyed on their slot.
+        blocks (List[tuple]): Captured blocks of the last memento.
+        dirty (set): Blocks changed since the last memento.
+        stale (bool): The slots must be assigned anew before the next memento.
+        groups (dictionary): Groups directly on the canvas keyed on their identity.
+        nested (dictionary): Nested groups of every captured group, including the group itself, keyed on the
+            identity of the group.
+        revision (int): Revision of the groups at the last memento.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.slots = {}
+        self.next_slot = 0
+        self.members = []
+        self.blocks = []
+        self.dirty = set()
+        self.stale = True
+        self.groups = {}
+        self.nested = {}
+        self.revision = 0
+
+    def on_add(self, component):
+        if self.stale:
+            return
+
+        slot = self.next_slot
+        self.next_slot += 1
+        block = slot // BLOCK_SIZE
+        if block == len(self.members):
+            self.members.append({})
+            self.blocks.append(())
+
+        self.slots[id(component)] = slot
+        self.members[block][slot] = component
+        self.dirty.add(block)
+        if hasattr(component, "elements"):
+            self.groups[id(component)] = component
+
+    def on_remove(self, component):
+        if self.stale:
+            return
+
+        slot = self.slots.pop(id(component))
+        del self.members[slot // BLOCK_SIZE][slot]
+        self.dirty.add(slot // BLOCK_SIZE)
+        self.groups.pop(id(component), None)
+        self.nested.pop(id(component), None)
+
+    def on_reset(self):
+        self.stale = True
+
+    def reassign(self):
+        """Assigns the slots in the order of the elements on the canvas"""
+        self.slots = {}
+        self.next_slot = 0
+        self.members = []
+        self.blocks = []
+        self.groups = {}
+        self.nested = {}
+        self.stale = False
+        for component in self.canvas.elements:
+            self.on_add(component)
+
+    def find_changed_groups(self):
+        """Marks the blocks of the groups dirty, which changed without the canvas since the last memento"""
+        for key, group in self.groups.items():
+            nested = self.nested.get(key)
+            if nested is None or any(member.modified > self.revision for member in nested):
+                self.dirty.add(self.slots[key] // BLOCK_SIZE)
+
+    def snapshot(self):
+        """Creates a memento, which shares all unchanged blocks with the previous one
+
+        Returns:
+            CanvasMemento
+        """
+        if self.stale:
+            self.reassign()
+        self.find_changed_groups()
+
+        for block in self.dirty:
+            self.blocks[block] = tuple((component, capture(component)) for component in self.members[block].values())
+            for component in self.members[block].values():
+                if hasattr(component, "elements"):
+                    self.nested[id(component)] = nested_groups(component)
+        self.dirty.clear()
+        # capturing applies pending matrices, which counts as a change of the groups
+        self.revision = self.canvas.revision
+
+        return CanvasMemento(tuple(self.blocks))
+
+    def differences(self, memento):
+        """Blocks in which the canvas differs from a memento
+
+        Blocks shared by the memento and the last snapshot, which didn't change since then, are skipped.
+
+        Args:
+            memento (CanvasMemento): Memento to compare with.
+
+        Returns:
+            List of tuples with the block, the components currently in the block and the records of the memento
+            for the block. None if the slots are stale and no comparison is possible.
+        """
+        if self.stale:
+            return None
+        self.find_changed_groups()
+
+        differences = []
+        for block in range(max(len(self.blocks), len(memento.blocks))):
+            current = self.blocks[block] if block < len(self.blocks) else ()
+            target = memento.blocks[block] if block < len(memento.blocks) else ()
+            if current is target and block not in self.dirty:
+                continue
+
+            members = list(self.members[block].values()) if block < len(self.members) else []
+            differences.append((block, members, target))
+        return differences
+
+    def adopt(self, memento, blocks=None):
+        """Takes over the slots of a memento after the canvas was restored from it
+
+        Args:
+            memento (CanvasMemento): Memento the canvas was restored from.
+            blocks (List[int]/None): Restored blocks, None if the whole canvas was restored.
+
+        Returns:
+            None
+        """
+        if blocks is None:
+            self.slots = {}
+            self.members = []
+            self.groups = {}
+            self.nested = {}
+            blocks = range(len(memento.blocks))
+
+        for members in self.members[len(memento.blocks):]:
+            for component in members.values():
+                del self.slots[id(component)]
+                self.groups.pop(id(component), None)
+                self.nested.pop(id(component), None)
+        del self.members[len(memento.blocks):]
+        while len(self.members) < len(memento.blocks):
+            self.members.append({})
+
+        # a component can move between the restored blocks, so all old slots are released before any new one is
+        # assigned
+        blocks = [block for block in blocks if block < len(memento.blocks)]
+        for block in blocks:
+            for component in self.members[block].values():
+                self.slots.pop(id(component), None)
+                self.groups.pop(id(component), None)
+                self.nested.pop(id(component), None)
+            self.members[block] = {}
+
+        for block in blocks:
+            for offset, (component, state) in enumerate(memento.blocks[block]):
+                slot = block * BLOCK_SIZE + offset
+                self.slots[id(component)] = slot
+                self.members[block][slot] = component
+                if hasattr(component, "elements"):
+                    self.groups[id(component)] = component
+                    self.nested[id(component)] = nested_groups(component)
+
+        self.blocks = list(memento.blocks)
+        self.next_slot = len(self.blocks) * BLOCK_SIZE
+        self.dirty.clear()
+        self.stale = False
+        self.revision = self.canvas.revision
 
 
 class History:
@@ -0,0 +1,160 @@
+"""Parallel transformations of the columns of an ElementStore
+
+A ShardPool keeps the columns of a store in shared memory. Large transformations and fills are split into shards of
+rows, which worker processes change in place. Only the names of the shared memory blocks, the shard limits and the
+coefficients are sent to the workers, the coordinates are never pickled.
+
+    pool = ShardPool(processes=4, threshold=1000000)
+    canvas = Canvas(transformer=transformer, store=ElementStore().share(pool))
+    canvas.move(1, 2)                   # uses the pool from a million elements on
+    pool.close()
+
+Small stores stay on the single process path, the pool is started with the first large operation.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# shared memory blocks attached in a worker process, keyed on their names
+attached = {}
+
+
+def attach(columns):
+    """Arrays on the shared memory blocks of the columns, blocks of earlier tasks are closed
+
+    Args:
+        columns (List[tuple]): Name of the block, dtype and length of each column.
+
+    Returns:
+        List of arrays.
+    """
+    names = {name for name, dtype, length in columns}
+    for name in list(attached):
+        if name not in names:
+            attached.pop(name).close()
+
+    arrays = []
+    for name, dtype, length in columns:
+        if name not in attached:
+            attached[name] = shared_memory.SharedMemory(name=name)
+        arrays.append(np.ndarray(length, dtype=dtype, buffer=attached[name].buf))
+    return arrays
+
+
+def transform_shard(columns, start, stop, coefficients):
+    """Transforms the coordinates of the alive rows start to stop in place"""
+    xs, ys, alive = attach(columns)
+    a, b, c, d, e, f = coefficients
+    # released rows keep their coordinates for views, which may be added to the store again
+    live = alive[start:stop]
+    rows = slice(start, stop) if live.all() else np.flatnonzero(live) + start
+    old_xs = xs[rows].copy()
+    old_ys = ys[rows].copy()
+    xs[rows] = a * old_xs + b * old_ys + c
+    ys[rows] = d * old_xs + e * old_ys + f
+
+
+def fill_shard(columns, start, stop, code):
+    """Writes the code into the alive rows start to stop of a string column"""
+    column, alive = attach(columns)
+    column[start:stop][alive[start:stop]] = code
+
+
+class ShardPool:
+    """Worker processes and shared memory for the columns of element stores
+
+    Attributes:
+        processes (int): Number of worker processes.
+        threshold (int): Smallest number of rows, which is processed by the workers.
+        shards (int): Number of shards per operation.
+        blocks (dictionary): Shared memory block of every allocated array keyed on the identity of the array.
+        retired (List): Released blocks, which are still used by arrays outside of the pool.
+        pool (multiprocessing.Pool/None): The workers, started with the first parallel operation.
+    """
+
+    def __init__(self, processes=None, threshold=1000000, shards=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.threshold = threshold
+        self.shards = shards or self.processes
+        self.blocks = {}
+        self.retired = []
+        self.pool = None
+
+    def array(self, length, dtype):
+        """Allocates a zeroed array in shared memory"""
+        dtype = np.dtype(dtype)
+        block = shared_memory.SharedMemory(create=True, size=max(length * dtype.itemsize, 1))
+        array = np.ndarray(length, dtype=dtype, buffer=block.buf)
+        array[:] = 0
+        self.blocks[id(array)] = (block, array)
+        return array
+
+    def shared(self, array):
+        return id(array) in self.blocks
+
+    def release(self, array):
+        """Frees the shared memory of an array allocated by this pool"""
+        block, array = self.blocks.pop(id(array), (None, None))
+        if block is not None:
+            del array
+            block.unlink()
+            self.retired.append(block)
+            self.close_retired()
+
+    def close_retired(self):
+        # a block can only be closed when no array uses its memory anymore
+        for block in list(self.retired):
+            try:
+                block.close()
+            except BufferError:
+                continue
+            self.retired.remove(block)
+
+    def describe(self, *arrays):
+        return [(self.blocks[id(array)][0].name, array.dtype.str, len(array)) for array in arrays]
+
+    def parallel(self, rows):
+        return rows >= self.threshold and self.processes > 0
+
+    def run(self, function, columns, rows, *arguments):
+        """Calls the function for every shard of the rows in the workers and waits for all of them"""
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.processes)
+        shard = -(-rows // self.shards)
+        tasks = [(columns, start, min(start + shard, rows), *arguments) for start in range(0, rows, shard)]
+        self.pool.starmap(function, tasks)
+
+    def transform(self, xs, ys, alive, rows, coefficients):
+        """Transforms the alive rows among the first rows of two shared coordinate columns in place
+
+        Args:
+            xs (np.ndarray): Shared x-coordinates.
+            ys (np.ndarray): Shared y-coordinates.
+            alive (np.ndarray): Shared mask of the alive rows.
+            rows (int): Number of rows to transform.
+            coefficients (tuple): Coefficients (a, b, c, d, e, f) of the affine transformation.
+
+        Returns:
+            None
+        """
+        self.run(transform_shard, self.describe(xs, ys, alive), rows, tuple(float(value) for value in coefficients))
+
+    def fill(self, column, alive, rows, code):
+        """Writes the code into the alive rows of a shared string column"""
+        self.run(fill_shard, self.describe(column, alive), rows, int(code))
+
+    def close(self):
+        """Stops the workers and frees all shared memory"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for key in list(self.blocks):
+            block, array = self.blocks.pop(key)
+            del array
+            block.unlink()
+            self.retired.append(block)
+        self.close_retired()
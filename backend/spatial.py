@@ -0,0 +1,166 @@
+"""Spatial index for the components on the canvas
+
+The canvas displays every component in the cell given by its rounded coordinates. A uniform grid with one bucket per
+occupied cell answers which components are displayed in a cell with a single dictionary lookup, no matter how many
+components exist. Areas of any shape are queried with the rectangle around them, the points found there are tested
+against the area all together.
+"""
+
+from itertools import compress
+from math import ceil, floor
+
+
+class SpatialGrid:
+    """Uniform grid with buckets of components keyed on rounded cell coordinates
+
+    Each component is remembered with the cell it was inserted in, so it can be removed even after its coordinates
+    have changed.
+
+    Attributes:
+        cells (dictionary): Bucket of components for each occupied cell. The buckets are dictionaries keyed on the
+        identity of the components, which keeps the insertion order and allows removal in constant time.
+        keys (dictionary): Cell of each component keyed on the identity of the component.
+    """
+
+    def __init__(self):
+        self.cells = {}
+        self.keys = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def key(component):
+        return round(component.x), round(component.y)
+
+    def insert(self, component):
+        self.discard(component)
+        key = self.key(component)
+        self.keys[id(component)] = key
+        self.cells.setdefault(key, {})[id(component)] = component
+
+    def discard(self, component):
+        key = self.keys.pop(id(component), None)
+        if key is None:
+            return
+
+        bucket = self.cells[key]
+        del bucket[id(component)]
+        if not bucket:
+            del self.cells[key]
+
+    def discard_many(self, components):
+        cells = self.cells
+        pop = self.keys.pop
+        for component in components:
+            key = pop(id(component), None)
+            if key is not None:
+                bucket = cells[key]
+                del bucket[id(component)]
+                if not bucket:
+                    del cells[key]
+
+    def clear(self):
+        self.cells.clear()
+        self.keys.clear()
+
+    def rebuild(self, components):
+        self.clear()
+        for component in components:
+            self.insert(component)
+
+    def at(self, x, y):
+        """Components displayed in the cell
+
+        Args:
+            x (int): Cell on the canvas.
+            y (int): Cell on the canvas.
+
+        Returns:
+            List of components.
+        """
+        return list(self.cells.get((x, y), {}).values())
+
+    def occupied(self, left, top, right, bottom):
+        """Occupied cells within the rectangle, borders included
+
+        Depending on what is smaller either the cells of the rectangle or the occupied cells are visited.
+
+        Returns:
+            List of cells (x, y).
+        """
+        cells = self.cells
+        if (right - left + 1) * (bottom - top + 1) <= len(cells):
+            return [(x, y) for y in range(top, bottom + 1) for x in range(left, right + 1) if (x, y) in cells]
+        return [(x, y) for x, y in cells if left <= x <= right and top <= y <= bottom]
+
+    def query(self, left, top, right, bottom):
+        """Components displayed within the rectangle, borders included
+
+        Returns:
+            List of components.
+        """
+        cells = self.cells
+        found = []
+        for cell in self.occupied(left, top, right, bottom):
+            found.extend(cells[cell].values())
+        return found
+
+    def query_polygon(self, polygon):
+        """Components displayed within the polygon, borders included
+
+        The occupied cells in the rectangle around the polygon are tested against the polygon all together, the
+        components of a cell are taken over without testing them one by one.
+
+        Args:
+            polygon (List[tuple]): Corners (x, y) of the polygon, the last corner is connected to the first one.
+
+        Returns:
+            List of components.
+        """
+        occupied = self.occupied(*polygon_bounds(polygon))
+        if not occupied:
+            return []
+
+        cells = self.cells
+        found = []
+        inside = within_polygon([x for x, y in occupied], [y for x, y in occupied], polygon)
+        for cell in compress(occupied, inside.tolist()):
+            found.extend(cells[cell].values())
+        return found
+
+
+def polygon_bounds(polygon):
+    """Smallest rectangle of cells (left, top, right, bottom) containing the polygon"""
+    xs = [x for x, y in polygon]
+    ys = [y for x, y in polygon]
+    return floor(min(xs)), floor(min(ys)), ceil(max(xs)), ceil(max(ys))
+
+
+def within_polygon(xs, ys, polygon):
+    """Which points are within the polygon or on its border
+
+    The points are tested all together, edge by edge, with the even-odd rule: a point is within the polygon, if a ray
+    from the point to the right crosses the edges an odd number of times.
+
+    Args:
+        xs (Sequence/np.ndarray): x-coordinates of the points.
+        ys (Sequence/np.ndarray): y-coordinates of the points.
+        polygon (List[tuple]): Corners (x, y) of the polygon, the last corner is connected to the first one.
+
+    Returns:
+        Boolean np.ndarray with one value per point.
+    """
+    import numpy as np
+
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    inside = np.zeros(xs.shape, dtype=bool)
+    border = np.zeros(xs.shape, dtype=bool)
+    for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+        crossing = (y1 > ys) != (y2 > ys)
+        if y1 != y2:
+            inside ^= crossing & (xs < x1 + (ys - y1) * (x2 - x1) / (y2 - y1))
+        border |= (((x2 - x1) * (ys - y1) == (y2 - y1) * (xs - x1))
+                   & (xs >= min(x1, x2)) & (xs <= max(x1, x2)) & (ys >= min(y1, y2)) & (ys <= max(y1, y2)))
+    return inside | border
@@ -0,0 +1,551 @@
+"""Columnar storage for large amounts of elements
+
+Instead of one Python object per element the store keeps the characteristics of all elements in contiguous
+columns - the coordinates as float64 arrays and the strings as integer codes into a shared table. Transformations,
+hit-tests and rendering can then work on whole columns at once. Hit-tests use an index of the rows sorted by their
+cells, as soon as the coordinates stay the same for a few lookups.
+
+The rest of the application keeps working with Element-objects. The store hands out lightweight views, which read
+and write a single row of the columns.
+"""
+
+import weakref
+from math import ceil, floor
+
+import numpy as np
+
+from backend.core import ElementAbc, Style, coefficients_of
+from backend.spatial import polygon_bounds, within_polygon
+from backend.transformer import TransformerAbc
+
+# lookups scanning the columns before the index of the cells is built, sorting the rows costs about as much
+INDEX_AFTER_LOOKUPS = 16
+# cells are keyed with 32 bits for each coordinate
+CELL_LIMIT = 2 ** 31
+
+
+class StringTable:
+    """Interns strings and represents them with integer codes
+
+    The empty string always has the code 0, so freshly allocated columns are filled with it.
+
+    Attributes:
+        values (List[str]): The string for each code.
+        codes (dictionary): The code for each string.
+    """
+
+    def __init__(self):
+        self.values = [""]
+        self.codes = {"": 0}
+
+    def code(self, value):
+        if value not in self.codes:
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+    def value(self, code):
+        return self.values[code]
+
+
+class ElementStore:
+    """Structure-of-arrays storage for elements
+
+    Every element occupies one row in all columns. Removing an element from the store only marks its row as not
+    alive, so views handed out earlier stay valid and the element can be added back later. Rows which are not alive
+    and not referenced by any view are dropped by compact().
+
+    Attributes:
+        size (int): Number of occupied rows.
+        xs (np.ndarray): x-coordinates of the occupied rows.
+        ys (np.ndarray): y-coordinates of the occupied rows.
+        alive (np.ndarray): Marks the rows which belong to the store.
+        names (np.ndarray): Codes of the names in the string table.
+        symbols (np.ndarray): Codes of the symbols in the string table.
+        symbol_colors (np.ndarray): Codes of the symbol colors in the string table.
+        background_colors (np.ndarray): Codes of the background colors in the string table.
+        strings (StringTable): Shared table for all string columns.
+        transformer (TransformerAbc): Transformer of the views handed out by the store.
+        pool (ShardPool/None): Keeps the columns in shared memory and transforms large stores in parallel.
+        cells (tuple/None): Sorted cell keys of the rows and the rows in the same order, None while not built since
+            the coordinates changed.
+        lookups (int): Lookups since the coordinates changed.
+    """
+
+    columns = ("_xs", "_ys", "_alive", "_names", "_symbols", "_symbol_colors", "_background_colors")
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.released = 0
+        self.strings = StringTable()
+        self.transformer = TransformerAbc
+        self.pool = None
+        self.cells = None
+        self.lookups = 0
+        self._views = weakref.WeakValueDictionary()
+
+        self._xs = np.zeros(capacity, dtype=np.float64)
+        self._ys = np.zeros(capacity, dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._names = np.zeros(capacity, dtype=np.int32)
+        self._symbols = np.zeros(capacity, dtype=np.int32)
+        self._symbol_colors = np.zeros(capacity, dtype=np.int32)
+        self._background_colors = np.zeros(capacity, dtype=np.int32)
+
+    @classmethod
+    def from_columns(cls, strings, xs, ys, names, symbols, symbol_colors, background_colors):
+        """Creates a store on top of existing columns without copying them
+
+        The columns can be memory-mapped, then only the touched parts are read. They are copied when the store has
+        to grow.
+
+        Args:
+            strings (StringTable): Table for the codes in the string columns.
+            xs (np.ndarray): float64 x-coordinates.
+            ys (np.ndarray): float64 y-coordinates.
+            names (np.ndarray): int32 codes of the names.
+            symbols (np.ndarray): int32 codes of the symbols.
+            symbol_colors (np.ndarray): int32 codes of the symbol colors.
+            background_colors (np.ndarray): int32 codes of the background colors.
+
+        Returns:
+            ElementStore with all rows alive.
+        """
+        store = cls(capacity=0)
+        store.strings = strings
+        store._xs = xs
+        store._ys = ys
+        store._alive = np.ones(len(xs), dtype=bool)
+        store._names = names
+        store._symbols = symbols
+        store._symbol_colors = symbol_colors
+        store._background_colors = background_colors
+        store.size = len(xs)
+        return store
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    @property
+    def xs(self):
+        return self._xs[:self.size]
+
+    @property
+    def ys(self):
+        return self._ys[:self.size]
+
+    @property
+    def alive(self):
+        return self._alive[:self.size]
+
+    @property
+    def names(self):
+        return self._names[:self.size]
+
+    @property
+    def symbols(self):
+        return self._symbols[:self.size]
+
+    @property
+    def symbol_colors(self):
+        return self._symbol_colors[:self.size]
+
+    @property
+    def background_colors(self):
+        return self._background_colors[:self.size]
+
+    def reserve(self, rows):
+        """Makes sure that the columns have space for additional rows
+
+        Args:
+            rows (int): Number of rows which will be appended.
+
+        Returns:
+            None
+        """
+        capacity = len(self._xs)
+        if self.size + rows <= capacity:
+            return
+
+        capacity = max(capacity, 1)
+        while capacity < self.size + rows:
+            capacity *= 2
+        for column in self.columns:
+            old = getattr(self, column)
+            new = self.allocate(capacity, old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, column, new)
+            if self.pool is not None:
+                self.pool.release(old)
+
+    def allocate(self, length, dtype):
+        if self.pool is None:
+            return np.zeros(length, dtype=dtype)
+        return self.pool.array(length, dtype)
+
+    def share(self, pool):
+        """Moves the columns into the shared memory of a pool, which transforms and fills large stores in parallel
+
+        Args:
+            pool (ShardPool): Pool for the columns.
+
+        Returns:
+            The store itself.
+        """
+        self.pool = pool
+        for column in self.columns:
+            old = getattr(self, column)
+            if not pool.shared(old):
+                new = pool.array(len(old), old.dtype)
+                new[:] = old
+                setattr(self, column, new)
+        return self
+
+    def append(self, x, y, name="", symbol="", symbol_color="", background_color=""):
+        """Adds a single element to the store
+
+        Returns:
+            Row of the new element.
+        """
+        self.reserve(1)
+        row = self.size
+        self._xs[row] = x
+        self._ys[row] = y
+        self._alive[row] = True
+        self._names[row] = self.strings.code(name)
+        self._symbols[row] = self.strings.code(symbol)
+        self._symbol_colors[row] = self.strings.code(symbol_color)
+        self._background_colors[row] = self.strings.code(background_color)
+        self.size += 1
+        self.moved()
+        return row
+
+    def extend(self, xs, ys, name="", symbol="", symbol_color="", background_color=""):
+        """Adds many elements to the store
+
+        Every characteristic is either a single string for all new elements or a sequence with one string per
+        element.
+
+        Args:
+            xs (Sequence/np.ndarray): x-coordinates of the new elements.
+            ys (Sequence/np.ndarray): y-coordinates of the new elements.
+
+        Returns:
+            Range with the rows of the new elements.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        self.reserve(xs.size)
+
+        rows = slice(self.size, self.size + xs.size)
+        self._xs[rows] = xs
+        self._ys[rows] = ys
+        self._alive[rows] = True
+        self._names[rows] = self.codes(name)
+        self._symbols[rows] = self.codes(symbol)
+        self._symbol_colors[rows] = self.codes(symbol_color)
+        self._background_colors[rows] = self.codes(background_color)
+        self.size += xs.size
+        self.moved()
+        return range(rows.start, rows.stop)
+
+    def codes(self, values):
+        """Code of a single string or array with the codes of a sequence of strings"""
+        if isinstance(values, str):
+            return self.strings.code(values)
+        return np.fromiter((self.strings.code(value) for value in values), dtype=np.int32, count=len(values))
+
+    def add(self, element):
+        """Adds an element to the store
+
+        A view of this store is brought back to life in its own row, any other element is copied into a new row.
+
+        Args:
+            element (Element): The element to add.
+
+        Returns:
+            View of the element in the store.
+        """
+        if isinstance(element, ElementView) and element.store is self:
+            if not self._alive[element.row]:
+                self._alive[element.row] = True
+                self.released -= 1
+            return element
+
+        row = self.append(element.x, element.y, element.name, element.symbol,
+                          element.symbol_color, element.background_color)
+        view = self.view(row)
+        view.set_transformer(element.transformer)
+        return view
+
+    def release(self, row):
+        """Removes the row from the store, while keeping its values for existing views
+
+        Args:
+            row (int): The row to remove.
+
+        Returns:
+            None
+        """
+        if self._alive[row]:
+            self._alive[row] = False
+            self.released += 1
+
+        if self.released > max(1024, self.size // 2):
+            self.compact()
+
+    def clear(self):
+        self._alive[:self.size] = False
+        self.released = self.size
+        self.compact()
+
+    def rows(self):
+        return np.flatnonzero(self.alive)
+
+    def view(self, row):
+        view = self._views.get(row)
+        if view is None:
+            view = ElementView(self, row, self.transformer)
+            self._views[row] = view
+        return view
+
+    def views(self, rows):
+        return [self.view(row) for row in rows.tolist()]
+
+    def compact(self):
+        """Drops the rows which are not alive and not referenced by a view
+
+        The remaining rows keep their order, the views are updated with their new rows.
+
+        Returns:
+            None
+        """
+        keep = self.alive.copy()
+        referenced = list(self._views.keys())
+        keep[referenced] = True
+
+        new_rows = np.cumsum(keep) - 1
+        kept = int(np.count_nonzero(keep))
+        for column in self.columns:
+            values = getattr(self, column)
+            values[:kept] = values[:self.size][keep]
+
+        views = list(self._views.items())
+        self._views = weakref.WeakValueDictionary()
+        for row, view in views:
+            view.row = int(new_rows[row])
+            self._views[view.row] = view
+
+        self.size = kept
+        self.released = kept - int(np.count_nonzero(self.alive))
+        self.moved()
+
+    def apply(self, transformer, matrix):
+        """Transforms the coordinates of all alive rows with one matrix multiplication
+
+        Args:
+            transformer (CartesianTransformer): Transformer with the rules for the transformation.
+            matrix (np.ndarray): 3x3 transformation matrix with included reference point.
+
+        Returns:
+            None
+        """
+        self.moved()
+        if self.pool is not None and self.pool.parallel(self.size):
+            self.pool.transform(self._xs, self._ys, self._alive, self.size, coefficients_of(matrix))
+            return
+
+        rows = self.rows()
+        self.xs[rows], self.ys[rows] = transformer.apply_many(self.xs[rows], self.ys[rows], matrix)
+
+    def bounds(self):
+        """Bounding box (left, top, right, bottom) of the alive rows, None without alive rows"""
+        alive = self.alive
+        if not alive.any():
+            return None
+        xs = self.xs[alive]
+        ys = self.ys[alive]
+        return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+
+    def fill(self, setter, value):
+        column = {"name": self._names,
+                  "symbol": self._symbols,
+                  "symbol color": self._symbol_colors,
+                  "background": self._background_colors}.get(setter)
+        if column is None:
+            return
+
+        if self.pool is not None and self.pool.parallel(self.size):
+            self.pool.fill(column, self._alive, self.size, self.strings.code(value))
+        else:
+            column[:self.size][self.alive] = self.strings.code(value)
+
+    def moved(self):
+        """Drops the index of the cells after the coordinates of any row changed"""
+        self.cells = None
+        self.lookups = 0
+
+    def cell_index(self):
+        """Index of the cells, once the coordinates stayed the same for INDEX_AFTER_LOOKUPS lookups
+
+        Until then a lookup scans the columns, which is cheaper than sorting them, if the coordinates change again
+        soon.
+
+        Returns:
+            Tuple (keys, rows) with the sorted cell keys of all rows and the rows in the same order, None without index.
+        """
+        if self.cells is None:
+            self.lookups += 1
+            if self.lookups < INDEX_AFTER_LOOKUPS:
+                return None
+            keys = cell_keys(self.xs, self.ys)
+            rows = np.argsort(keys)
+            self.cells = keys[rows], rows
+        return self.cells
+
+    def rows_at(self, x, y):
+        """Alive rows which are displayed at the given position
+
+        Args:
+            x (int): Position on the canvas.
+            y (int): Position on the canvas.
+
+        Returns:
+            Array with rows.
+        """
+        cells = self.cell_index()
+        if cells is None:
+            return np.flatnonzero(self.alive & (np.rint(self.xs) == x) & (np.rint(self.ys) == y))
+
+        keys, rows = cells
+        key = cell_keys(x, y)
+        rows = np.sort(rows[np.searchsorted(keys, key):np.searchsorted(keys, key, side="right")])
+        # coordinates beyond CELL_LIMIT share their keys
+        return rows[self._alive[rows] & (np.rint(self._xs[rows]) == x) & (np.rint(self._ys[rows]) == y)]
+
+    def rows_in(self, left, top, right, bottom):
+        """Alive rows which are displayed within the rectangle, borders included
+
+        With the index of the cells every line of the rectangle is a range of the sorted keys.
+
+        Returns:
+            Array with rows.
+        """
+        cells = self.cell_index()
+        if cells is None or not bottom - top < len(cells[0]):
+            xs = np.rint(self.xs)
+            ys = np.rint(self.ys)
+            return np.flatnonzero(self.alive & (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom))
+
+        keys, rows = cells
+        lines = np.arange(ceil(top), floor(bottom) + 1)
+        starts = np.searchsorted(keys, cell_keys(ceil(left), lines)).tolist()
+        stops = np.searchsorted(keys, cell_keys(floor(right), lines), side="right").tolist()
+        rows = np.unique(np.concatenate([rows[:0]] + [rows[start:stop] for start, stop in zip(starts, stops)]))
+        return rows[self._alive[rows]]
+
+    def rows_within(self, polygon):
+        """Alive rows which are displayed within the polygon, borders included
+
+        Args:
+            polygon (List[tuple]): Corners (x, y) of the polygon.
+
+        Returns:
+            Array with rows.
+        """
+        rows = self.rows_in(*polygon_bounds(polygon))
+        return rows[within_polygon(np.rint(self.xs[rows]), np.rint(self.ys[rows]), polygon)]
+
+
+def cell_keys(xs, ys):
+    """Keys of the cells displaying the coordinates, ordered by y and then by x
+
+    Args:
+        xs (float/np.ndarray): x-coordinates.
+        ys (float/np.ndarray): y-coordinates.
+
+    Returns:
+        Key or array with keys as 64 bit integers.
+    """
+    xs = np.clip(np.rint(xs), -CELL_LIMIT, CELL_LIMIT - 1).astype(np.int64)
+    ys = np.clip(np.rint(ys), -CELL_LIMIT, CELL_LIMIT - 1).astype(np.int64)
+    return (ys << 32) + (xs + CELL_LIMIT)
+
+
+class ElementView(ElementAbc):
+    """Element which reads and writes its characteristics from a row of an ElementStore
+
+    The style is made from the symbol and color columns when it is read, setting it writes the columns.
+
+    Attributes:
+        store (ElementStore): The store containing the values.
+        row (int): The row of the element in the store.
+        transformer (TransformerAbc): Defines the rules for coordinate transformation.
+    """
+
+    __slots__ = ("store", "row", "transformer", "__weakref__")
+
+    def __init__(self, store, row, transformer=TransformerAbc):
+        self.store = store
+        self.row = row
+        self.transformer = transformer
+
+    @property
+    def x(self):
+        return float(self.store._xs[self.row])
+
+    @x.setter
+    def x(self, value):
+        self.store._xs[self.row] = value
+        self.store.moved()
+
+    @property
+    def y(self):
+        return float(self.store._ys[self.row])
+
+    @y.setter
+    def y(self, value):
+        self.store._ys[self.row] = value
+        self.store.moved()
+
+    @property
+    def name(self):
+        return self.store.strings.value(self.store._names[self.row])
+
+    @name.setter
+    def name(self, value):
+        self.store._names[self.row] = self.store.strings.code(value)
+
+    @property
+    def symbol(self):
+        return self.store.strings.value(self.store._symbols[self.row])
+
+    @symbol.setter
+    def symbol(self, value):
+        self.store._symbols[self.row] = self.store.strings.code(value)
+
+    @property
+    def symbol_color(self):
+        return self.store.strings.value(self.store._symbol_colors[self.row])
+
+    @symbol_color.setter
+    def symbol_color(self, value):
+        self.store._symbol_colors[self.row] = self.store.strings.code(value)
+
+    @property
+    def background_color(self):
+        return self.store.strings.value(self.store._background_colors[self.row])
+
+    @background_color.setter
+    def background_color(self, value):
+        self.store._background_colors[self.row] = self.store.strings.code(value)
+
+    @property
+    def style(self):
+        return Style.get(self.symbol, self.symbol_color, self.background_color)
+
+    @style.setter
+    def style(self, style):
+        self.symbol = style.symbol
+        self.symbol_color = style.symbol_color
+        self.background_color = style.background_color
@@ -12,12 +12,40 @@ There are multiple two-dimensional coordinate systems. Among them are:
 At this stage implemented is the transformation with cartesian coordinates for the most basic
 operations move, rotate, mirror and scale.
 
+NumPy is imported on the first transformation of many points or matrices, single points don't need it. This keeps
+it out of the startup of the application.
+
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from math import radians, cos, sin
+
+
+def constant_matrix(matrix):
+    """Read-only matrix, which can be shared without copying"""
+    import numpy as np
+
+    matrix = np.array(matrix, dtype=float)
+    matrix.setflags(write=False)
+    return matrix
 
-from math import radians
-import numpy as np
+
+# prebuilt matrices as nested tuples, they are converted to NumPy when needed
+IDENTITY_MATRIX = ((1, 0, 0),
+                   (0, 1, 0),
+                   (0, 0, 1))
+
+MIRROR_MATRICES = {"xy": ((-1, 0, 0),
+                          (0, -1, 0),
+                          (0, 0, 1)),
+                   "x": ((1,  0, 0),
+                         (0, -1, 0),
+                         (0, 0, 1)),
+                   "y": ((-1, 0, 0),
+                         (0,  1, 0),
+                         (0, 0, 1))}
 
 
 class TransformerAbc(ABC):
@@ -46,15 +74,29 @@ class CartesianTransformer(TransformerAbc):
     are all represented by a 3x3 matrix multiplied by vector containing the point coordinates. It is
     also possible to execute transformations with user defined matrix.
 
+    The matrices of move, rotate, mirror and scale are cached together with the reference point, so repeated
+    transformations of many points with the same parameters build their matrix only once. Single points are
+    transformed in closed form with plain float arithmetic and don't use the cache, because creating NumPy arrays
+    costs more than the calculation itself.
+
     Attributes:
         reference_x (int/float): Allows transformation based on this point instead on coordinate system origin.
         reference_y (int/float): Allows transformation based on this point instead on coordinate system origin.
+        cache_size (int): Maximum number of cached matrices, the least recently used are dropped first.
+        cache (OrderedDict): Matrices with included reference point keyed on operation, parameters and reference.
+        cache_hits (int): Number of matrices taken from the cache.
+        cache_misses (int): Number of matrices built because they were not in the cache.
     """
 
-    def __init__(self):
+    def __init__(self, cache_size=128):
         self.reference_x = 0
         self.reference_y = 0
 
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def set_reference(self, x, y):
         self.reference_x = x
         self.reference_y = y
@@ -65,26 +107,184 @@ class CartesianTransformer(TransformerAbc):
 
         Note:
             The calculator adjusts the original coordinates for transformation using the reference coordinates.
+            A single point is calculated with plain float arithmetic, for many points use transform_many().
 
         Args:
             x (int/float): Original location of the point that will be transformed.
             y (int/float): Original location of the point that will be transformed.
-            matrix (List): 3x3 transformation matrix.
+            matrix (List/np.ndarray): 3x3 transformation matrix.
 
         Returns:
             Tuple with two entries representing x and y coordinates of the new position.
 
         """
-        transformation_matrix = np.array(matrix)
-        old_coordinates = np.array([x, y, 1])
-        reference_coordinates = np.array([self.reference_x, self.reference_y, 0])
-        old_coordinates_adjusted = old_coordinates - reference_coordinates
+        if hasattr(matrix, "tolist"):
+            matrix = matrix.tolist()
+        (a, b, c), (d, e, f) = matrix[0], matrix[1]
+
+        x_adjusted = x - self.reference_x
+        y_adjusted = y - self.reference_y
+
+        return (a * x_adjusted + b * y_adjusted + c + self.reference_x,
+                d * x_adjusted + e * y_adjusted + f + self.reference_y)
+
+    @staticmethod
+    def apply(x, y, coefficients):
+        """ Calculator for transformation of a single point without reference point
+
+        Args:
+            x (int/float): Original location of the point that will be transformed.
+            y (int/float): Original location of the point that will be transformed.
+            coefficients (tuple): The first two rows of a 3x3 transformation matrix, usually created by
+            cached_coefficients().
+
+        Returns:
+            Tuple with two entries representing x and y coordinates of the new position.
+        """
+        a, b, c, d, e, f = coefficients
+        return a * x + b * y + c, d * x + e * y + f
+
+    def cached_entry(self, operation, parameters):
+        """Matrix and coefficients of a basic operation from the cache, both are built on a cache miss"""
+        key = (operation, parameters, self.reference_x, self.reference_y)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+            return entry
+
+        self.cache_misses += 1
+        matrix = getattr(self, operation + "_matrix")(*parameters)
+        if self.reference_x or self.reference_y:
+            matrix = self.reference_matrix(matrix)
+        matrix = constant_matrix(matrix)
+        entry = matrix, tuple(matrix[:2].ravel().tolist())
+
+        self.cache[key] = entry
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return entry
+
+    def cached_matrix(self, operation, *parameters):
+        """ Matrix of a basic operation with included reference point
+
+        Args:
+            operation (str): One of "move", "rotate", "mirror" and "scale".
+            *parameters: Parameters of the operation, e.g. the angle for "rotate".
+
+        Returns:
+            Read-only 3x3 np.ndarray.
+        """
+        return self.cached_entry(operation, parameters)[0]
+
+    def cached_coefficients(self, operation, *parameters):
+        """ Same as cached_matrix(), but as a tuple of floats for apply()"""
+        return self.cached_entry(operation, parameters)[1]
+
+    def clear_cache(self):
+        self.cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def transform_many(self, xs, ys, matrix):
+        """ Calculator for transformation of many points at once
+
+        Note:
+            All points are stacked into a single 3xN array of homogeneous coordinates, so the whole batch costs
+            one matrix multiplication instead of one per point.
+
+        Args:
+            xs (Sequence/np.ndarray): Original x-coordinates of the points that will be transformed.
+            ys (Sequence/np.ndarray): Original y-coordinates of the points that will be transformed.
+            matrix (List/np.ndarray): 3x3 transformation matrix.
+
+        Returns:
+            Tuple with two arrays representing x and y coordinates of the new positions.
+        """
+        import numpy as np
 
-        transformation_result = (transformation_matrix @ old_coordinates_adjusted) + reference_coordinates
-        new_x, new_y, rest = transformation_result
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+
+        old_coordinates_adjusted = np.ones((3, xs.size))
+        old_coordinates_adjusted[0] = xs - self.reference_x
+        old_coordinates_adjusted[1] = ys - self.reference_y
+
+        new_x, new_y, rest = np.asarray(matrix, dtype=float) @ old_coordinates_adjusted
+
+        return new_x + self.reference_x, new_y + self.reference_y
+
+    def reference_matrix(self, matrix):
+        """ Includes the reference point in a transformation matrix
+
+        The result moves the reference point to the origin, applies the transformation and moves back. This way the
+        matrix keeps its meaning after the reference point has changed and can be combined with other matrices.
+
+        Args:
+            matrix (List/np.ndarray): 3x3 transformation matrix.
+
+        Returns:
+            3x3 np.ndarray.
+        """
+        import numpy as np
+
+        to_origin = np.array(self.move_matrix(-self.reference_x, -self.reference_y), dtype=float)
+        from_origin = np.array(self.move_matrix(self.reference_x, self.reference_y), dtype=float)
+        return from_origin @ np.asarray(matrix, dtype=float) @ to_origin
+
+    @staticmethod
+    def apply_many(xs, ys, matrix):
+        """ Calculator for transformation of many points without reference point
+
+        Args:
+            xs (Sequence/np.ndarray): Original x-coordinates of the points that will be transformed.
+            ys (Sequence/np.ndarray): Original y-coordinates of the points that will be transformed.
+            matrix (List/np.ndarray): 3x3 transformation matrix, usually created by reference_matrix().
+
+        Returns:
+            Tuple with two arrays representing x and y coordinates of the new positions.
+        """
+        import numpy as np
+
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+
+        old_coordinates = np.ones((3, xs.size))
+        old_coordinates[0] = xs
+        old_coordinates[1] = ys
+
+        new_x, new_y, rest = np.asarray(matrix, dtype=float) @ old_coordinates
 
         return new_x, new_y
 
+    @staticmethod
+    def move_matrix(delta_x, delta_y):
+        return [[1, 0, delta_x],
+                [0, 1, delta_y],
+                [0, 0, 1]]
+
+    @staticmethod
+    def rotate_matrix(theta):
+        c = cos(radians(theta))
+        s = sin(radians(theta))
+        return [[c, -s, 0],
+                [s,  c, 0],
+                [0, 0, 1]]
+
+    @staticmethod
+    def mirror_matrix(axis):
+        """Matrix for the mirror options "x", "y" and "xy", any other axis results in the identity matrix
+
+        The matrices are prebuilt and immutable.
+        """
+        return MIRROR_MATRICES.get(axis, IDENTITY_MATRIX)
+
+    @staticmethod
+    def scale_matrix(factor_x, factor_y):
+        return [[factor_x, 0, 0],
+                [0, factor_y, 0],
+                [0, 0, 1]]
+
     def move(self, x, y, delta_x, delta_y):
         """Planar translation
 
@@ -98,13 +298,9 @@ class CartesianTransformer(TransformerAbc):
             delta_y (int/float):Value for translation in y direction.
 
         Returns:
-            Call of the transform() function.
+            Tuple with two entries representing x and y coordinates of the new position.
         """
-        translation_matrix = [[1, 0, delta_x],
-                              [0, 1, delta_y],
-                              [0, 0, 1]]
-
-        return self.transform(x, y, translation_matrix)
+        return x + delta_x, y + delta_y
 
     def rotate(self, x, y, theta):
         """Planar rotation
@@ -114,15 +310,15 @@ class CartesianTransformer(TransformerAbc):
             y (int/float): Original location of the point that will be transformed.
             theta (int/float): Value for rotation in degrees. Positive values cause counterclockwise rotation
         Returns:
-            Call of the transform() function.
+            Tuple with two entries representing x and y coordinates of the new position.
         """
-        c = np.cos(radians(theta))
-        s = np.sin(radians(theta))
-        rotation_matrix = [[c, -s, 0],
-                           [s,  c, 0],
-                           [0, 0, 1]]
+        c = cos(radians(theta))
+        s = sin(radians(theta))
+        x_adjusted = x - self.reference_x
+        y_adjusted = y - self.reference_y
 
-        return self.transform(x, y, rotation_matrix)
+        return (self.reference_x + c * x_adjusted - s * y_adjusted,
+                self.reference_y + s * x_adjusted + c * y_adjusted)
 
     def mirror(self, x, y, axis):
         """ Mirror coordinates with three options
@@ -135,32 +331,15 @@ class CartesianTransformer(TransformerAbc):
             axis (str): Available options are "x", "y", "xy", which will activate the corresponding transformation.
 
         Returns:
-            Call of the transform() function.
+            Tuple with two entries representing x and y coordinates of the new position.
 
         """
-        mirror_matrix_center = [[-1, 0, 0],
-                                [0, -1, 0],
-                                [0, 0, 1]]
-
-        mirror_matrix_x = [[1,  0, 0],
-                           [0, -1, 0],
-                           [0, 0, 1]]
-
-        mirror_matrix_y = [[-1, 0, 0],
-                           [0,  1, 0],
-                           [0, 0, 1]]
-
-        if axis == "xy":
-            return self.transform(x, y, mirror_matrix_center)
+        if axis in ("xy", "y"):
+            x = 2 * self.reference_x - x
+        if axis in ("xy", "x"):
+            y = 2 * self.reference_y - y
 
-        elif axis == "x":
-            return self.transform(x, y, mirror_matrix_x)
-
-        elif axis == "y":
-            return self.transform(x, y, mirror_matrix_y)
-
-        else:
-            return x, y
+        return x, y
 
     def scale(self, x, y, factor_x, factor_y):
         """Scale position in 2D-plane
@@ -175,10 +354,7 @@ class CartesianTransformer(TransformerAbc):
             factor_x (int/float): Scaling factor in x-direction.
             factor_y (int/float): Scaling factor in y-direction.
          Returns:
-            Call of the transform() function.
+            Tuple with two entries representing x and y coordinates of the new position.
         """
-        scale_matrix = [[factor_x, 0, 0],
-                        [0, factor_y, 0],
-                        [0, 0, 1]]
-
-        return self.transform(x, y, scale_matrix)
+        return (self.reference_x + factor_x * (x - self.reference_x),
+                self.reference_y + factor_y * (y - self.reference_y))
@@ -3,64 +3,267 @@
 This module provides single point of communication with the backend. On the side of the frontend there can be
 multiple references to classes in this module. For example a command can be activated with keyboard
 shortcut or by pressing a button wit the mouse -  they both will address the same class here.
+
+Every command remembers what it needs to revert itself, so executed commands can be undone and redone by a
+CommandJournal without snapshots of the whole canvas. NumPy is imported by the first transformation, not on startup.
 """
 
 
 from abc import ABC, abstractmethod
 
+from backend.core import Group, coefficients_of
+
 
 class Command(ABC):
 
+    # components changed by the command outside of the canvas, which the canvas must be informed about
+    targets = ()
+
     @abstractmethod
     def execute(self):
         pass
 
+    @abstractmethod
+    def undo(self):
+        pass
+
+    def redo(self):
+        self.execute()
+
+    def size(self):
+        """Number of references to elements and groups kept for undo and redo"""
+        return 0
+
+
+class TransformCommand(Command):
+    """Coordinate transformation which is reverted with the inverse matrix
+
+    On execution the transformation matrix including the reference point is calculated and the own members of a
+    group are remembered, a deferred group composes the transformation without applying it. Undo and redo transform
+    the center and the remembered members of a group again, with the inverse matrix for undo, so the group may be
+    emptied in between. Nested groups take the matrix over as their local transformation. Transformations which
+    can't be inverted, e.g. scale with factor 0, remember the previous coordinates of all components instead,
+    instance groups get their own elements for them.
+
+    Attributes:
+        component (Element/Group): Component to transform.
+        members (List): Own elements and nested groups of the group at the time of the execution.
+        components (List): All transformed components including the group itself and the content of nested groups,
+            only listed for a matrix which can't be inverted.
+        targets (List): All transformed components, the canvas is informed about them after undo and redo.
+        matrix (np.ndarray/None): Executed transformation matrix with included reference point.
+        previous (List/None): Coordinates before the transformation if the matrix can't be inverted.
+    """
+
+    def __init__(self, component):
+        self.component = component
+        self.members = []
+        self.components = []
+        self.matrix = None
+        self.previous = None
+
+    @abstractmethod
+    def transformation(self):
+        """3x3 transformation matrix of the command"""
+        pass
+
+    @abstractmethod
+    def transform(self):
+        pass
+
+    @property
+    def targets(self):
+        # the components are only listed on execution for a singular matrix, a group which composes the
+        # transformation isn't visited
+        if self.components:
+            return self.components
+        targets = [self.component]
+        for member in self.members:
+            targets.extend(member.components() if isinstance(member, Group) else (member,))
+        return targets
+
+    def execute(self):
+        self.matrix = self.component.transformer.reference_matrix(self.transformation())
+        a, b, c, d, e, f = coefficients_of(self.matrix)
+        singular = a * e - b * d == 0
+
+        if isinstance(self.component, Group):
+            if not getattr(self.component, "instanced", False):
+                # the members are taken without applying the pending matrix of a deferred group
+                self.members = list(self.component._elements)
+            if singular:
+                # the placement of an instance can't be restored from coordinates
+                for component in self.component.components():
+                    if getattr(component, "instanced", False):
+                        component.materialize()
+                self.component.resolve()
+                self.components = self.component.components()
+        elif singular:
+            self.components = [self.component]
+
+        if singular:
+            self.previous = [(component.x, component.y) for component in self.components]
+
+        self.transform()
+
+    def apply(self, matrix):
+        if getattr(self.component, "instanced", False):
+            self.component.compose(matrix)
+            return
+
+        if isinstance(self.component, Group):
+            self.component.flush()
+            self.component.invalidate_bounds()
+
+        points = [self.component] + [member for member in self.members if not isinstance(member, Group)]
+        new_xs, new_ys = self.component.transformer.apply_many([point.x for point in points],
+                                                               [point.y for point in points],
+                                                               matrix)
+        for point, new_x, new_y in zip(points, new_xs.tolist(), new_ys.tolist()):
+            point.x = new_x
+            point.y = new_y
+
+        for member in self.members:
+            if isinstance(member, Group):
+                member.compose(matrix)
+
+    def undo(self):
+        import numpy as np
+
+        if self.previous is None:
+            self.apply(np.linalg.inv(self.matrix))
+            return
+
+        if isinstance(self.component, Group):
+            self.component.resolve()
+        for component, (x, y) in zip(self.components, self.previous):
+            component.x = x
+            component.y = y
+            if isinstance(component, Group):
+                component.invalidate_bounds()
+
+    def redo(self):
+        self.apply(self.matrix)
+
+    def size(self):
+        return 1 + len(self.members) + len(self.components) + len(self.previous or ())
+
 
-class MoveCommand(Command):
+class MoveCommand(TransformCommand):
 
     # FIXME: Document the parameters
 
     def __init__(self, component, delta_x, delta_y):
-        self.component = component
+        super().__init__(component)
         self.delta_x = delta_x
         self.delta_y = delta_y
 
-    def execute(self):
+    def transformation(self):
+        return self.component.transformer.move_matrix(self.delta_x, self.delta_y)
+
+    def transform(self):
         self.component.move(self.delta_x, self.delta_y)
 
 
-class RotateCommand(Command):
+class RotateCommand(TransformCommand):
 
     # FIXME: Document the parameters
 
     def __init__(self, component, theta):
-        self.component = component
+        super().__init__(component)
         self.theta = theta
 
-    def execute(self):
+    def transformation(self):
+        return self.component.transformer.rotate_matrix(self.theta)
+
+    def transform(self):
         self.component.rotate(self.theta)
 
 
-class MirrorCommand(Command):
+class MirrorCommand(TransformCommand):
 
     # FIXME: Document the parameters
 
     def __init__(self, component, axis):
-        self.component = component
+        super().__init__(component)
         self.axis = axis
 
-    def execute(self):
+    def transformation(self):
+        return self.component.transformer.mirror_matrix(self.axis)
+
+    def transform(self):
         self.component.mirror(self.axis)
 
 
-class ScaleCommand(Command):
+class ScaleCommand(TransformCommand):
 
     # FIXME: Document the parameters
 
     def __init__(self, component, factor_x, factor_y):
-        self.component = component
+        super().__init__(component)
         self.factor_x = factor_x
         self.factor_y = factor_y
 
-    def execute(self):
+    def transformation(self):
+        return self.component.transformer.scale_matrix(self.factor_x, self.factor_y)
+
+    def transform(self):
         self.component.scale(self.factor_x, self.factor_y)
+
+
+class AddCommand(Command):
+    """Places elements or groups on the canvas
+
+    Attributes:
+        canvas (Canvas): The canvas to add to.
+        components (List): Elements and groups to add.
+    """
+
+    def __init__(self, canvas, components):
+        self.canvas = canvas
+        self.components = list(components)
+
+    def execute(self):
+        self.components = self.canvas.add_many(self.components)
+
+    def undo(self):
+        self.canvas.remove_many(self.components)
+
+    def size(self):
+        return len(self.components)
+
+
+class DeleteCommand(Command):
+    """Removes elements or groups from the canvas
+
+    Attributes:
+        canvas (Canvas): The canvas to remove from.
+        components (List): Removed elements and groups.
+    """
+
+    def __init__(self, canvas, components):
+        self.canvas = canvas
+        self.components = list(components)
+
+    def execute(self):
+        self.canvas.remove_many(self.components)
+
+    def undo(self):
+        self.canvas.add_many(self.components)
+
+    def size(self):
+        return len(self.components)
+
+
+class ClearCommand(DeleteCommand):
+    """Removes all elements and groups from the canvas
+
+    The removed elements and groups are determined on execution.
+    """
+
+    def __init__(self, canvas):
+        super().__init__(canvas, [])
+
+    def execute(self):
+        self.components = list(self.canvas.elements)
+        self.canvas.clear()
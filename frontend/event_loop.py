@@ -0,0 +1,106 @@
+"""Execution of commands beside the user interface
+
+curses is not thread-safe, so the windows are only used by the main thread. A command runs in a worker thread while
+the main thread keeps the terminal alive: at a capped frame rate it shows the progress in the prompt window and
+reads the keys typed in the meantime. When the command is finished, the keys are handed back to curses in the same
+order, so they are read by the next getstr() or getch() like keys typed after the command.
+
+    runner = CommandRunner(prompt_in, input_in, frame_rate=20)
+    runner.run(journal.execute, command)
+
+A command finished within the first frame doesn't show any progress and doesn't read the input, short commands
+behave like they are called directly.
+"""
+
+import curses
+import threading
+from collections import deque
+from timeit import default_timer
+
+SPINNER = "|/-\\"
+
+
+class CommandRunner:
+    """Runs functions in a worker thread and keeps the terminal responsive until they return
+
+    The canvas is not drawn while a command changes it, it is drawn as soon as the command returns. The content of
+    the canvas window stays on the terminal in the meantime.
+
+    Attributes:
+        prompt_window (curses window): Window for the progress of a running command.
+        input_window (curses window): Window reading the keys typed during a command.
+        frame_rate (int): Maximum number of progress frames per second.
+        keys (deque): Keys typed during the running command.
+        frames (int): Number of progress frames shown for the last command.
+        duration (float): Seconds needed by the last command.
+    """
+
+    def __init__(self, prompt_window, input_window, frame_rate=20):
+        self.prompt_window = prompt_window
+        self.input_window = input_window
+        self.frame_rate = frame_rate
+        self.keys = deque()
+        self.frames = 0
+        self.duration = 0.0
+
+    def run(self, function, *args):
+        """Calls the function in a worker thread and waits for its result
+
+        Args:
+            function (callable): The command, e.g. CommandJournal.execute.
+            *args: Arguments of the function.
+
+        Returns:
+            Return value of the function. An exception of the function is raised again in the calling thread.
+        """
+        outcome = {}
+
+        def work():
+            try:
+                outcome["result"] = function(*args)
+            except BaseException as error:
+                outcome["error"] = error
+
+        start = default_timer()
+        self.frames = 0
+        worker = threading.Thread(target=work, name="command", daemon=True)
+        worker.start()
+
+        frame = 1 / self.frame_rate
+        worker.join(frame)
+        if worker.is_alive():
+            # keys are read one by one and without echo until the command is finished
+            curses.noecho()
+            curses.cbreak()
+            self.input_window.nodelay(True)
+            try:
+                while worker.is_alive():
+                    self.show_progress(default_timer() - start)
+                    self.read_keys()
+                    worker.join(frame)
+            finally:
+                self.input_window.nodelay(False)
+            self.replay_keys()
+
+        self.duration = default_timer() - start
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
+
+    def show_progress(self, elapsed):
+        self.prompt_window.clear()
+        self.prompt_window.addstr(0, 2, f"{SPINNER[self.frames % len(SPINNER)]} Working... {elapsed:.1f}s")
+        self.prompt_window.refresh()
+        self.frames += 1
+
+    def read_keys(self):
+        """Queues all keys typed since the last frame without waiting for further keys"""
+        key = self.input_window.getch()
+        while key != -1:
+            self.keys.append(key)
+            key = self.input_window.getch()
+
+    def replay_keys(self):
+        # ungetch() pushes a key in front of the input, so the newest key is pushed first
+        while self.keys:
+            curses.ungetch(self.keys.pop())
@@ -0,0 +1,182 @@
+"""Incremental drawing of the canvas
+
+Instead of clearing the canvas window and writing every element after each command, the renderer listens to the
+changes of the canvas and remembers which cells are affected. On the next frame only these cells are written.
+"""
+
+import curses
+
+
+class CanvasRenderer:
+
+    """Draws the content of the canvas in a curses window and redraws only the changed cells.
+
+    Only elements and groups with their center within the window are drawn, like before the canvas can handle only
+    integer numbers, so all the positions are rounded.
+
+    Attributes:
+        window (curses window): Canvas inner window(within the frame).
+        canvas (Canvas): Contains the elements and groups displayed on the canvas.
+        cells (dictionary): For every cell the symbols and attributes drawn there by the components, keyed on the
+        identity of the component.
+        drawn (dictionary): Symbol and attribute of every cell currently written in the window.
+        contributions (dictionary): Each drawn component with the cells it writes, keyed on the identity of the
+        component. The component is kept, so its identity isn't reused, e.g. by a new view of an ElementStore.
+        dirty (set): Cells changed since the last frame.
+        full (bool): The next frame has to evaluate the whole visible content.
+        size (tuple): Height and width of the window at the last frame.
+    """
+
+    def __init__(self, window, canvas):
+        self.window = window
+        self.canvas = canvas
+
+        self.cells = {}
+        self.drawn = {}
+        self.contributions = {}
+        self.dirty = set()
+        self.full = True
+        self.size = None
+
+        canvas.add_listener(self)
+
+    def on_add(self, component):
+        if not self.full:
+            self.contribute(component)
+
+    def on_remove(self, component):
+        component, cells = self.contributions.pop(id(component), (component, ()))
+        for cell in cells:
+            contributions = self.cells[cell]
+            del contributions[id(component)]
+            if not contributions:
+                del self.cells[cell]
+            self.dirty.add(cell)
+
+    def on_reset(self):
+        self.full = True
+
+    def visible(self, x, y):
+        height, width = self.size
+        return 0 <= x < width and 0 <= y < height
+
+    def contribute(self, component):
+        """Remembers the cells written by an element or a group
+
+        A group writes its center and all its visible elements, including the centers and elements of nested groups.
+        The center is reversed, if any of the elements is visible. Nested groups are visited with an explicit stack
+        and only if their bounding box overlaps the window.
+
+        Args:
+            component (Element/Group): Component on the canvas.
+
+        Returns:
+            None
+        """
+        center = (round(component.x), round(component.y))
+        if not self.visible(*center):
+            return
+
+        contribution = {center: (component.symbol, curses.A_NORMAL)}
+        height, width = self.size
+        stack = [component] if hasattr(component, "elements") else []
+        while stack:
+            group = stack.pop()
+            if not group.overlaps(0, 0, width - 1, height - 1):
+                continue
+
+            for element in group.elements:
+                cell = (round(element.x), round(element.y))
+                if self.visible(*cell):
+                    contribution[cell] = (element.symbol, curses.A_NORMAL)
+                    contribution[center] = (component.symbol, curses.A_REVERSE)
+                if hasattr(element, "elements"):
+                    stack.append(element)
+
+        self.contributions[id(component)] = (component, list(contribution))
+        for cell, content in contribution.items():
+            self.cells.setdefault(cell, {})[id(component)] = content
+            self.dirty.add(cell)
+
+    def draw(self, x, y, symbol, attribute=curses.A_NORMAL):
+        """Writes outside of the canvas content, e.g. highlights
+
+        The cell is restored with the canvas content on the next frame.
+
+        Args:
+            x (int): Cell in the window.
+            y (int): Cell in the window.
+            symbol (str): Symbol to write.
+            attribute (int): curses attribute for the symbol.
+
+        Returns:
+            None
+        """
+        self.window.addstr(y, x, symbol, attribute)
+        self.drawn[(x, y)] = (symbol, attribute)
+        self.dirty.add((x, y))
+
+    def rebuild(self):
+        """Evaluates the content of the whole window
+
+        Only the elements and groups within the window are requested from the canvas. The previously written cells
+        become dirty, so they are cleared if they are empty now.
+        """
+        height, width = self.size
+        self.cells = {}
+        self.contributions = {}
+        self.dirty.update(self.drawn)
+
+        for component in self.canvas.elements_in(0, 0, width - 1, height - 1):
+            self.contribute(component)
+        self.full = False
+
+    def content(self, cell):
+        """Symbol and attribute of a cell, the component last in the order of the canvas covers the others
+
+        Returns:
+            Tuple (symbol, attribute) or None for an empty cell.
+        """
+        contributions = self.cells.get(cell)
+        if not contributions:
+            return None
+        if len(contributions) == 1:
+            return next(iter(contributions.values()))
+        order = self.canvas.order
+        key = max(contributions, key=lambda key: order(self.contributions[key][0]))
+        return contributions[key]
+
+    def render(self):
+        """Writes the changed cells and refreshes the window
+
+        Returns:
+            Number of written cells.
+        """
+        size = self.window.getmaxyx()
+        if size != self.size:
+            self.size = size
+            self.window.erase()
+            self.drawn = {}
+            self.full = True
+
+        if self.full:
+            self.rebuild()
+
+        written = 0
+        for cell in self.dirty:
+            content = self.content(cell)
+            if content == self.drawn.get(cell):
+                continue
+
+            x, y = cell
+            if content is None:
+                del self.drawn[cell]
+                self.window.addstr(y, x, " ")
+            else:
+                self.drawn[cell] = content
+                self.window.addstr(y, x, *content)
+            written += 1
+
+        self.dirty.clear()
+        self.window.refresh()
+        return written
@@ -0,0 +1,187 @@
+"""Headless execution of command scripts
+
+A script is a text file with one command per line. The lines are read one after another, so scripts of any size
+can be executed without loading them completely. Empty lines and lines starting with '#' are ignored.
+
+    add <x> <y> <symbol>                        Add a single element.
+    insert <shape> [<x> <y>]                    Insert a predefined shape, optionally with its center at x,y.
+    select <x> <y> [<x right> <y bottom>]       Select the elements and groups in a cell or a rectangle.
+    reference <x> <y>                           Set the reference point for rotate, mirror and scale.
+    move <delta x> <delta y>
+    rotate <degrees>
+    mirror <x|y|xy>
+    scale <factor x> <factor y>
+    delete                                      Delete the selected elements and groups.
+    release                                     Return the selected elements and groups to the canvas.
+    clear                                       Clear the canvas.
+
+The selected elements are taken out of the canvas like in the user interface. Consecutive transformations of the
+selection are composed and applied once, when the selection is returned to the canvas.
+
+    python -m frontend.script <path to script>
+"""
+
+import math
+import sys
+from timeit import default_timer
+
+from backend.core import Element, Group, InstanceGroup, Prototype
+from frontend.command import MoveCommand, RotateCommand, MirrorCommand, ScaleCommand
+from frontend.initial_data import canvas, transformer, shapes
+
+
+class ScriptEngine:
+    """Executes commands from scripts directly on a canvas, without curses.
+
+    Attributes:
+        canvas (Canvas): Contains the elements and groups the script works on.
+        transformer (CartesianTransformer): Transformer for new elements and the selection.
+        shapes (dictionary/ShapeRegistry): Predefined shapes available for 'insert' keyed on their names.
+        selection (Group): Selected elements and groups, taken out of the canvas.
+        executed (int): Number of executed commands.
+    """
+
+    def __init__(self, canvas, transformer, shapes=None):
+        self.canvas = canvas
+        self.transformer = transformer
+        self.shapes = shapes or {}
+
+        self.selection = Group(transformer=transformer)
+        self.selection.set_deferred(True)
+        self.executed = 0
+
+    def run(self, lines):
+        """Executes all lines of a script
+
+        Args:
+            lines (Iterable[str]): Lines of the script, e.g. an open file.
+
+        Returns:
+            Number of executed commands.
+        """
+        for number, line in enumerate(lines, start=1):
+            try:
+                self.execute(line)
+            except (ValueError, KeyError, IndexError) as error:
+                raise ValueError(f"line {number}: {line.strip()!r}: {error}") from error
+        self.release()
+        return self.executed
+
+    def run_file(self, path):
+        with open(path, encoding="utf-8") as script:
+            return self.run(script)
+
+    def execute(self, line):
+        """Executes a single line of a script
+
+        Args:
+            line (str): Command followed by its arguments, separated by whitespace.
+
+        Returns:
+            None
+        """
+        words = line.split()
+        if not words or words[0].startswith("#"):
+            return
+
+        command, arguments = words[0], words[1:]
+        if command == "move":
+            MoveCommand(self.selection, *self.numbers(arguments, 2)).execute()
+        elif command == "rotate":
+            RotateCommand(self.selection, *self.numbers(arguments, 1)).execute()
+        elif command == "mirror":
+            MirrorCommand(self.selection, arguments[0]).execute()
+        elif command == "scale":
+            ScaleCommand(self.selection, *self.numbers(arguments, 2)).execute()
+        elif command == "reference":
+            self.transformer.set_reference(*self.numbers(arguments, 2))
+        else:
+            self.release()
+            if command == "add":
+                x, y = self.numbers(arguments[:2], 2)
+                self.canvas.add(Element(x, y).set_transformer(self.transformer).set_symbol(arguments[2]))
+            elif command == "insert":
+                self.insert(arguments[0], *self.numbers(arguments[1:], 0, 2))
+            elif command == "select":
+                self.select(*self.numbers(arguments, 2, 4))
+            elif command == "delete":
+                self.selection.clear()
+            elif command == "clear":
+                self.canvas.clear()
+            elif command != "release":
+                raise ValueError(f"unknown command {command!r}")
+
+        self.executed += 1
+
+    @staticmethod
+    def numbers(arguments, *counts):
+        """Converts the arguments of a command to numbers
+
+        Integer literals become int, all other literals float(), e.g. 1.5 or 1e5.
+
+        Args:
+            arguments (List[str]): Arguments of the command.
+            counts (int): Allowed numbers of arguments.
+
+        Returns:
+            List of int/float.
+        """
+        if len(arguments) not in counts:
+            raise ValueError(f"expected {' or '.join(str(count) for count in counts)} arguments")
+
+        values = []
+        for argument in arguments:
+            try:
+                values.append(int(argument))
+            except ValueError:
+                value = float(argument)
+                if not math.isfinite(value):
+                    raise ValueError(f"not a finite number: {argument!r}")
+                values.append(value)
+        return values
+
+    def insert(self, shape_name, x=None, y=None):
+        """Inserts an instance of a predefined shape, which shares the geometry of the shape
+
+        Args:
+            shape_name (str): Name of the predefined shape.
+            x (int/float/None): New center of the shape.
+            y (int/float/None): New center of the shape.
+
+        Returns:
+            None
+        """
+        shape = self.shapes[shape_name]
+        new_group = InstanceGroup(Prototype.get(shape), self.transformer)
+
+        if x is not None:
+            new_group.move(x - shape.x, y - shape.y)
+        self.canvas.add(new_group)
+
+    def select(self, left, top, right=None, bottom=None):
+        if right is None:
+            selected = self.canvas.elements_at(left, top)
+        else:
+            selected = self.canvas.elements_in(left, top, right, bottom)
+
+        self.canvas.move_to(self.selection, selected)
+
+    def release(self):
+        """Returns the selection to the canvas, which applies the composed transformations"""
+        self.canvas.add_many(self.selection.elements)
+        self.selection.clear()
+
+
+def main(path):
+    engine = ScriptEngine(canvas, transformer, shapes)
+
+    start = default_timer()
+    executed = engine.run_file(path)
+    duration = default_timer() - start
+
+    print(f"{executed} commands in {duration:.3f}s ({executed / max(duration, 1e-9):.0f} commands/s), "
+          f"{len(canvas.elements)} elements and groups on the canvas")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
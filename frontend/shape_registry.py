@@ -0,0 +1,109 @@
+"""Predefined shapes, which are loaded on first use
+
+Every shape is defined in its own JSON file. The name of the file without the extension is the name of the shape:
+
+    {
+      "x": 52,                          center of the group
+      "y": 12,
+      "symbol": "X",                    symbol of the elements without an own symbol
+      "elements": [
+        [50, 10],
+        [51, 10, "#"],                  element with an own symbol
+        ...
+      ]
+    }
+
+Creating a registry only lists the names of the files. A file is read and its group is created when the shape is
+used for the first time, so a library of thousands of shapes doesn't slow down the start of the application.
+"""
+
+import json
+import os
+from collections.abc import MutableMapping
+
+from backend.core import Element, Group
+from backend.transformer import TransformerAbc
+
+SHAPE_EXTENSION = ".json"
+
+
+def load_group(path, transformer=TransformerAbc):
+    """Creates a group from a shape file
+
+    Args:
+        path (str): Path of the JSON file.
+        transformer (TransformerAbc): Transformer of the group and its elements.
+
+    Returns:
+        Group
+    """
+    with open(path, encoding="utf-8") as file:
+        definition = json.load(file)
+
+    group = Group(transformer=transformer)
+    group.x = definition.get("x", 0)
+    group.y = definition.get("y", 0)
+    symbol = definition.get("symbol", "")
+    for x, y, *element_symbol in definition["elements"]:
+        group.add(Element(x, y, transformer).set_symbol(element_symbol[0] if element_symbol else symbol))
+    return group
+
+
+class ShapeRegistry(MutableMapping):
+    """Predefined shapes keyed on their names
+
+    The registry behaves like a dictionary. Shapes from the library directory are loaded when they are accessed the
+    first time, shapes can also be added directly.
+
+    Attributes:
+        transformer (TransformerAbc): Transformer of the loaded shapes.
+        paths (dictionary): Files of the shapes in the library, keyed on the names of the shapes.
+        shapes (dictionary): Loaded or directly added shapes keyed on their names.
+    """
+
+    def __init__(self, directory=None, transformer=TransformerAbc):
+        self.transformer = transformer
+        self.paths = {}
+        self.shapes = {}
+        if directory is not None:
+            self.scan(directory)
+
+    def scan(self, directory):
+        """Adds the shape files of a directory to the library, without reading them"""
+        names = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(SHAPE_EXTENSION) and entry.is_file():
+                    names.append((entry.name[:-len(SHAPE_EXTENSION)], entry.path))
+        for name, path in sorted(names):
+            self.paths.setdefault(name, path)
+
+    def loaded(self, name):
+        return name in self.shapes
+
+    def __getitem__(self, name):
+        shape = self.shapes.get(name)
+        if shape is None:
+            shape = self.shapes[name] = load_group(self.paths[name], self.transformer)
+        return shape
+
+    def __setitem__(self, name, shape):
+        self.shapes[name] = shape
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self.shapes.pop(name, None)
+        self.paths.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self.shapes or name in self.paths
+
+    def __iter__(self):
+        yield from self.paths
+        for name in self.shapes:
+            if name not in self.paths:
+                yield name
+
+    def __len__(self):
+        return len(self.paths) + sum(1 for name in self.shapes if name not in self.paths)
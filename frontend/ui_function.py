@@ -4,10 +4,25 @@ The frontend has complex behavior to provide interactive experience. This module
 """
 
 import curses
+from timeit import default_timer
 
-from backend.core import Element, Group
-from frontend.command import MoveCommand, RotateCommand, MirrorCommand, ScaleCommand
+from backend.core import Element, InstanceGroup, Prototype
+from backend.journal import CommandJournal
+from frontend.command import (MoveCommand, RotateCommand, MirrorCommand, ScaleCommand, AddCommand, DeleteCommand,
+                              ClearCommand)
+from frontend.event_loop import CommandRunner
 from frontend.initial_data import transformer
+from frontend.renderer import CanvasRenderer
+
+# cursor movement of the navigation keys on the numpad as (x, y)
+DIRECTIONS = {ord("4"): (-1, 0), ord("6"): (1, 0), ord("8"): (0, -1), ord("2"): (0, 1)}
+
+# a direction key held longer than the delay moves the cursor one cell further after every interval, in seconds
+ACCELERATION_DELAY = 0.5
+ACCELERATION_INTERVAL = 0.25
+MAX_STEP = 8
+# longest pause between repeats of a held key, longer than the usual delay before the keyboard repeats a key
+REPEAT_GAP = 0.6
 
 
 class UIFunction:
@@ -29,10 +44,14 @@ class UIFunction:
         canvas_group (Group): Contains the elements and groups displayed on the canvas.
         temporary_group (Group): Contains the elements undergoing transformations.
         palette_group (Group): Contains predefined elements to choose from when adding an element to the canvas.
-        predefined_shapes (dictionary): Contains the predefined shapes to chose from when inserting a shape.
+        predefined_shapes (dictionary/ShapeRegistry): Contains the predefined shapes to chose from when inserting a
+        shape.
         position_tools_content (dictionary): Content of the left toolbar with coordinates to be
         addressed when highlighted
         reference_point (None/tuple): Contains the reference point coordinates.
+        renderer (CanvasRenderer): Draws the canvas group in the canvas window.
+        journal (CommandJournal): Executed commands for undo and redo.
+        runner (CommandRunner): Executes the commands beside the user interface.
     """
     def __init__(self, canvas_in, prompt_in, input_in, palette_in, tools_window, position_tools_content,
                  canvas_group, temporary_group, palette_group):
@@ -58,16 +77,43 @@ class UIFunction:
         # variables
         self.reference_point = None
 
+        self.renderer = CanvasRenderer(canvas_in, canvas_group)
+        self.journal = CommandJournal(canvas_group)
+        self.runner = CommandRunner(prompt_in, input_in)
+
+    def execute(self, command):
+        """Executes and records a command without blocking the terminal
+
+        Args:
+            command (Command): The command to execute.
+
+        Returns:
+            None
+        """
+        self.runner.run(self.journal.execute, command)
+
     def add_predefined_shape(self, shape_name, shape_group):
         # FIXME: Missing docstring
         if shape_name not in self.predefined_shapes:
             self.predefined_shapes[shape_name] = shape_group
 
+    def set_predefined_shapes(self, shapes):
+        """Uses all shapes of a registry, which loads them on first use
+
+        Args:
+            shapes (ShapeRegistry/dictionary): Shapes keyed on their names.
+
+        Returns:
+            None
+        """
+        self.predefined_shapes = shapes
+
     def predefined_shape_to_canvas(self, shape_name):
         """Insert predefined shape on the canvas.
 
-        A copy of the predefined shape is created. This way the original doesn't get lost after transformations
-        or deletion.
+        An instance of the predefined shape is created, which shares the geometry of the shape with all other
+        instances. This way the original doesn't get lost after transformations or deletion, and an insertion costs
+        only the placement of the instance instead of a copy of every element.
 
         Args:
             shape_name (Group): A predefined shape.
@@ -75,51 +121,24 @@ class UIFunction:
         Returns:
             None
         """
-
-        # FIXME: What is the purpose of the following code?
         if shape_name in self.predefined_shapes:
-            new_group = Group()
-            new_group.set_transformer(transformer)
-            new_group.x = self.predefined_shapes[shape_name].x
-            new_group.y = self.predefined_shapes[shape_name].y
-            for el in self.predefined_shapes[shape_name].elements:
-                new_element = Element(el.x, el.y).set_transformer(transformer).set_symbol(el.symbol)
-                new_group.add(new_element)
-            self.canvas_group.add(new_group)
+            new_group = InstanceGroup(Prototype.get(self.predefined_shapes[shape_name]), transformer)
+            self.execute(AddCommand(self.canvas_group, [new_group]))
 
     def load_canvas(self):
         """Load elements and groups placed on the canvas.
 
         The canvas can handle only integer numbers, so all the entries are rounded before displaying them.
         If an entry turns out to be a group its elements are accessed and displayed in addition to the group center.
+        Elements out of the canvas are not displayed, yet they still exist. Only the cells changed since the last
+        load are written, see CanvasRenderer.
 
         Args:
 
         Returns:
             None
         """
-        height, width = self.canvas_in.getmaxyx()
-
-        self.canvas_in.clear()
-
-        # FIXME: What is the purpose of the following code?
-        for el in self.canvas_group.elements:
-            # elements out of the canvas are not displayed, yet they still exist
-            if round(el.x) not in range(0, width) or round(el.y) not in range(0, height):
-                continue
-            self.canvas_in.addstr(round(el.y), round(el.x), el.symbol)
-
-            # FIXME: What is the purpose of the following code?
-            try:
-                for el_in in el.elements:
-                    # group-elements out of the canvas are not displayed, yet they still exist
-                    if round(el_in.x) not in range(0, width) or round(el_in.y) not in range(0, height):
-                        continue
-                    self.canvas_in.addstr(round(el_in.y), round(el_in.x), el_in.symbol)
-                    self.canvas_in.addstr(round(el.y), round(el.x), el.symbol, curses.A_REVERSE)
-            except AttributeError:
-                pass
-        self.canvas_in.refresh()
+        self.renderer.render()
 
     def load_palette(self):
         # FIXME: Missing docstring
@@ -129,15 +148,22 @@ class UIFunction:
         self.palette_in.refresh()
 
     @staticmethod
-    def navigate(window, on_five):
+    def navigate(window, on_five, on_region=None):
         """Navigate the canvas or the palette with initial elements.
 
         The navigation is required in multiple commands. It keeps the cursor within the window the user is navigating.
+        All keys typed so far are read at once and handled as a batch: the direction keys are summed up to a single
+        movement of the cursor and the window is refreshed once per batch, so a held key on a slow terminal doesn't
+        queue up a refresh for every key. A direction key held longer than ACCELERATION_DELAY moves the cursor faster.
 
         Args:
             window (curses window): Window to navigate in.
             on_five (function): A function executed on pressing number five on the numpad. This function will receive
             the current cursor position as integer numbers.
+            on_region (function/None): A function executed on selecting a region. A rectangle is selected by pressing
+            zero at two opposite corners, the function receives both corners as tuples (x, y). A lasso is selected by
+            pressing one at each of its corners and three at the last one, the function receives the list of corners
+            and lasso=True.
         Returns:
             None
         """
@@ -149,28 +175,58 @@ class UIFunction:
         x, y = int(width / 3), int(height / 3)
         window.move(y, x)
 
-        # FIXME: What is the purpose of the following code?
+        held, held_since, held_last = None, 0.0, 0.0
+        corner = None
+        lasso = []
         cursor_input = None
         while cursor_input != ord("7"):
 
-            # FIXME: What is the purpose of the following code?
-            cursor_input = window.getch()
-            if cursor_input == ord("4"):
-                x -= 1
-            elif cursor_input == ord("6"):
-                x += 1
-            elif cursor_input == ord("8"):
-                y -= 1
-            elif cursor_input == ord("2"):
-                y += 1
-            elif cursor_input == ord("5"):
-                on_five(x, y)
-
-            # prevent cursor from leaving the screen
-            x = max(0, x)
-            x = min(width - 1, x)
-            y = max(0, y)
-            y = min(height - 1, y)
+            # wait for the next key, then take all keys typed in the meantime
+            keys = [window.getch()]
+            window.nodelay(True)
+            try:
+                key = window.getch()
+                while key != -1:
+                    keys.append(key)
+                    key = window.getch()
+            finally:
+                window.nodelay(False)
+            now = default_timer()
+
+            for index, cursor_input in enumerate(keys):
+                direction = DIRECTIONS.get(cursor_input)
+                if direction is not None:
+                    # a key repeated without a pause is held, the step grows with the time it is held
+                    if cursor_input != held or now - held_last > REPEAT_GAP:
+                        held, held_since = cursor_input, now
+                    held_last = now
+                    step = min(1 + int(max(0.0, now - held_since - ACCELERATION_DELAY) / ACCELERATION_INTERVAL),
+                               MAX_STEP)
+
+                    # prevent cursor from leaving the screen
+                    x = min(max(0, x + direction[0] * step), width - 1)
+                    y = min(max(0, y + direction[1] * step), height - 1)
+                    continue
+
+                held = None
+                if cursor_input == ord("5"):
+                    on_five(x, y)
+                elif cursor_input == ord("0") and on_region is not None:
+                    if corner is None:
+                        corner = (x, y)
+                    else:
+                        on_region([corner, (x, y)])
+                        corner = None
+                elif cursor_input == ord("1") and on_region is not None:
+                    lasso.append((x, y))
+                elif cursor_input == ord("3") and lasso:
+                    on_region(lasso + [(x, y)] if lasso[-1] != (x, y) else lasso, lasso=True)
+                    lasso = []
+                elif cursor_input == ord("7"):
+                    # keys typed after the escape belong to the following input
+                    for key in reversed(keys[index + 1:]):
+                        curses.ungetch(key)
+                    break
 
             window.move(y, x)
             window.refresh()
@@ -202,30 +258,62 @@ class UIFunction:
             None
         """
 
-        height, width = self.canvas_in.getmaxyx()
+        for el in self.canvas_group.move_to(self.temporary_group, self.canvas_group.elements_at(x, y)):
+            self.highlight(el)
 
-        # FIXME: What is the purpose of the following code?
-        for el in self.canvas_group.elements:
+    def region_to_temp(self, corners, lasso=False):
+        """Move all elements and groups within a rectangle or a lasso from canvas to temporary group.
 
-            # ...
-            if round(el.x) == x and round(el.y) == y:
-                self.temporary_group.add(el)
-                self.canvas_group.remove(el)
-                self.canvas_in.addstr(y, x, el.symbol, curses.A_STANDOUT)
+        The members of the region are found with a single range query of the canvas and moved to the temporary group
+        together. A lasso with two corners selects the line between them, a lasso with one corner a single cell.
 
-                # ...
-                try:
+        Args:
+            corners (List[tuple]): Two opposite corners of a rectangle or the corners of a lasso as cursor positions.
+            lasso (bool): The corners belong to a lasso.
+        Returns:
+            None
+        """
+        if not lasso:
+            (x1, y1), (x2, y2) = corners
+            selected = self.canvas_group.elements_in(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        else:
+            selected = self.canvas_group.elements_within(corners)
+
+        selected = self.canvas_group.move_to(self.temporary_group, selected)
 
-                    # FIXME: What is the purpose of the following code?
-                    for el_in in el.elements:
+        # only groups and visible elements are highlighted
+        height, width = self.canvas_in.getmaxyx()
+        for el in selected:
+            if hasattr(el, "elements") or (0 <= round(el.x) < width and 0 <= round(el.y) < height):
+                self.highlight(el)
+
+    def highlight(self, el):
+        """Highlights a selected element or group on the canvas.
+
+        Args:
+            el (Element/Group): Selected element or group.
+        Returns:
+            None
+        """
+        height, width = self.canvas_in.getmaxyx()
+        if round(el.x) in range(0, width) and round(el.y) in range(0, height):
+            self.renderer.draw(round(el.x), round(el.y), el.symbol, curses.A_STANDOUT)
+
+        # the elements of the group and of all nested groups are highlighted too
+        groups = [el] if hasattr(el, "elements") else []
+        while groups:
+            group = groups.pop()
+            if not group.overlaps(0, 0, width - 1, height - 1):
+                continue
 
-                        # group-elements out of the canvas are not highlighted
-                        if round(el_in.x) not in range(0, width) or round(el_in.y) not in range(0, height):
-                            continue
-                        self.canvas_in.addstr(round(el_in.y), round(el_in.x), el_in.symbol, curses.A_STANDOUT)
+            for el_in in group.elements:
+                if hasattr(el_in, "elements"):
+                    groups.append(el_in)
 
-                except AttributeError:
-                    pass
+                # group-elements out of the canvas are not highlighted
+                if round(el_in.x) not in range(0, width) or round(el_in.y) not in range(0, height):
+                    continue
+                self.renderer.draw(round(el_in.x), round(el_in.y), el_in.symbol, curses.A_STANDOUT)
 
     def palette_to_temp(self, x, y):
         """Adds element from the predefined palette to the temporary group.
@@ -241,7 +329,7 @@ class UIFunction:
         for el in self.palette_group.elements:
             if el.x == x and el.y == y:
                 if len(self.temporary_group.elements) != 0:
-                    self.temporary_group.elements.clear()
+                    self.temporary_group.clear()
                     self.load_palette()
                 self.temporary_group.add(el)
                 self.palette_in.addstr(y, x, el.symbol, curses.A_STANDOUT)
@@ -260,7 +348,7 @@ class UIFunction:
         if self.reference_point:
             self.load_canvas()
         self.reference_point = (x, y)
-        self.canvas_in.addstr(y, x, "+", curses.A_STANDOUT)
+        self.renderer.draw(x, y, "+", curses.A_STANDOUT)
 
     def temp_to_canvas(self):
         """Returns elements and groups to the canvas usually after the transformation.
@@ -271,9 +359,7 @@ class UIFunction:
             None
         """
 
-        # FIXME: What is the purpose of the following code?
-        for el in self.temporary_group.elements:
-            self.canvas_group.add(el)
+        self.temporary_group.move_to(self.canvas_group, self.temporary_group.elements)
 
     def new_el_to_canvas(self, x, y):
         """Single element is created on the canvas
@@ -291,8 +377,8 @@ class UIFunction:
         # FIXME: What is the purpose of the following code?
         symbol = self.temporary_group.elements[0].symbol
         element = Element(x, y).set_transformer(transformer).set_symbol(symbol)
-        self.canvas_group.add(element)
-        self.canvas_in.addstr(y, x, symbol, curses.A_STANDOUT)
+        self.execute(AddCommand(self.canvas_group, [element]))
+        self.renderer.draw(x, y, symbol, curses.A_STANDOUT)
 
     def add(self):
         """Adds elements to the canvas one by one.
@@ -325,7 +411,7 @@ class UIFunction:
 
         self.navigate(self.canvas_in, self.new_el_to_canvas)
 
-        self.temporary_group.elements.clear()
+        self.temporary_group.clear()
 
         self.load_canvas()
         self.load_palette()
@@ -353,15 +439,17 @@ class UIFunction:
         # FIXME: What is the purpose of the following code?
         self.prompt_in.clear()
         self.prompt_in.addstr(0, 2, f"Choose element to delete! Navigate:NumLock arrows | Escape:Home "
-                                    f"| Select:5")
+                                    f"| Select:5 | Box:0,0 | Lasso:1,..,3")
         self.prompt_in.refresh()
 
-        self.navigate(self.canvas_in, self.canvas_to_temp)
+        self.navigate(self.canvas_in, self.canvas_to_temp, self.region_to_temp)
 
         self.play_down_tool("select")
         # end of selection
 
-        self.temporary_group.elements.clear()
+        # the selected elements are already removed from the canvas
+        self.journal.record(DeleteCommand(self.canvas_group, self.temporary_group.elements))
+        self.temporary_group.clear()
 
         self.load_canvas()
         curses.beep()
@@ -387,10 +475,11 @@ class UIFunction:
 
         # FIXME: What is the purpose of the following code?
         self.prompt_in.clear()
-        self.prompt_in.addstr(0, 2, f"Choose element! Navigate:NumLock arrows | Escape:Home | Select:5 | Deselect:-")
+        self.prompt_in.addstr(0, 2, f"Choose element! Navigate:NumLock arrows | Escape:Home | Select:5 | Deselect:-"
+                                    f" | Box:0,0 | Lasso:1,..,3")
         self.prompt_in.refresh()
 
-        self.navigate(self.canvas_in, self.canvas_to_temp)
+        self.navigate(self.canvas_in, self.canvas_to_temp, self.region_to_temp)
 
         self.play_down_tool("select")
         # end of selection
@@ -405,10 +494,10 @@ class UIFunction:
         x, y = [int(n) for n in user_input.split(",")]
 
         move_elements = MoveCommand(self.temporary_group, x, y)
-        move_elements.execute()
+        self.execute(move_elements)
 
         self.temp_to_canvas()
-        self.temporary_group.elements.clear()
+        self.temporary_group.clear()
 
         self.load_canvas()
         curses.beep()
@@ -441,10 +530,11 @@ class UIFunction:
 
         # FIXME: What is the purpose of the following code?
         self.prompt_in.clear()
-        self.prompt_in.addstr(0, 2, "Choose elements! Navigate:NumLock arrows | Select:5 | Escape:Home")
+        self.prompt_in.addstr(0, 2, "Choose elements! Navigate:NumLock arrows | Select:5 | Box:0,0 | Lasso:1,..,3 "
+                                    "| Escape:Home")
         self.prompt_in.refresh()
 
-        self.navigate(self.canvas_in, self.canvas_to_temp)
+        self.navigate(self.canvas_in, self.canvas_to_temp, self.region_to_temp)
 
         self.play_down_tool("select")
         # end of selection
@@ -463,11 +553,11 @@ class UIFunction:
         # FIXME: What is the purpose of the following code?
         transformer.set_reference(*self.reference_point)
         rotate_elements = RotateCommand(self.temporary_group, theta)
-        rotate_elements.execute()
+        self.execute(rotate_elements)
 
         # FIXME: What is the purpose of the following code?
         self.temp_to_canvas()
-        self.temporary_group.elements.clear()
+        self.temporary_group.clear()
         self.reference_point = None
 
         # FIXME: What is the purpose of the following code?
@@ -502,10 +592,11 @@ class UIFunction:
 
         # FIXME: What is the purpose of the following code?
         self.prompt_in.clear()
-        self.prompt_in.addstr(0, 2, "Choose elements! Navigate:NumLock arrows | Select:5 | Escape:Home")
+        self.prompt_in.addstr(0, 2, "Choose elements! Navigate:NumLock arrows | Select:5 | Box:0,0 | Lasso:1,..,3 "
+                                    "| Escape:Home")
         self.prompt_in.refresh()
 
-        self.navigate(self.canvas_in, self.canvas_to_temp)
+        self.navigate(self.canvas_in, self.canvas_to_temp, self.region_to_temp)
 
         self.play_down_tool("select")
         # end of selection
@@ -524,11 +615,11 @@ class UIFunction:
         # FIXME: What is the purpose of the following code?
         transformer.set_reference(*self.reference_point)
         mirror_elements = MirrorCommand(self.temporary_group, direction)
-        mirror_elements.execute()
+        self.execute(mirror_elements)
 
         # FIXME: What is the purpose of the following code?
         self.temp_to_canvas()
-        self.temporary_group.elements.clear()
+        self.temporary_group.clear()
         self.reference_point = None
 
         self.load_canvas()
@@ -562,10 +653,11 @@ class UIFunction:
         self.navigate(self.canvas_in, self.canvas_to_reference_point)
 
         self.prompt_in.clear()
-        self.prompt_in.addstr(0, 2, "Choose elements! Navigate:NumLock arrows | Select:5 | Escape:Home")
+        self.prompt_in.addstr(0, 2, "Choose elements! Navigate:NumLock arrows | Select:5 | Box:0,0 | Lasso:1,..,3 "
+                                    "| Escape:Home")
         self.prompt_in.refresh()
 
-        self.navigate(self.canvas_in, self.canvas_to_temp)
+        self.navigate(self.canvas_in, self.canvas_to_temp, self.region_to_temp)
 
         self.play_down_tool("select")
         # end of selection
@@ -584,11 +676,11 @@ class UIFunction:
         # FIXME: What is the purpose of the following code?
         transformer.set_reference(*self.reference_point)
         scale_elements = ScaleCommand(self.temporary_group, scale_x, scale_y)
-        scale_elements.execute()
+        self.execute(scale_elements)
 
         # FIXME: What is the purpose of the following code?
         self.temp_to_canvas()
-        self.temporary_group.elements.clear()
+        self.temporary_group.clear()
         self.reference_point = None
 
         # FIXME: What is the purpose of the following code?
@@ -613,7 +705,13 @@ class UIFunction:
         # FIXME: What is the purpose of the following code?
         self.prompt_in.clear()
         available_shapes = ', '.join(shape_name for shape_name in self.predefined_shapes)
-        self.prompt_in.addstr(0, 2, f"Chose a shape to insert: {available_shapes}")
+        prompt = f"Chose a shape to insert: {available_shapes}"
+
+        # a large library doesn't fit in the prompt
+        height, width = self.prompt_in.getmaxyx()
+        if len(prompt) > width - 3:
+            prompt = prompt[:width - 6] + "..."
+        self.prompt_in.addstr(0, 2, prompt)
         self.prompt_in.refresh()
 
         # FIXME: What is the purpose of the following code?
@@ -650,9 +748,33 @@ class UIFunction:
 
         # FIXME: What is the purpose of the following code?
         if user_input == "y":
-            self.canvas_group.elements.clear()
+            self.execute(ClearCommand(self.canvas_group))
 
         self.load_canvas()
         curses.beep()
 
         self.play_down_tool("clear")
+
+    def undo(self):
+        """Reverts the last command.
+
+        Args:
+
+        Returns:
+            None
+        """
+        if self.runner.run(self.journal.undo):
+            self.load_canvas()
+            curses.beep()
+
+    def redo(self):
+        """Executes the last reverted command again.
+
+        Args:
+
+        Returns:
+            None
+        """
+        if self.runner.run(self.journal.redo):
+            self.load_canvas()
+            curses.beep()
@@ -1,15 +1,22 @@
 """The main eventloop is started in this module.
+
+    python main.py                      start the editor
+    python main.py --startup-time       measure the time until the first frame is drawn and quit
 """
 
+# the time is taken before any other import, so the startup time includes them
+from timeit import default_timer
+STARTED = default_timer()
+
 import curses
+import sys
 
 # FIXME: The place of WindowCreator is not here, it shall be part of the presentation layer
 from frontend.window_creator import WindowCreator
 from frontend.ui_function import UIFunction
 
 # FIXME: The place of the initial data is not here, it shall be part of the data layer
-from frontend.initial_data import (canvas, temporary_group, palette, predefined_square,
-                                   predefined_z_shape, predefined_smiley)
+from frontend.initial_data import canvas, temporary_group, palette, shapes
 
 
 class Application:
@@ -31,8 +38,9 @@ class Application:
         pass
 
     @staticmethod
-    def mainloop(stdscr):
+    def mainloop(stdscr, measure_startup=False):
         # FIXME: Describe the parameter stdscr, shall not be a mystery
+        # With measure_startup the loop returns the seconds from the start of the program to the first frame
         # FIXME: This function is not stuctured enough, too long
         # FIXME: The application knows about curses, it shall know about our own interface, not curses
 
@@ -115,9 +123,10 @@ class Application:
         # load content
         ui_function.load_palette()
         ui_function.load_canvas()
-        ui_function.add_predefined_shape("square", predefined_square)
-        ui_function.add_predefined_shape("z-shape", predefined_z_shape)
-        ui_function.add_predefined_shape("smiley", predefined_smiley)
+        ui_function.set_predefined_shapes(shapes)
+
+        if measure_startup:
+            return default_timer() - STARTED
 
         # loop during use
         user_input = None
@@ -146,6 +155,10 @@ class Application:
                 ui_function.insert_shape()
             elif user_input == "c":
                 ui_function.clear()
+            elif user_input == "u":
+                ui_function.undo()
+            elif user_input == "re":
+                ui_function.redo()
 
             input_in.clear()
             input_in.refresh()
@@ -166,7 +179,11 @@ def main():
 
     # curses.wrapper takes care of curses initialization and returns the state of the terminal to default at the end
     # it returns errors to the terminal should they occur during execution
-    curses.wrapper(app.mainloop)
+    if "--startup-time" in sys.argv[1:]:
+        startup = curses.wrapper(app.mainloop, True)
+        print(f"First frame after {startup * 1000:.1f}ms")
+    else:
+        curses.wrapper(app.mainloop)
 
     # FIXME: Why is this necessary? Why the user must use curses.wrapper? Why is it not packed into a class?
     # The application shall have several layers, each layer shall be a class. One of the classes must use the
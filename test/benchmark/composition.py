@@ -0,0 +1,61 @@
+"""Chained commands on a large group with and without composition of the transformations
+
+    python -m test.benchmark.composition 100000
+"""
+
+import sys
+from timeit import default_timer
+
+from backend.core import Element, Group
+from backend.transformer import CartesianTransformer
+from frontend.command import MoveCommand, RotateCommand, MirrorCommand, ScaleCommand
+
+transformer = CartesianTransformer()
+
+
+class CountingGroup(Group):
+    """Group counting the matrices applied to its elements"""
+
+    applies = 0
+
+    def apply(self, matrix):
+        CountingGroup.applies += 1
+        super().apply(matrix)
+
+
+def chained_commands(group):
+    commands = []
+    for i in range(50):
+        transformer.set_reference(i, -i)
+        commands.append([MoveCommand(group, 1, 2),
+                         RotateCommand(group, 15),
+                         MirrorCommand(group, "x"),
+                         ScaleCommand(group, 1, 1)][i % 4])
+        commands[-1].execute()
+
+
+def run(count, deferred):
+    group = CountingGroup(transformer=transformer)
+    for i in range(count):
+        group.add(Element(i, i, transformer))
+    group.set_deferred(deferred)
+
+    CountingGroup.applies = 0
+    start = default_timer()
+    chained_commands(group)
+    group.flush()
+    duration = default_timer() - start
+
+    transformer.set_reference(0, 0)
+    return duration, CountingGroup.applies, group.elements[-1].x, group.elements[-1].y
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    immediate, applies_immediate, x_immediate, y_immediate = run(count, deferred=False)
+    composed, applies_composed, x_composed, y_composed = run(count, deferred=True)
+
+    print(f"50 commands on {count} elements")
+    print(f"immediate: {immediate:.3f}s, {applies_immediate} applies, last element {x_immediate:.3f},{y_immediate:.3f}")
+    print(f"composed:  {composed:.3f}s, {applies_composed} applies, last element {x_composed:.3f},{y_composed:.3f}")
@@ -0,0 +1,61 @@
+"""Streaming export and import of a large canvas as JSON Lines and CSV
+
+Reports the throughput and the peak of the memory allocated during export and import besides the canvas itself.
+
+    python -m test.benchmark.exchange 1000000
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from timeit import default_timer
+
+import numpy as np
+
+from backend.core import Canvas
+from backend.exchange import export_rows, import_rows, write_jsonl, read_jsonl, write_csv, read_csv
+from backend.store import ElementStore
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+
+FORMATS = {"jsonl": (write_jsonl, read_jsonl), "csv": (write_csv, read_csv)}
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = default_timer()
+    result = function(*args)
+    duration = default_timer() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def run(count, extension):
+    write, read = FORMATS[extension]
+    store = ElementStore()
+    store.extend(np.arange(count) % 1000, np.arange(count) // 1000, symbol="X", symbol_color="red")
+    canvas = Canvas(transformer=transformer, store=store)
+
+    path = os.path.join(tempfile.mkdtemp(), "drawing." + extension)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        written, export_duration, export_peak = measure(write, file, export_rows(canvas))
+
+    imported = Canvas(transformer=transformer, store=ElementStore())
+    with open(path, newline="", encoding="utf-8") as file:
+        read_rows, import_duration, import_peak = measure(import_rows, imported, read(file))
+
+    size = os.path.getsize(path) / 2 ** 20
+    os.remove(path)
+    print(f"{extension:<5} {count} rows, {size:.1f}MiB: "
+          f"export {export_duration:.2f}s ({size / export_duration:.1f}MiB/s, peak {export_peak / 2 ** 20:.1f}MiB), "
+          f"import {import_duration:.2f}s ({size / import_duration:.1f}MiB/s, "
+          f"peak {import_peak / 2 ** 20:.1f}MiB including the imported store)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for extension in FORMATS:
+        run(count, extension)
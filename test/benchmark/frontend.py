@@ -0,0 +1,55 @@
+"""Rendering and keystroke latency of the application on a large canvas, without a terminal
+
+The canvas is filled with elements and the application is driven by a FakeScreen: the move command navigates over
+the canvas with single keystrokes, selects an element and moves it. Reported are the durations, the refreshes and
+the bytes written per frame. The latency of a batch of keystrokes is the time until the application waits for the
+next input.
+
+    python -m test.benchmark.frontend 100000 200
+"""
+
+import sys
+from timeit import default_timer
+
+from backend.core import Element
+from main import Application
+from frontend.initial_data import canvas, transformer
+from test.fake_curses import FakeScreen
+
+
+def fill(count):
+    canvas.clear()
+    for i in range(count):
+        canvas.add(Element(i % 1000, i // 1000, transformer).set_symbol("X"))
+
+
+def session(keystrokes):
+    """Starts the application, moves an element selected after the keystrokes and quits"""
+    screen = FakeScreen(50, 200)
+    screen.send("m")
+    screen.press(*["6", "4"] * (keystrokes // 2), "5", "7")
+    screen.send("1,1")
+
+    start = default_timer()
+    with screen.install():
+        Application.mainloop(screen.stdscr)
+    return default_timer() - start, screen
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    keystrokes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    fill(count)
+    duration, screen = session(keystrokes)
+    # the keys typed ahead are handled in batches, the latency is recorded for the first key of every batch
+    navigation = [latency for key, latency in screen.latencies if isinstance(key, int)]
+    commands = [latency for key, latency in screen.latencies if key in (b"m", b"1,1")]
+
+    print(f"{count} elements on the canvas")
+    print(f"start, {keystrokes} keystrokes, move and quit: {duration:.3f}s")
+    print(f"navigation and selection: {len(navigation)} batches, {sum(navigation) * 1000:.3f}ms, "
+          f"per keystroke {sum(navigation) / (keystrokes + 2) * 1e6:.1f}us")
+    print(f"move command: {sum(commands) * 1000:.3f}ms")
+    print(f"{screen.refreshes} refreshes, {screen.written} bytes, "
+          f"{screen.written / screen.refreshes:.1f} bytes per frame, largest frame {max(screen.frames)} bytes")
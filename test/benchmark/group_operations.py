@@ -0,0 +1,91 @@
+"""Boolean operations on large groups compared with the former list based implementation
+
+The former implementation is quadratic, so it is only measured up to 20000 elements.
+
+    python -m test.benchmark.group_operations 1000 10000 100000
+"""
+
+import sys
+from timeit import default_timer
+
+from backend.core import Element, Group
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+
+LIST_LIMIT = 20000
+
+
+class ListGroup:
+    """Group of the former implementation, which kept its elements in a plain list"""
+
+    def __init__(self, elements):
+        self.elements = list(elements)
+
+
+def list_union(group, other):
+    group.elements.extend(other.elements)
+    return group.elements
+
+
+def list_difference(group, other):
+    # the loop of the former implementation removes from the list it iterates, so it skips elements
+    for element in group.elements:
+        if element in other.elements:
+            group.elements.remove(element)
+    return group.elements
+
+
+def list_split(group, other):
+    elements_group_1 = []
+    elements_intersection = []
+    elements_group_2 = []
+
+    for element in group.elements:
+        if element not in other.elements:
+            elements_group_1.append(element)
+        else:
+            elements_intersection.append(element)
+
+    for element in other.elements:
+        if element not in group.elements:
+            elements_group_2.append(element)
+
+    return [elements_group_1, elements_intersection, elements_group_2]
+
+
+def overlapping_groups(count):
+    """Two groups sharing half of their elements"""
+    elements = [Element(i, i, transformer) for i in range(count + count // 2)]
+    group = Group(transformer=transformer)
+    other = Group(transformer=transformer)
+    for element in elements[:count]:
+        group.add(element)
+    for element in elements[count // 2:]:
+        other.add(element)
+    return group, other
+
+
+def measure(operation, count, former=False):
+    group, other = overlapping_groups(count)
+    if former:
+        group, other = ListGroup(group.elements), ListGroup(other.elements)
+    start = default_timer()
+    operation(group, other)
+    return default_timer() - start
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+
+    print(f"{'elements':>10} {'operation':>12} {'list':>10} {'set':>10}   (seconds)")
+    for count in counts:
+        for name, list_operation, set_operation in [
+                ("union", list_union, Group.union),
+                ("difference", list_difference, Group.difference),
+                ("intersection", None, Group.intersection),
+                ("split", list_split, Group.split)]:
+            list_time = "-"
+            if list_operation and count <= LIST_LIMIT:
+                list_time = f"{measure(list_operation, count, former=True):.4f}"
+            print(f"{count:>10} {name:>12} {list_time:>10} {measure(set_operation, count):>10.4f}")
@@ -0,0 +1,59 @@
+"""Saving the state of a large canvas after small changes
+
+Every change takes one element from the canvas, moves it and puts it back - like the move command does - and saves
+the state. At the end all states are undone and the coordinates are compared with the original ones.
+
+    python -m test.benchmark.history 100000 1000
+"""
+
+import sys
+import tracemalloc
+from timeit import default_timer
+
+from backend.core import Element, Canvas
+from backend.memento import History
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+
+
+def run(count, saves):
+    canvas = Canvas(transformer=transformer)
+    for i in range(count):
+        canvas.add(Element(i % 1000, i // 1000, transformer).set_symbol("X"))
+    original = [(element.x, element.y) for element in canvas.elements]
+
+    history = History()
+    history.save_state(canvas.create_memento())
+
+    tracemalloc.start()
+    start = default_timer()
+    for i in range(saves):
+        element = canvas.elements_at(i % 1000, (i // 1000) % (count // 1000))[0]
+        canvas.remove(element)
+        element.move(0.5, 0.5)
+        canvas.add(element)
+        history.save_state(canvas.create_memento())
+    duration = default_timer() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = default_timer()
+    state = history.get_state_past()
+    while state:
+        canvas.restore_from_memento(state)
+        undone = state
+        state = history.get_state_past()
+    undo_duration = default_timer() - start
+
+    restored = sorted((element.x, element.y) for element in canvas.elements)
+    print(f"{saves} saves on {count} elements: {duration:.3f}s, {duration / saves * 1000:.3f}ms per save, "
+          f"{memory / saves / 1024:.1f}KiB per save")
+    print(f"{saves} undos: {undo_duration:.3f}s, exact coordinates restored: {restored == sorted(original)}")
+    return undone
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    saves = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    run(count, saves)
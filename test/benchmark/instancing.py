@@ -0,0 +1,68 @@
+"""Memory and time of inserting a predefined shape as copies and as instances
+
+The copy is the former implementation of UIFunction.predefined_shape_to_canvas, which creates a new element for
+every element of the shape. Copies are measured for a hundredth of the insertions, the totals are extrapolated.
+
+    python -m test.benchmark.instancing 10000 1000
+"""
+
+import sys
+import tracemalloc
+from timeit import default_timer
+
+from backend.core import Element, Group, Canvas, InstanceGroup, Prototype
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+
+
+def create_shape(size):
+    shape = Group(transformer=transformer)
+    for index in range(size):
+        shape.add(Element(index % 40, index // 40, transformer).set_symbol("X"))
+    return shape
+
+
+def copy(shape):
+    new_group = Group()
+    new_group.set_transformer(transformer)
+    new_group.x = shape.x
+    new_group.y = shape.y
+    for el in shape.elements:
+        new_group.add(Element(el.x, el.y).set_transformer(transformer).set_symbol(el.symbol))
+    return new_group
+
+
+def instance(shape):
+    return InstanceGroup(Prototype.get(shape), transformer)
+
+
+def measure(insert, shape, count):
+    """Time and allocated memory of count insertions into a new canvas"""
+    canvas = Canvas(transformer=transformer)
+    tracemalloc.start()
+    start = default_timer()
+    for number in range(count):
+        canvas.add(insert(shape))
+    duration = default_timer() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return duration, memory
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    shape = create_shape(size)
+    Prototype.get(shape)
+
+    copies = max(count // 100, 1)
+    copy_duration, copy_memory = measure(copy, shape, copies)
+    instance_duration, instance_memory = measure(instance, shape, count)
+
+    print(f"{count} insertions of a shape with {size} elements")
+    print(f"copy      {copy_duration * count / copies:8.2f}s {copy_memory * count / copies / 2 ** 20:10.1f}MB "
+          f"(extrapolated from {copies} insertions)")
+    print(f"instance  {instance_duration:8.2f}s {instance_memory / 2 ** 20:10.1f}MB, "
+          f"{instance_memory / count:.0f} bytes per insertion")
@@ -0,0 +1,79 @@
+"""Memory footprint of elements on the canvas
+
+Reports the bytes per element for the former dictionary based Element, the slotted Element and the columnar
+ElementStore. The numbers of elements can be passed as arguments:
+
+    python -m test.benchmark.memory 10000 100000
+"""
+
+import sys
+import tracemalloc
+
+from backend.core import Element, Group
+from backend.store import ElementStore
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+
+
+class DictElement:
+    """Element as it was before the introduction of slots and shared styles
+
+    Only bounds() is added, groups ask their elements for it. Methods don't change the size of the instances.
+    """
+
+    def __init__(self, x, y, transformer):
+        self.x = x
+        self.y = y
+        self.transformer = transformer
+
+        self.name = ""
+        self.symbol = ""
+        self.symbol_color = ""
+        self.background_color = ""
+
+    def bounds(self):
+        return self.x, self.y, self.x, self.y
+
+
+def dict_elements(count):
+    group = Group(transformer=transformer)
+    for i in range(count):
+        element = DictElement(float(i), float(i), transformer)
+        element.symbol = "X"
+        group.add(element)
+    return group
+
+
+def slotted_elements(count):
+    group = Group(transformer=transformer)
+    for i in range(count):
+        group.add(Element(float(i), float(i), transformer).set_symbol("X"))
+    return group
+
+
+def stored_elements(count):
+    store = ElementStore()
+    store.extend(range(count), range(count), symbol="X")
+    return store
+
+
+def bytes_per_element(create, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    created = create(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del created
+    return (after - before) / count
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+    print(f"{'elements':>10} {'dict':>10} {'slots':>10} {'store':>10}   (bytes per element)")
+    for count in counts:
+        print(f"{count:>10} "
+              f"{bytes_per_element(dict_elements, count):>10.1f} "
+              f"{bytes_per_element(slotted_elements, count):>10.1f} "
+              f"{bytes_per_element(stored_elements, count):>10.1f}")
@@ -0,0 +1,108 @@
+"""Refreshes of the navigation with a held key on a slow terminal link
+
+A key is held for some seconds, the keyboard repeats it at a fixed rate and every refresh of a window waits for the
+link. The navigation of UIFunction, which handles all typed keys as one batch, is compared with the navigation
+refreshing after every key. Reported are the refreshes, the refreshes per second, the lag between the last typed
+key and the end of the navigation and the final position of the cursor.
+
+    python -m test.benchmark.navigation [seconds held] [keys per second] [ms per refresh]
+"""
+
+import sys
+import time
+from collections import deque
+from timeit import default_timer
+
+from frontend.ui_function import UIFunction
+from test.fake_curses import FakeScreen
+
+
+class SlowLinkScreen(FakeScreen):
+    """Screen with keys typed at given times and a delay for every refresh
+
+    Attributes:
+        arrivals (deque): Time of every prepared key, relative to the start of the session.
+        refresh_delay (float): Seconds every refresh waits for the link.
+        start (float/None): Beginning of the session.
+    """
+
+    def __init__(self, height, width, refresh_delay):
+        super().__init__(height, width)
+        self.arrivals = deque()
+        self.refresh_delay = refresh_delay
+        self.start = None
+
+    def hold(self, key, seconds, rate):
+        """Prepares a key repeated at the rate for the seconds, followed by the escape key"""
+        count = int(seconds * rate)
+        self.press(*[key] * count, "7")
+        self.arrivals.extend(repeat / rate for repeat in range(count + 1))
+
+    def elapsed(self):
+        return default_timer() - self.start
+
+    def refreshed(self, written):
+        super().refreshed(written)
+        time.sleep(self.refresh_delay)
+
+    def typed_key(self):
+        if self.arrivals and self.arrivals[0] <= self.elapsed():
+            self.arrivals.popleft()
+            return super().typed_key()
+        return -1
+
+    def next_key(self):
+        if self.arrivals:
+            time.sleep(max(0.0, self.arrivals.popleft() - self.elapsed()))
+        return super().next_key()
+
+
+def navigate_per_key(window, on_five):
+    """Navigation refreshing the window after every key, as before the batching"""
+    height, width = window.getmaxyx()
+    x, y = int(width / 3), int(height / 3)
+    window.move(y, x)
+
+    cursor_input = None
+    while cursor_input != ord("7"):
+        cursor_input = window.getch()
+        if cursor_input == ord("4"):
+            x -= 1
+        elif cursor_input == ord("6"):
+            x += 1
+        elif cursor_input == ord("8"):
+            y -= 1
+        elif cursor_input == ord("2"):
+            y += 1
+        elif cursor_input == ord("5"):
+            on_five(x, y)
+
+        x = min(max(0, x), width - 1)
+        y = min(max(0, y), height - 1)
+        window.move(y, x)
+        window.refresh()
+
+
+def session(navigate, seconds, rate, delay):
+    screen = SlowLinkScreen(50, 1000, delay)
+    screen.hold("6", seconds, rate)
+    window = screen.newwin(50, 1000)
+
+    with screen.install():
+        screen.start = default_timer()
+        navigate(window, lambda x, y: None)
+        duration = screen.elapsed()
+
+    lag = duration - int(seconds * rate) / rate
+    print(f"{navigate.__name__:>16}: {screen.refreshes} refreshes, {screen.refreshes / duration:.1f} per second, "
+          f"lag after the last key {lag * 1000:.0f}ms, cursor at x={window.cursor[1]}")
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+    delay = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 50.0 / 1000
+
+    print(f"key held {seconds}s at {rate:.0f} keys per second, {delay * 1000:.0f}ms per refresh")
+    session(navigate_per_key, seconds, rate, delay)
+    session(UIFunction.navigate, seconds, rate, delay)
@@ -0,0 +1,62 @@
+"""Scaling of transformations and fills of a large store with the number of worker processes
+
+Every measurement moves, rotates and fills a canvas with a store in shared memory. The single process path without
+a pool is the baseline.
+
+    python -m test.benchmark.parallel 4000000 1 2 4 8
+"""
+
+import os
+import sys
+from timeit import default_timer
+
+import numpy as np
+
+from backend.core import Canvas
+from backend.parallel import ShardPool
+from backend.store import ElementStore
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+REPEAT = 5
+
+
+def measure(count, pool=None):
+    """Median time of move, rotate and fill"""
+    store = ElementStore(capacity=count)
+    if pool is not None:
+        store.share(pool)
+    canvas = Canvas(transformer=transformer, store=store)
+    canvas.add_columns(np.arange(count, dtype=float), np.zeros(count), symbol="X")
+
+    # the first call starts the workers
+    canvas.move(0, 0)
+
+    times = {}
+    for name, operation in (("move", lambda: canvas.move(1, 2)),
+                            ("rotate", lambda: canvas.rotate(30)),
+                            ("fill", lambda: canvas.fill("symbol", "#"))):
+        durations = []
+        for repetition in range(REPEAT):
+            start = default_timer()
+            operation()
+            durations.append(default_timer() - start)
+        times[name] = sorted(durations)[REPEAT // 2]
+    return times
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4000000
+    process_counts = [int(argument) for argument in sys.argv[2:]] or list(range(1, (os.cpu_count() or 1) + 1))
+
+    print(f"{count} elements, {os.cpu_count()} cores, median of {REPEAT}")
+    baseline = measure(count)
+    print("single process " + "  ".join(f"{name} {time * 1000:8.2f}ms" for name, time in baseline.items()))
+    for processes in process_counts:
+        pool = ShardPool(processes=processes, threshold=0)
+        try:
+            times = measure(count, pool)
+        finally:
+            pool.close()
+        print(f"{processes:>2} processes   " + "  ".join(f"{name} {time * 1000:8.2f}ms ({baseline[name] / time:.2f}x)"
+                                                         for name, time in times.items()))
@@ -0,0 +1,48 @@
+"""Latency of single point transformations with plain float arithmetic and with NumPy
+
+The NumPy variant is the former implementation of CartesianTransformer.transform(), which builds arrays for the
+matrix, the coordinates and the reference point on every call.
+
+    python -m test.benchmark.single_point 100000
+"""
+
+import sys
+from timeit import timeit
+
+import numpy as np
+
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer().set_reference(3, 4)
+
+
+def numpy_transform(x, y, matrix):
+    transformation_matrix = np.array(matrix)
+    old_coordinates = np.array([x, y, 1])
+    reference_coordinates = np.array([transformer.reference_x, transformer.reference_y, 0])
+    old_coordinates_adjusted = old_coordinates - reference_coordinates
+
+    new_x, new_y, rest = (transformation_matrix @ old_coordinates_adjusted) + reference_coordinates
+    return new_x, new_y
+
+
+operations = {"move": (lambda: transformer.move(10.5, 20.5, 1, 2),
+                       lambda: numpy_transform(10.5, 20.5, transformer.move_matrix(1, 2))),
+              "rotate": (lambda: transformer.rotate(10.5, 20.5, 30),
+                         lambda: numpy_transform(10.5, 20.5, transformer.rotate_matrix(30))),
+              "mirror": (lambda: transformer.mirror(10.5, 20.5, "xy"),
+                         lambda: numpy_transform(10.5, 20.5, transformer.mirror_matrix("xy"))),
+              "scale": (lambda: transformer.scale(10.5, 20.5, 2, 3),
+                        lambda: numpy_transform(10.5, 20.5, transformer.scale_matrix(2, 3)))}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print(f"{count} calls per operation, latency per call")
+    for name, (scalar, numpy) in operations.items():
+        assert np.allclose(scalar(), numpy())
+        scalar_latency = timeit(scalar, number=count) / count
+        numpy_latency = timeit(numpy, number=count) / count
+        print(f"{name:<7} scalar: {scalar_latency * 1e6:.2f}us, numpy: {numpy_latency * 1e6:.2f}us, "
+              f"speedup {numpy_latency / scalar_latency:.1f}x")
@@ -0,0 +1,64 @@
+"""Time from the start of the application to its first frame, with a large library of shapes
+
+Every measurement runs in a new process, so the imports are included. The application draws into a FakeScreen and
+quits after the first frame, like with 'python main.py --startup-time' in a terminal.
+
+    python -m test.benchmark.startup 5000
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# started in a new process with the directory of the library
+CHILD = """
+import sys
+from timeit import default_timer
+start = default_timer()
+
+import main
+from frontend.shape_registry import ShapeRegistry
+from test.fake_curses import FakeScreen
+
+main.shapes = ShapeRegistry(sys.argv[1], main.canvas.transformer)
+screen = FakeScreen(50, 200)
+with screen.install():
+    main.Application.mainloop(screen.stdscr, measure_startup=True)
+first_frame = default_timer() - start
+
+square = main.shapes["square"]
+print(first_frame, default_timer() - start - first_frame, "numpy" in sys.modules)
+"""
+
+
+def library(count):
+    """Directory with copies of the square"""
+    directory = tempfile.mkdtemp()
+    with open(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "data", "shapes",
+                           "square.json")) as file:
+        square = json.load(file)
+    for i in range(count):
+        name = "square" if i == 0 else f"square-{i}"
+        with open(os.path.join(directory, name + ".json"), "w") as file:
+            json.dump(square, file)
+    return directory
+
+
+def measure(directory, repeat=5):
+    results = []
+    for i in range(repeat):
+        output = subprocess.run([sys.executable, "-c", CHILD, directory], capture_output=True, text=True,
+                                check=True).stdout.split()
+        results.append((float(output[0]), float(output[1]), output[2] == "True"))
+    return min(results)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    for shapes in (1, count):
+        first_frame, first_use, numpy_imported = measure(library(shapes))
+        print(f"{shapes} shapes: first frame after {first_frame * 1000:.1f}ms (NumPy imported: {numpy_imported}), "
+              f"first use of a shape {first_use * 1000:.2f}ms")
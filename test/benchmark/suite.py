@@ -0,0 +1,301 @@
+"""Reproducible benchmarks of the backend and of loading the canvas
+
+Every benchmark is measured for 10 to 10^6 elements. The data is prepared anew before every repetition and only
+the operation itself is timed. The results are written as JSON together with the version of the code, so they can
+be compared across versions. Nothing is displayed, the canvas is loaded into an in-memory window.
+
+    python -m test.benchmark.suite --max 100000 --repeat 5 --output results.json
+    python -m test.benchmark.suite --only group_move history_save
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from timeit import default_timer
+
+import numpy as np
+
+from backend.core import Element, Group, Canvas
+from backend.memento import History
+from backend.transformer import CartesianTransformer
+from frontend.ui_function import UIFunction
+from test.benchmark.group_operations import overlapping_groups
+from test.fake_curses import FakeWindow
+
+SCALES = [10, 100, 1000, 10000, 100000, 1000000]
+
+# width of the area the elements are placed in, the canvas window shows a part of it
+AREA_WIDTH = 1000
+
+BENCHMARKS = {}
+
+transformer = CartesianTransformer()
+
+
+def benchmark(function):
+    """Registers a benchmark
+
+    The registered function prepares the data for a number of elements and returns the operation to time.
+    """
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def elements(count):
+    return [Element(i % AREA_WIDTH, i // AREA_WIDTH, transformer).set_symbol("X") for i in range(count)]
+
+
+def group(count):
+    new_group = Group(transformer=transformer)
+    for element in elements(count):
+        new_group.add(element)
+    return new_group
+
+
+def canvas(count):
+    new_canvas = Canvas(transformer=transformer)
+    for element in elements(count):
+        new_canvas.add(element)
+    return new_canvas
+
+
+@benchmark
+def element_move(count):
+    prepared = elements(count)
+    return lambda: [element.move(1, 2) for element in prepared]
+
+
+@benchmark
+def element_rotate(count):
+    prepared = elements(count)
+    return lambda: [element.rotate(30) for element in prepared]
+
+
+@benchmark
+def group_move(count):
+    prepared = group(count)
+    return lambda: prepared.move(1, 2)
+
+
+@benchmark
+def group_rotate(count):
+    prepared = group(count)
+    return lambda: prepared.rotate(30)
+
+
+@benchmark
+def nested_group_move(count):
+    """Ten levels of nested groups, each level holds a tenth of the elements"""
+    prepared = Group(transformer=transformer)
+    level = prepared
+    for index, element in enumerate(elements(count)):
+        if index and index % max(count // 10, 1) == 0:
+            nested = Group(transformer=transformer)
+            level.add(nested)
+            level = nested
+        level.add(element)
+    return lambda: prepared.move(1, 2)
+
+
+@benchmark
+def group_union(count):
+    first, second = overlapping_groups(count)
+    return lambda: first.union(second)
+
+
+@benchmark
+def group_difference(count):
+    first, second = overlapping_groups(count)
+    return lambda: first.difference(second)
+
+
+@benchmark
+def group_split(count):
+    first, second = overlapping_groups(count)
+    return lambda: first.split(second)
+
+
+@benchmark
+def history_save(count):
+    """A single element is moved through the canvas and the state is saved"""
+    prepared = canvas(count)
+    history = History()
+    history.save_state(prepared.create_memento())
+    element = prepared.elements[count // 2]
+
+    def save():
+        prepared.remove(element)
+        element.move(1, 1)
+        prepared.add(element)
+        history.save_state(prepared.create_memento())
+
+    return save
+
+
+@benchmark
+def history_undo_redo(count):
+    """Ten saved changes are undone and redone"""
+    prepared = canvas(count)
+    history = History()
+    history.save_state(prepared.create_memento())
+    for i in range(10):
+        element = prepared.elements[i * count // 10]
+        prepared.remove(element)
+        element.move(1, 1)
+        prepared.add(element)
+        history.save_state(prepared.create_memento())
+
+    def undo_redo():
+        for i in range(10):
+            prepared.restore_from_memento(history.get_state_past())
+        for i in range(10):
+            prepared.restore_from_memento(history.get_state_future())
+
+    return undo_redo
+
+
+def ui_function(canvas_group, height=40, width=120):
+    return UIFunction(FakeWindow(height, width), FakeWindow(1, width), FakeWindow(1, width), FakeWindow(10, 10),
+                      FakeWindow(height, 20), {}, canvas_group, Group(transformer=transformer),
+                      Group(transformer=transformer))
+
+
+@benchmark
+def load_canvas(count):
+    """First load of the canvas, which evaluates the whole window"""
+    prepared = ui_function(canvas(count))
+    return prepared.load_canvas
+
+
+@benchmark
+def load_canvas_after_move(count):
+    """Load of the canvas after a single visible element was moved"""
+    prepared_canvas = canvas(count)
+    prepared = ui_function(prepared_canvas)
+    prepared.load_canvas()
+    element = prepared_canvas.elements[0]
+
+    def load():
+        prepared_canvas.remove(element)
+        element.move(1, 1)
+        prepared_canvas.add(element)
+        prepared.load_canvas()
+
+    return load
+
+
+@benchmark
+def load_canvas_offscreen_group(count):
+    """First load of the canvas with a group, whose center is visible and whose elements are out of the window"""
+    prepared_canvas = Canvas(transformer=transformer)
+    offscreen = group(count)
+    offscreen.move(0, 1000)
+    offscreen.x = 1
+    offscreen.y = 1
+    prepared_canvas.add(offscreen)
+    prepared = ui_function(prepared_canvas)
+    return prepared.load_canvas
+
+
+@benchmark
+def cell_selection(count):
+    """Selection of every element on its own, like pressing 5 on each cell, and the return to the canvas
+
+    The newest elements are selected first, which is the worst case for removing from a list.
+    """
+    prepared = ui_function(canvas(count))
+    cells = [(i % AREA_WIDTH, i // AREA_WIDTH) for i in reversed(range(count))]
+
+    def select():
+        for x, y in cells:
+            prepared.canvas_to_temp(x, y)
+        prepared.temp_to_canvas()
+
+    return select
+
+
+@benchmark
+def box_selection(count):
+    """Selection of all elements on the canvas with a rectangle"""
+    prepared = ui_function(canvas(count))
+    return lambda: prepared.region_to_temp([(0, 0), (AREA_WIDTH, count // AREA_WIDTH)])
+
+
+@benchmark
+def lasso_selection(count):
+    """Selection with a triangle covering half of the elements on the canvas"""
+    prepared = ui_function(canvas(count))
+    bottom = count // AREA_WIDTH
+    return lambda: prepared.region_to_temp([(0, 0), (AREA_WIDTH, 0), (AREA_WIDTH, bottom)], lasso=True)
+
+
+def measure(name, count, repeat):
+    """Times a benchmark with freshly prepared data for every repetition
+
+    Returns:
+        Dictionary with the result.
+    """
+    durations = []
+    for i in range(repeat):
+        operation = BENCHMARKS[name](count)
+        start = default_timer()
+        operation()
+        durations.append(default_timer() - start)
+
+    return {"name": name,
+            "count": count,
+            "repeat": repeat,
+            "min": min(durations),
+            "median": statistics.median(durations),
+            "max": max(durations)}
+
+
+def version():
+    """Commit of the measured code, None outside of a git repository"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names, scales, repeat):
+    results = []
+    for name in names:
+        for count in scales:
+            result = measure(name, count, repeat)
+            results.append(result)
+            print(f"{name:<24} {count:>8} elements: min {result['min'] * 1000:10.3f}ms, "
+                  f"median {result['median'] * 1000:10.3f}ms", file=sys.stderr)
+
+    return {"version": version(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": results}
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(description="Benchmarks of the backend and of loading the canvas.")
+    parser.add_argument("--max", type=int, default=SCALES[-1], help="largest number of elements")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of every measurement")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks to run")
+    parser.add_argument("--output", help="JSON file for the results, printed if omitted")
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    options = parse_arguments(sys.argv[1:])
+    report = run(options.only, [count for count in SCALES if count <= options.max], options.repeat)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
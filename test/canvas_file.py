@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+from backend.core import Element, Group, Canvas, InstanceGroup, Prototype
+from backend.canvas_file import save, load
+from backend.store import ElementStore
+from backend.transformer import CartesianTransformer
+from frontend.renderer import CanvasRenderer
+from test.fake_curses import FakeScreen
+
+transformer = CartesianTransformer()
+
+
+def describe(component):
+    if hasattr(component, "elements"):
+        return component.x, component.y, component.symbol, [describe(member) for member in component.elements]
+    return component.x, component.y, component.symbol, component.symbol_color
+
+
+# -----------------------------------------------
+print("SAVE AND LOAD TEST:")
+
+canvas = Canvas(transformer=transformer)
+canvas.add(Element(1, 2, transformer).set_symbol("X").set_symbol_color("red"))
+
+group = Group(transformer=transformer)
+group.x, group.y, group.symbol = 5, 5, "+"
+group.add(Element(4, 4, transformer).set_symbol("O"))
+
+nested = Group(transformer=transformer)
+nested.x, nested.y, nested.symbol = 8, 8, "+"
+nested.add(Element(9, 9, transformer).set_symbol("#"))
+group.add(nested)
+canvas.add(group)
+
+shape = Group(transformer=transformer)
+shape.x, shape.y = 1, 0
+shape.add(Element(0, 0, transformer).set_symbol("<"))
+shape.add(Element(2, 0, transformer).set_symbol(">"))
+instance = InstanceGroup(Prototype.get(shape), transformer)
+instance.move(20, 3)
+canvas.add(instance)
+
+path = os.path.join(tempfile.mkdtemp(), "drawing.cad")
+save(canvas, path)
+print("File size:", os.path.getsize(path), "bytes")
+
+loaded = load(path, transformer)
+print("Saved: ", [describe(component) for component in canvas.elements])
+print("Loaded:", [describe(component) for component in loaded.elements])
+print("Elements directly on the canvas are in a store:", len(loaded.store))
+
+# -----------------------------------------------
+print()
+print("CHANGE AND SAVE AGAIN TEST:")
+
+loaded.move(1, 1)
+save(loaded, path)
+print("Loaded after move:", [describe(component) for component in load(path, transformer).elements])
+
+# -----------------------------------------------
+print()
+print("ORDER OF OVERLAPPING ELEMENTS TEST:")
+
+
+def overlapping_canvas(store):
+    """Elements on the same cells, in groups nested between elements and directly on the canvas"""
+    def group_of(*members):
+        group = Group(transformer=transformer)
+        group.x, group.y, group.symbol = 0, 0, "+"
+        group.add_many(members)
+        return group
+
+    def element(symbol, cell=3):
+        return Element(cell, cell, transformer).set_symbol(symbol)
+
+    canvas = Canvas(transformer=transformer, store=ElementStore() if store else None)
+    canvas.add(element("a"))
+    canvas.add(group_of(group_of(group_of(element("b"))), element("c")))
+    canvas.add(element("d"))
+    canvas.add(group_of(element("e", 5), group_of(element("f", 5)), element("g", 5), group_of(element("h", 5))))
+    return canvas
+
+
+def drawn(canvas):
+    screen = FakeScreen(10, 20)
+    with screen.install():
+        renderer = CanvasRenderer(screen.newwin(10, 20), canvas)
+        renderer.render()
+    return renderer.drawn[(3, 3)][0] + renderer.drawn[(5, 5)][0]
+
+
+for store in (False, True):
+    canvas = overlapping_canvas(store)
+    save(canvas, path)
+    loaded = load(path, transformer)
+    print("With store:" if store else "Without store:", [describe(component) for component in loaded.elements])
+    print("Same order:", [describe(component) for component in canvas.elements] ==
+          [describe(component) for component in loaded.elements],
+          "drawn:", drawn(canvas), drawn(loaded), "loaded with store:", loaded.store is not None)
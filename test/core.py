@@ -1,5 +1,5 @@
-from backend.core import Element, Group, Canvas
-from backend.memento import History
+from backend.core import Element, Group, Canvas, UNMEASURED
+from backend.memento import BLOCK_SIZE, History, capture, restore
 from backend.transformer import CartesianTransformer
 
 transformer = CartesianTransformer()
@@ -137,3 +137,154 @@ if next_state:
     canvas.restore_from_memento(next_state)
 print()
 print("FORWARDED Elements on canvas: ", canvas.elements)
+
+# -----------------------------------------------
+print()
+print("CANVAS INDEX TEST:")
+
+canvas = Canvas(transformer=transformer)
+for x, y in [(1, 1), (1, 1), (2, 1), (5, 5)]:
+    canvas.add(Element(x, y))
+
+print("Elements at 1,1: ", canvas.elements_at(1, 1))
+print("Elements in 0,0 to 2,2: ", canvas.elements_in(0, 0, 2, 2))
+
+canvas.move(3, 4)
+print("Elements at 1,1 after move: ", canvas.elements_at(1, 1))
+print("Elements at 4,5 after move: ", canvas.elements_at(4, 5))
+print("Elements within 3,3 8,3 8,9: ", canvas.elements_within([(3, 3), (8, 3), (8, 9)]))
+print("Elements on the line 4,5 8,9: ", canvas.elements_within([(4, 5), (8, 9)]))
+print("Elements within the corner 5,5: ", canvas.elements_within([(5, 5)]))
+
+# -----------------------------------------------
+print()
+print("HISTORY OF DIRECT CHANGES TEST:")
+
+transformer.set_reference(0, 0)
+canvas = Canvas(transformer=transformer)
+history = History()
+inner = Group(transformer=transformer)
+inner.add(Element(7, 7))
+group = Group(transformer=transformer)
+group.add(Element(1, 1))
+group.add(inner)
+canvas.add(group)
+canvas.add(Element(2, 2))
+history.save_state(canvas.create_memento())
+
+group.move(5, 5)
+history.save_state(canvas.create_memento())
+inner.move(1, 0)
+history.save_state(canvas.create_memento())
+
+canvas.restore_from_memento(history.get_state_past())
+print("Undo of the move in the nested group: ", (group.x, group.y), (inner.elements[0].x, inner.elements[0].y))
+canvas.restore_from_memento(history.get_state_past())
+print("Undo of the move of the group: ", (group.x, group.y), (group.elements[0].x, group.elements[0].y),
+      (inner.elements[0].x, inner.elements[0].y))
+canvas.restore_from_memento(history.get_state_future())
+print("Redo: ", (group.x, group.y), (inner.elements[0].x, inner.elements[0].y))
+
+# -----------------------------------------------
+print()
+print("HISTORY ACROSS BLOCKS TEST:")
+
+# removing an element shifts the following ones into the previous block, undo moves them back
+canvas = Canvas(transformer=transformer)
+elements = [canvas.add(Element(i, 0)) for i in range(BLOCK_SIZE + 44)]
+history = History()
+history.save_state(canvas.create_memento())
+canvas.remove(elements[5])
+history.save_state(canvas.create_memento())
+canvas.restore_from_memento(history.get_state_past())
+canvas.move(1, 1)
+history.save_state(canvas.create_memento())
+canvas.restore_from_memento(history.get_state_past())
+canvas.remove(elements[220])
+print("Removed after undo: ", len(canvas.elements), elements[220] not in canvas.elements,
+      "first element: ", (canvas.elements[0].x, canvas.elements[0].y))
+
+# -----------------------------------------------
+print()
+print("BOUNDING BOX TEST:")
+
+transformer.set_reference(0, 0)
+inner = Group(transformer=transformer)
+inner.add(Element(10, 10))
+outer = Group(transformer=transformer)
+outer.add(Element(0, 0))
+outer.add(Element(4, 2))
+outer.add(inner)
+print("Bounds: ", outer.bounds())
+
+outer.add(Element(-3, 1))
+print("Bounds after add: ", outer.bounds())
+
+outer.move(1, 1)
+outer.mirror("x")
+print("Bounds after move and mirror: ", outer.bounds(), "inner: ", inner.bounds())
+
+outer.rotate(90)
+print("Bounds after rotate by 90 are transformed: ", outer._bounds is not UNMEASURED,
+      [round(value, 6) for value in outer.bounds()])
+
+outer.rotate(30)
+measured = outer.bounds()
+outer.invalidate_bounds()
+print("Bounds after rotate equal measured bounds: ", measured == outer.bounds())
+
+print("Overlaps 0,0 to 5,5: ", outer.overlaps(0, 0, 5, 5), "overlaps 50,50 to 60,60: ", outer.overlaps(50, 50, 60, 60))
+
+canvas = Canvas(transformer=transformer)
+canvas.add(Element(1, 1))
+canvas.add(outer)
+print("Canvas bounds: ", [round(value, 6) for value in canvas.bounds()])
+canvas.remove(outer)
+print("Canvas bounds after remove: ", canvas.bounds())
+
+# -----------------------------------------------
+print()
+print("NESTED GROUP TEST:")
+
+outer = Group(transformer=transformer)
+group = outer
+for level in range(5000):
+    group.add(Element(level, 0))
+    nested = Group(transformer=transformer)
+    group.add(nested)
+    group = nested
+innermost = Element(1, 1)
+group.add(innermost)
+
+outer.move(1, 2)
+outer.scale(2, 2)
+print("Pending matrix of the first nested group: ", outer.elements[1].pending is not None,
+      "innermost element before resolve: ", innermost.x, innermost.y)
+outer.resolve()
+print("Innermost element after resolve: ", innermost.x, innermost.y)
+print("Bounds of 5000 levels: ", outer.bounds())
+group.add(Element(-5, 50))
+print("Bounds after adding to the innermost group: ", outer.bounds())
+
+state = capture(outer)
+outer.move(-2, -4)
+restore(outer, state)
+outer.resolve()
+print("Innermost element after restore: ", innermost.x, innermost.y)
+
+# -----------------------------------------------
+print()
+print("BULK MEMBERSHIP TEST:")
+
+elements = [Element(x, x) for x in range(10)]
+group = Group(transformer=transformer)
+group.add_many(elements[:6])
+print("Added again are skipped: ", len(group.add_many(elements[4:8])), len(group.elements))
+print("Removed: ", len(group.remove_many(elements[::2] + [Element(0, 0)])),
+      "left: ", [element.x for element in group.elements], elements[1] in group, elements[0] in group)
+
+canvas = Canvas(transformer=transformer)
+moved = group.move_to(canvas, elements[1:4])
+print("Moved to canvas: ", len(moved), "left in group: ", [element.x for element in group.elements],
+      "on canvas: ", [element.x for element in canvas.elements], "at 3,3: ", len(canvas.elements_at(3, 3)))
+print("Canvas bounds: ", canvas.bounds())
@@ -0,0 +1,73 @@
+"""Commands in a worker thread while the terminal stays responsive
+
+    python -m test.event_loop
+"""
+
+import time
+
+from backend.core import Element, Group
+from frontend.event_loop import CommandRunner
+from frontend.initial_data import canvas, transformer
+from frontend.ui_function import UIFunction
+from frontend.window_creator import WindowCreator
+from test.fake_curses import FakeScreen
+
+# -----------------------------------------------
+print("RUNNER TEST:")
+
+screen = FakeScreen(30, 100)
+prompt_in = screen.newwin(1, 80)
+input_in = screen.newwin(1, 80)
+runner = CommandRunner(prompt_in, input_in, frame_rate=50)
+
+with screen.install():
+    print("Short command:", runner.run(lambda a, b: a + b, 1, 2), "frames:", runner.frames)
+
+    screen.press("a", "b", "c")
+    screen.send("line")
+    print("Slow command:", runner.run(lambda: time.sleep(0.3) or "done"), "frames > 5:", runner.frames > 5)
+    print("Progress:", prompt_in.text()[0].strip()[2:12])
+    print("Keys given back in order:", [chr(screen.next_key()) for key in range(3)], screen.next_line())
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError("failed in the worker")
+
+    try:
+        runner.run(fail)
+    except ValueError as error:
+        print("Exception raised again:", error)
+
+# -----------------------------------------------
+print()
+print("MOVE OF A LARGE GROUP TEST:")
+
+# a group at 30,10 with elements outside of the window, so drawing costs nothing
+group = Group(transformer=transformer)
+group.x, group.y = 30, 10
+group.add(Element(30, 10, transformer).set_symbol("X"))
+for i in range(300000):
+    group.add(Element(1000 + i % 1000, 1000 + i // 1000, transformer).set_symbol("X"))
+canvas.clear()
+canvas.add(group)
+
+screen = FakeScreen(30, 100)
+window_creator = WindowCreator(30, 100)
+window_creator.calculate_split()
+ui_function = UIFunction(screen.newwin(20, 80), screen.newwin(1, 80), screen.newwin(1, 80), screen.newwin(10, 10),
+                         screen.newwin(20, 20), window_creator.position_tools_content(), canvas,
+                         Group(transformer=transformer), Group(transformer=transformer))
+screen.press(*["6"] * 4, *["2"] * 4, "5", "7")
+screen.send("1,1")
+# the next command is typed while the group is moved
+screen.press(*b"q\n")
+
+with screen.install():
+    ui_function.move()
+    typed = screen.stdscr.getstr()
+
+print("Group moved:", (group.x, group.y), (group.elements[0].x, group.elements[0].y))
+print("Progress frames while moving:", ui_function.runner.frames > 0,
+      "at most 20 per second:", ui_function.runner.frames <= ui_function.runner.duration * 20 + 1)
+print("Typed during the move:", typed)
+print("Canvas drawn after the move:", ui_function.canvas_in.symbol_at(11, 31))
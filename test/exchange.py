@@ -0,0 +1,54 @@
+import io
+
+from backend.core import Element, Group, Canvas
+from backend.exchange import export_rows, import_rows, write_jsonl, read_jsonl, write_csv, read_csv
+from backend.store import ElementStore
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+
+
+def describe(component):
+    if hasattr(component, "elements"):
+        return component.x, component.y, component.symbol, [describe(member) for member in component.elements]
+    return component.x, component.y, component.symbol, component.symbol_color
+
+
+canvas = Canvas(transformer=transformer)
+canvas.add(Element(1, 2, transformer).set_symbol("X").set_symbol_color("red"))
+
+group = Group(transformer=transformer)
+group.x, group.y, group.symbol = 5, 5, "+"
+group.add(Element(4, 4, transformer).set_symbol(","))
+
+nested = Group(transformer=transformer)
+nested.x, nested.y, nested.symbol = 8, 8, "+"
+nested.add(Element(9, 9, transformer).set_symbol('"'))
+group.add(nested)
+canvas.add(group)
+
+# -----------------------------------------------
+print("JSON LINES TEST:")
+
+file = io.StringIO()
+print("Written rows:", write_jsonl(file, export_rows(canvas)))
+print(file.getvalue())
+
+file.seek(0)
+imported = Canvas(transformer=transformer)
+print("Imported rows:", import_rows(imported, read_jsonl(file)))
+print("Exported:", [describe(component) for component in canvas.elements])
+print("Imported:", [describe(component) for component in imported.elements])
+
+# -----------------------------------------------
+print()
+print("CSV TEST:")
+
+file = io.StringIO(newline="")
+print("Written rows:", write_csv(file, export_rows(canvas)))
+print(file.getvalue())
+
+file.seek(0)
+imported = Canvas(transformer=transformer, store=ElementStore())
+print("Imported rows into a canvas with store:", import_rows(imported, read_csv(file), chunk_size=1))
+print("Imported:", [describe(component) for component in imported.elements])
@@ -0,0 +1,260 @@
+"""In-memory replacement for curses
+
+The frontend only needs a terminal for its windows and for the user input. A FakeWindow keeps the written content
+in a buffer of cells and a FakeScreen replaces the curses module: it creates the windows, hands out prepared user
+input and records every refreshed frame. This way Application.mainloop and UIFunction can be driven, tested and
+benchmarked without a TTY.
+
+    screen = FakeScreen(40, 120)
+    screen.send("m")                    # line for getstr(), here the move command
+    screen.press("5", "7")              # keys for getch(), here select and escape
+    screen.send("1,1", "q")
+    with screen.install():
+        Application.mainloop(screen.stdscr)
+
+When the prepared input is used up, getstr() returns "q" and getch() returns "7", so the application ends.
+"""
+
+import curses
+from collections import deque
+from contextlib import contextmanager
+from timeit import default_timer
+
+# modules which use curses directly
+FRONTEND_MODULES = ("main", "frontend.ui_function", "frontend.renderer", "frontend.event_loop")
+
+
+class FakeWindow:
+    """Window with a buffer of cells instead of a terminal
+
+    Attributes:
+        height (int): Number of lines.
+        width (int): Number of columns.
+        screen (FakeScreen/None): Screen which provides the input and records the frames.
+        cells (dictionary): Symbol and attribute of every written cell keyed on (y, x).
+        cursor (tuple): Position of the cursor as (y, x).
+        refreshes (int): Number of calls of refresh().
+        written (int): Number of bytes written since the creation of the window.
+        pending (int): Number of bytes written since the last refresh.
+        delay (bool): getch() waits for a key, without delay it returns -1 if the next input is not a key.
+    """
+
+    def __init__(self, height, width, screen=None):
+        self.height = height
+        self.width = width
+        self.screen = screen
+        self.cells = {}
+        self.cursor = (0, 0)
+        self.refreshes = 0
+        self.written = 0
+        self.pending = 0
+        self.delay = True
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def move(self, y, x):
+        self.cursor = (y, x)
+
+    def addstr(self, y, x, text, attribute=0):
+        text = str(text)
+        for offset, symbol in enumerate(text):
+            self.cells[(y, x + offset)] = (symbol, attribute)
+        self.cursor = (y, x + len(text))
+
+        size = len(text.encode("utf-8"))
+        self.written += size
+        self.pending += size
+
+    def addch(self, y, x, symbol, attribute=0):
+        self.addstr(y, x, symbol, attribute)
+
+    def border(self):
+        pass
+
+    def erase(self):
+        self.cells.clear()
+
+    def clear(self):
+        self.cells.clear()
+
+    def refresh(self):
+        self.refreshes += 1
+        if self.screen is not None:
+            self.screen.refreshed(self.pending)
+        self.pending = 0
+
+    def nodelay(self, flag):
+        self.delay = not flag
+
+    def getch(self):
+        if not self.delay:
+            return self.screen.typed_key()
+        return self.screen.next_key()
+
+    def getstr(self, y=None, x=None):
+        if y is not None:
+            self.move(y, x)
+        if self.screen.inputs and isinstance(self.screen.inputs[0], int):
+            return self.screen.typed_line()
+        return self.screen.next_line()
+
+    def symbol_at(self, y, x):
+        return self.cells.get((y, x), (" ", 0))[0]
+
+    def text(self):
+        """Content of the window as a list of lines"""
+        lines = [[" "] * self.width for line in range(self.height)]
+        for (y, x), (symbol, attribute) in self.cells.items():
+            if 0 <= y < self.height and 0 <= x < self.width:
+                lines[y][x] = symbol
+        return ["".join(line) for line in lines]
+
+
+class FakeScreen:
+    """Replacement for the curses module with prepared user input
+
+    The input is kept in a single queue like the input of a terminal. Lines are read by getstr(), keys by getch().
+    Keys typed ahead of a getstr() are read up to a newline, like in a terminal.
+
+    Attributes:
+        stdscr (FakeWindow): The whole screen, as passed by curses.wrapper().
+        windows (List[FakeWindow]): Windows created with newwin().
+        inputs (deque): Prepared keys (int) and lines (bytes).
+        frames (List[int]): Number of bytes written to a window before each of its refreshes, in refresh order.
+        beeps (int): Number of calls of beep().
+        latencies (List[tuple]): Every read input together with the time until the next input was requested, which
+        is the time the application needed to process it.
+        last_input (int/bytes/None): The input read last.
+        last_read (float/None): Time of reading the last input.
+    """
+
+    A_NORMAL = curses.A_NORMAL
+    A_REVERSE = curses.A_REVERSE
+    A_STANDOUT = curses.A_STANDOUT
+    COLOR_WHITE = curses.COLOR_WHITE
+    COLOR_BLUE = curses.COLOR_BLUE
+    ACS_RARROW = ">"
+    ACS_DARROW = "v"
+
+    def __init__(self, height, width):
+        self.frames = []
+        self.inputs = deque()
+        self.beeps = 0
+        self.latencies = []
+        self.last_input = None
+        self.last_read = None
+        self.windows = []
+        self.stdscr = FakeWindow(height, width, self)
+
+    def send(self, *lines):
+        """Prepares lines read by getstr()"""
+        self.inputs.extend(line.encode("utf-8") for line in lines)
+
+    def press(self, *keys):
+        """Prepares keys read by getch(), keys are characters or curses key codes"""
+        self.inputs.extend(ord(key) if isinstance(key, str) else key for key in keys)
+
+    def next_input(self, default):
+        now = default_timer()
+        if self.last_input is not None:
+            self.latencies.append((self.last_input, now - self.last_read))
+        self.last_read = now
+
+        self.last_input = self.inputs.popleft() if self.inputs else default
+        return self.last_input
+
+    def next_key(self):
+        key = self.next_input(ord("7"))
+        if not isinstance(key, int):
+            raise ValueError(f"expected a key for getch(), found the line {key!r}")
+        return key
+
+    def refreshed(self, written):
+        """Records the frame of a refreshed window with the number of bytes written for it"""
+        self.frames.append(written)
+
+    def typed_key(self):
+        """The next key if it is already typed, -1 otherwise
+
+        Reading without delay doesn't end the processing of the last input, so no latency is recorded.
+        """
+        if self.inputs and isinstance(self.inputs[0], int):
+            return self.inputs.popleft()
+        return -1
+
+    def typed_line(self):
+        """Line of the keys typed up to the next newline, the newline is removed"""
+        keys = []
+        key = self.next_key()
+        while key != ord("\n"):
+            keys.append(key)
+            key = self.next_key()
+        return bytes(keys)
+
+    def ungetch(self, key):
+        """Puts a key back in front of the input"""
+        self.inputs.appendleft(ord(key) if isinstance(key, str) else key)
+
+    def next_line(self):
+        line = self.next_input(b"q")
+        if not isinstance(line, bytes):
+            raise ValueError(f"expected a line for getstr(), found the key {line!r}")
+        return line
+
+    def newwin(self, nlines, ncols, begin_y=0, begin_x=0):
+        window = FakeWindow(nlines, ncols, self)
+        self.windows.append(window)
+        return window
+
+    def beep(self):
+        self.beeps += 1
+
+    def wrapper(self, function, *args, **kwargs):
+        return function(self.stdscr, *args, **kwargs)
+
+    def start_color(self):
+        pass
+
+    def use_default_colors(self):
+        pass
+
+    def init_pair(self, pair_number, foreground, background):
+        pass
+
+    def echo(self):
+        pass
+
+    def noecho(self):
+        pass
+
+    def cbreak(self):
+        pass
+
+    def nocbreak(self):
+        pass
+
+    @property
+    def refreshes(self):
+        return len(self.frames)
+
+    @property
+    def written(self):
+        return sum(self.frames)
+
+    @contextmanager
+    def install(self, modules=FRONTEND_MODULES):
+        """Replaces curses in the frontend modules with this screen while the context is active
+
+        Args:
+            modules (Iterable[str]): Names of the modules using curses, they are imported if necessary.
+        """
+        imported = [__import__(name, fromlist=["curses"]) for name in modules]
+        originals = [module.curses for module in imported]
+        for module in imported:
+            module.curses = self
+        try:
+            yield self
+        finally:
+            for module, original in zip(imported, originals):
+                module.curses = original
@@ -0,0 +1,91 @@
+from backend.core import Element, Group, Canvas, InstanceGroup, Prototype
+from backend.transformer import CartesianTransformer
+from frontend.command import MoveCommand, ScaleCommand
+
+transformer = CartesianTransformer()
+
+
+def coordinates(group):
+    return [(round(element.x, 6), round(element.y, 6), element.symbol) for element in group.elements]
+
+
+shape = Group(transformer=transformer)
+shape.x = 1
+shape.y = 1
+shape.add(Element(0, 0, transformer).set_symbol("X"))
+shape.add(Element(2, 0, transformer).set_symbol("O"))
+shape.add(Element(1, 2, transformer).set_symbol("#"))
+
+# -----------------------------------------------
+print("PROTOTYPE TEST:")
+
+prototype = Prototype.get(shape)
+print("Shared prototype:", Prototype.get(shape) is prototype, "elements:", len(prototype))
+
+# -----------------------------------------------
+print()
+print("INSTANCE TEST:")
+
+first = InstanceGroup(prototype, transformer)
+second = InstanceGroup(prototype, transformer)
+print("Center:", first.x, first.y, "elements:", coordinates(first))
+
+first.move(10, 5)
+first.rotate(90)
+print("First after move and rotate:", round(first.x, 6), round(first.y, 6), coordinates(first))
+print("First placement:", tuple(round(value, 6) for value in first.placement), "instanced:", first.instanced)
+print("Second unchanged:", coordinates(second), "shape unchanged:", coordinates(shape))
+
+transformer.set_reference(0, 0)
+nested = Group(transformer=transformer)
+nested.add(second)
+nested.mirror("x")
+print("Second mirrored in a group:", coordinates(second))
+
+# -----------------------------------------------
+print()
+print("MATERIALIZE TEST:")
+
+first.elements[0].set_symbol("@")
+print("First after changing an element:", coordinates(first), "instanced:", first.instanced)
+first.move(1, 1)
+print("First after move:", coordinates(first))
+print("Prototype unchanged:", coordinates(InstanceGroup(prototype, transformer)))
+
+# -----------------------------------------------
+print()
+print("CANVAS TEST:")
+
+canvas = Canvas(transformer=transformer)
+instance = InstanceGroup(prototype, transformer)
+canvas.add(instance)
+memento = canvas.create_memento()
+
+command = MoveCommand(instance, 3, 3)
+command.execute()
+print("After move command:", coordinates(instance))
+command.undo()
+print("After undo:", coordinates(instance), "instanced:", instance.instanced)
+
+command = ScaleCommand(instance, 0, 1)
+command.execute()
+canvas.update(command.targets)
+print("After scale with factor 0:", coordinates(instance), "instanced:", instance.instanced)
+command.undo()
+print("After undo:", coordinates(instance))
+
+canvas.restore_from_memento(memento)
+print("After restoring the memento:", coordinates(instance), "instanced:", instance.instanced)
+
+# -----------------------------------------------
+print()
+print("MOVE TO TEST:")
+
+instance = InstanceGroup(prototype, transformer)
+instance.move(5, 0)
+target = Group(transformer=transformer)
+moved = instance.move_to(target, instance.elements[:2])
+print("Moved out of the instance:", [(element.x, element.y, element.symbol) for element in moved],
+      "instanced:", instance.instanced)
+print("Left in the instance:", coordinates(instance), "in the target:", coordinates(target))
+print("Moved back:", len(target.move_to(instance, target.elements)), coordinates(instance))
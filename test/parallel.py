@@ -0,0 +1,62 @@
+import numpy as np
+
+from backend.core import Canvas
+from backend.parallel import ShardPool
+from backend.store import ElementStore
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer().set_reference(3, 4)
+
+# -----------------------------------------------
+print("PARALLEL TRANSFORMATION TEST:")
+
+pool = ShardPool(processes=2, threshold=1000, shards=3)
+xs = np.arange(5000, dtype=float)
+ys = np.arange(5000, dtype=float) * 2
+
+serial = Canvas(transformer=transformer, store=ElementStore())
+parallel = Canvas(transformer=transformer, store=ElementStore().share(pool))
+for canvas in (serial, parallel):
+    canvas.add_columns(xs, ys, symbol="X")
+    canvas.store.release(10)
+    canvas.move(1, 2)
+    canvas.rotate(30)
+    canvas.mirror("x")
+    canvas.scale(2, 0.5)
+    canvas.fill("symbol", "#")
+
+print("Columns in shared memory:", all(pool.shared(getattr(parallel.store, column))
+                                       for column in ElementStore.columns))
+print("Workers started:", pool.pool is not None)
+print("Same coordinates:", np.allclose(serial.store.xs[serial.store.alive], parallel.store.xs[parallel.store.alive]),
+      np.allclose(serial.store.ys[serial.store.alive], parallel.store.ys[parallel.store.alive]))
+print("Same symbols:", [element.symbol for element in serial.elements[:3]],
+      [element.symbol for element in parallel.elements[:3]])
+print("Released row unchanged:", parallel.store.symbols[10] == parallel.store.strings.code("X"),
+      parallel.store.xs[10:11].tolist() + parallel.store.ys[10:11].tolist())
+
+# -----------------------------------------------
+print()
+print("RELEASED ROW TEST:")
+
+canvas = Canvas(transformer=transformer, store=ElementStore().share(pool))
+canvas.add_columns(xs, ys)
+deleted = canvas.elements_at(5, 10)[0]
+canvas.remove(deleted)
+canvas.move(100, 0)
+canvas.add(deleted)
+print("Deleted element added after a parallel move:", (deleted.x, deleted.y), "others moved:",
+      canvas.elements_at(106, 12) != [])
+
+# -----------------------------------------------
+print()
+print("SMALL STORE TEST:")
+
+small = Canvas(transformer=transformer, store=ElementStore().share(ShardPool(processes=2)))
+small.add_columns([1, 2], [3, 4])
+small.move(1, 1)
+print("Below the threshold without workers:", small.store.pool.pool is None, small.store.xs.tolist())
+
+small.store.pool.close()
+pool.close()
+print("Shared memory freed:", not pool.blocks)
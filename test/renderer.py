@@ -0,0 +1,82 @@
+"""Incremental frames of the CanvasRenderer compared with a full render of the same canvas
+
+    python -m test.renderer
+"""
+
+import gc
+import random
+
+from backend.core import Canvas, Element, Group
+from backend.store import ElementStore
+from backend.transformer import CartesianTransformer
+from frontend.renderer import CanvasRenderer
+from test.fake_curses import FakeScreen
+
+transformer = CartesianTransformer()
+
+
+def edit(canvas, renderer, seed):
+    """Adds, removes and moves components on a few cells, so they cover each other, and renders after every step"""
+    generator = random.Random(seed)
+    for step in range(40):
+        components = canvas.elements
+        choice = generator.random()
+        if choice < 0.3 and components:
+            canvas.remove(generator.choice(components))
+        elif choice < 0.5:
+            group = Group(transformer=transformer)
+            group.x, group.y, group.symbol = generator.randrange(4), generator.randrange(4), str(step % 10)
+            group.add(Element(generator.randrange(4), generator.randrange(4), transformer).set_symbol("g"))
+            canvas.add(group)
+        elif choice < 0.8:
+            canvas.add(Element(generator.randrange(4), generator.randrange(4), transformer).set_symbol(chr(97 + step)))
+        elif components:
+            component = generator.choice(components)
+            component.x = generator.randrange(4)
+            canvas.update([component])
+        # views of the store are only referenced by the renderer now
+        del components
+        gc.collect()
+        renderer.render()
+
+
+def compare(store, trials=20):
+    differing = 0
+    for seed in range(trials):
+        screen = FakeScreen(10, 20)
+        with screen.install():
+            canvas = Canvas(transformer=transformer, store=ElementStore() if store else None)
+            renderer = CanvasRenderer(screen.newwin(10, 20), canvas)
+            edit(canvas, renderer, seed)
+            full = CanvasRenderer(screen.newwin(10, 20), canvas)
+            full.render()
+        differing += renderer.drawn != full.drawn
+    return differing
+
+
+# -----------------------------------------------
+print("INCREMENTAL FRAME TEST:")
+
+print("Trials differing from a full render, canvas with store:", compare(store=True),
+      "without store:", compare(store=False))
+
+# -----------------------------------------------
+print()
+print("OVERLAPPING COMPONENTS TEST:")
+
+screen = FakeScreen(10, 20)
+with screen.install():
+    canvas = Canvas(transformer=transformer)
+    renderer = CanvasRenderer(screen.newwin(10, 20), canvas)
+    renderer.render()
+    first = canvas.add(Element(1, 1, transformer).set_symbol("A"))
+    second = canvas.add(Element(1, 1, transformer).set_symbol("B"))
+    renderer.render()
+    print("Added last is on top:", renderer.drawn[(1, 1)][0])
+    first.x = 1.2
+    canvas.update([first])
+    renderer.render()
+    print("Moving keeps the order:", renderer.drawn[(1, 1)][0])
+    canvas.remove(second)
+    renderer.render()
+    print("After removing the top one:", renderer.drawn[(1, 1)][0])
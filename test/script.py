@@ -0,0 +1,60 @@
+"""Scripts executed headless by the ScriptEngine
+
+    python -m test.script
+"""
+
+from backend.core import Canvas, Element, Group
+from backend.transformer import CartesianTransformer
+from frontend.script import ScriptEngine
+
+transformer = CartesianTransformer()
+
+
+class CountingGroup(Group):
+    """Group counting the matrices applied to its elements"""
+
+    applies = 0
+
+    def apply(self, matrix):
+        CountingGroup.applies += 1
+        super().apply(matrix)
+
+
+def engine_with_elements(count):
+    canvas = Canvas(transformer=transformer)
+    for i in range(count):
+        canvas.add(Element(i, 0, transformer).set_symbol("X"))
+    engine = ScriptEngine(canvas, transformer)
+    engine.selection = CountingGroup(transformer=transformer)
+    engine.selection.set_deferred(True)
+    return engine
+
+
+# -----------------------------------------------
+print("SCRIPT TEST:")
+
+engine = engine_with_elements(3)
+executed = engine.run(["# moves the first two elements", "select 0 0 1 0", "", "move 2 1", "reference 0 0",
+                       "rotate 90", "release", "add 9 9 #"])
+print("Executed:", executed, "canvas:", [(round(element.x, 6), round(element.y, 6), element.symbol)
+                                         for element in engine.canvas.elements])
+
+engine = engine_with_elements(3)
+engine.run(["select 0 0 2 0", "move 1e1 -2.5E-1", "scale 1.5 1"])
+print("Exponent literals:", [(element.x, element.y) for element in engine.canvas.elements])
+
+for line in ["move 1", "move 1 nan"]:
+    try:
+        engine.run([line])
+    except ValueError as error:
+        print("Error:", error)
+
+# -----------------------------------------------
+print()
+print("COMPOSED TRANSFORMATIONS TEST:")
+
+engine = engine_with_elements(1000)
+CountingGroup.applies = 0
+engine.run(["select 0 0 999 0"] + ["move 1 0"] * 50 + ["mirror y", "scale 2 1"])
+print("Applies for 52 transformations:", CountingGroup.applies,
+      "last element:", (engine.canvas.elements[-1].x, engine.canvas.elements[-1].y))
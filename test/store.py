@@ -0,0 +1,62 @@
+from backend.core import Element, Group, Canvas, Style
+from backend.store import INDEX_AFTER_LOOKUPS, ElementStore
+from backend.transformer import CartesianTransformer
+
+transformer = CartesianTransformer()
+
+# -----------------------------------------------
+print("STORE TEST:")
+
+store = ElementStore()
+rows = store.extend(xs=[1, 2, 3], ys=[1, 2, 3], symbol="X")
+print("Rows", list(rows), "xs", store.xs, "ys", store.ys)
+
+view = store.view(rows[0]).set_symbol("#")
+print(view.x, view.y, view.symbol, store.strings.values)
+
+copy = Element(0, 0, transformer)
+copy.style = view.style
+view.style = Element(0, 0, transformer).set_symbol("O").set_symbol_color("red").style
+print("Style of a view:", copy.symbol, copy.style is Style.get("#"), "written to the columns:", view.symbol,
+      view.symbol_color, "no dictionary:", not hasattr(view, "__dict__"))
+
+# -----------------------------------------------
+print()
+print("CANVAS WITH STORE TEST:")
+
+canvas = Canvas(transformer=transformer, store=store)
+canvas.add(Element(4, 4).set_symbol("@"))
+
+group = Group(transformer=transformer)
+group.add(Element(5, 5))
+canvas.add(group)
+
+print("Elements on canvas: ", canvas.elements)
+
+canvas.move(1, 1)
+print("After move", [(element.x, element.y) for element in canvas.elements])
+print("After move group element", group.elements[0].x, group.elements[0].y)
+
+selected = canvas.elements_at(2, 2)
+print("Selected at 2,2", selected)
+
+canvas.remove(selected[0])
+print("After remove", [(element.x, element.y) for element in canvas.elements])
+
+canvas.add(selected[0])
+print("After add", [(element.x, element.y) for element in canvas.elements])
+
+# -----------------------------------------------
+print()
+print("STORE INDEX TEST:")
+
+store = ElementStore()
+store.extend(xs=[1, 1.2, 2, 5], ys=[1, 0.8, 1, 5])
+store.release(1)
+for lookup in range(INDEX_AFTER_LOOKUPS - 1):
+    scanned = store.rows_at(1, 1)
+print("Scanned at 1,1:", scanned.tolist(), "index built:", store.cells is not None)
+print("Indexed at 1,1:", store.rows_at(1, 1).tolist(), "in 0,0 to 2,2:", store.rows_in(0, 0, 2, 2).tolist(),
+      "index built:", store.cells is not None)
+store.view(3).x = 1
+print("Index dropped after a move:", store.cells is None, "in 0,0 to 2,5:", store.rows_in(0, 0, 2, 5).tolist())
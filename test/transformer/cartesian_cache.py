@@ -0,0 +1,30 @@
+from backend.transformer import CartesianTransformer
+
+cartesian_transformer = CartesianTransformer(cache_size=2).set_reference(5, 5)
+
+points_x = [10, 11, 12, 13, 14]
+points_y = [10, 10, 10, 10, 10]
+
+new_points = [cartesian_transformer.apply(x, y, cartesian_transformer.cached_coefficients("rotate", 90))
+              for x, y in zip(points_x, points_y)]
+
+print("rotate 5 points around 5,5 with one cached matrix")
+print("new points:", [(round(x, 6), round(y, 6)) for x, y in new_points])
+print("hits:", cartesian_transformer.cache_hits, "misses:", cartesian_transformer.cache_misses)
+
+cartesian_transformer.cached_matrix("mirror", "x")
+cartesian_transformer.cached_matrix("scale", 2, 2)
+cartesian_transformer.cached_matrix("rotate", 90)
+
+print("rotate matrix dropped by the least recently used mirror and scale")
+print("hits:", cartesian_transformer.cache_hits, "misses:", cartesian_transformer.cache_misses,
+      "cached:", list(cartesian_transformer.cache))
+
+cartesian_transformer.set_reference(0, 0)
+cartesian_transformer.cached_matrix("rotate", 90)
+
+print("another reference point needs another matrix")
+print("hits:", cartesian_transformer.cache_hits, "misses:", cartesian_transformer.cache_misses)
+
+print("single points are rotated without the cache:", cartesian_transformer.rotate(10, 10, 90),
+      "cached:", len(cartesian_transformer.cache))
@@ -0,0 +1,18 @@
+from backend.transformer import CartesianTransformer
+from test.matplotlib_settings import *
+
+cartesian_transformer = CartesianTransformer().set_reference(5, 5)
+
+points_x = [10, 11, 12, 13, 14]
+points_y = [10, 10, 10, 10, 10]
+
+new_xs, new_ys = cartesian_transformer.transform_many(xs=points_x, ys=points_y,
+                                                      matrix=cartesian_transformer.rotate_matrix(90))
+
+print("rotate many around 5,5")
+print("original xs,ys:", points_x, points_y,
+      "new xs,ys:", new_xs, new_ys)
+
+ax.scatter(points_x, points_y, color='blue')
+ax.scatter(new_xs, new_ys, color='red')
+plt.show()
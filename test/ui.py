@@ -0,0 +1,75 @@
+"""Drives the application without a terminal
+
+The user input is prepared in a FakeScreen, which replaces curses. After the application has finished, the content
+of the canvas window and the recorded frames are printed.
+
+    python -m test.ui
+"""
+
+from main import Application
+from frontend.initial_data import canvas
+from test.fake_curses import FakeScreen
+
+
+def show(window):
+    for y, line in enumerate(window.text()):
+        if line.strip():
+            print(f"{y:>3}|" + line.rstrip())
+
+
+def run(screen):
+    with screen.install():
+        Application.mainloop(screen.stdscr)
+
+    # the inner canvas window is the seventh created window
+    canvas_in = screen.windows[6]
+    show(canvas_in)
+    print("Canvas:", [(element.x, element.y) for element in canvas.elements])
+    print("Refreshes:", screen.refreshes, "bytes:", screen.written,
+          "largest frame:", max(screen.frames), "bytes")
+    return canvas_in
+
+
+def select(screen, x, y):
+    """Navigates from the start of the cursor at 26,6 to x,y and selects"""
+    screen.press(*["6"] * (x - 26), *["2"] * (y - 6), "5", "7")
+
+
+print("INSERT SQUARE:")
+screen = FakeScreen(30, 100)
+screen.send("i", "square")
+run(screen)
+
+print()
+print("MOVE SQUARE 3 DOWN:")
+screen = FakeScreen(30, 100)
+screen.send("m")
+select(screen, 52, 12)
+screen.send("0,3")
+run(screen)
+
+print()
+print("MOVE SQUARE 3 TO THE RIGHT AND UNDO:")
+screen = FakeScreen(30, 100)
+screen.send("m")
+select(screen, 52, 15)
+screen.send("3,0", "u")
+run(screen)
+
+print()
+print("MOVE SQUARE SELECTED WITH A BOX 2 TO THE LEFT:")
+screen = FakeScreen(30, 100)
+screen.send("m")
+# corners at 50,13 and 55,18 around the square
+screen.press(*["6"] * 24, *["2"] * 7, "0", *["6"] * 5, *["2"] * 5, "0", "7")
+screen.send("-2,0")
+run(screen)
+
+print()
+print("MOVE SQUARE SELECTED WITH A LASSO 2 TO THE RIGHT:")
+screen = FakeScreen(30, 100)
+screen.send("m")
+# triangle 40,12 - 60,12 - 60,30 around the square
+screen.press(*["6"] * 14, *["2"] * 6, "1", *["6"] * 20, "1", *["2"] * 18, "3", "7")
+screen.send("2,0")
+run(screen)